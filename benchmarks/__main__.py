@@ -0,0 +1,22 @@
+"""
+Run all benchmarks:
+
+    $ python -m benchmarks
+"""
+
+from benchmarks import import_summaries, log_entries, reducer_state
+
+
+def main() -> None:
+    print("## Reducer state")
+    reducer_state.main([])
+
+    print("\n## Log entries")
+    log_entries.main([])
+
+    print("\n## Import summaries")
+    import_summaries.main([])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: parse a huge line with many import summaries, each with nested conflicts.
+
+Compare the single-pass tokenizer with the previous parser (find each block with a
+character-by-character loop, then search every field with a regex over the block).
+
+    $ python -m benchmarks.import_summaries [N_SUMMARIES]
+"""
+
+import re
+import sys
+import time
+from typing import Callable, Iterator, List
+
+from d2_sync_report.data.repositories.d2_logs_parser.import_summaries import (
+    ImportSummary,
+    parse_import_summaries,
+)
+
+DEFAULT_SUMMARIES = 5_000
+
+summary = (
+    "ImportSummary{status=ERROR, description='Import process completed with errors', "
+    + "importCount=[imports=0, updates=10, ignores=2], conflicts={"
+    + "E7643:2025W27:h3zkiErOoFl=ImportConflict{error:E7643, message:Period: `2025W27` is not open}, "
+    + "WVq6Gnf3Qvq=ImportConflict{error:WVq6Gnf3Qvq, message:Value 'kenema' is not a valid option}"
+    + "}, dataSetComplete='false', reference='Gq942x50jWX', href='null'}"
+)
+
+
+def get_line(n_summaries: int) -> str:
+    summaries = ", ".join(summary for _ in range(n_summaries))
+    return f"Sync summary: ImportSummaries{{importSummaries=[{summaries}]}}"
+
+
+def parse_legacy(line: str) -> List[ImportSummary]:
+    summaries: List[ImportSummary] = []
+
+    for block in parse_with_brackets("ImportSummary", line):
+        status_match = re.search(r"status=(\w+)", block)
+        description_match = re.search(r"description='(.*?)'", block)
+        import_count_match = re.search(r"importCount=\[(.*?)\]", block)
+        reference_match = re.search(r"reference='(.*?)'", block)
+        conflicts_match = re.search(r"ImportConflict\{(.*?)\}", block, re.DOTALL)
+
+        summaries.append(
+            ImportSummary(
+                status=status_match.group(1) if status_match else None,
+                description=description_match.group(1) if description_match else None,
+                import_count=import_count_match.group(1) if import_count_match else None,
+                reference=reference_match.group(1) if reference_match else None,
+                conflicts=[conflicts_match.group(1).strip()] if conflicts_match else [],
+            )
+        )
+
+    return summaries
+
+
+def parse_with_brackets(keyword: str, text: str) -> Iterator[str]:
+    keyword2 = keyword + "{"
+    i = 0
+
+    while i < len(text):
+        start = text.find(keyword2, i)
+        if start == -1:
+            break
+
+        brace_level = 1
+        j = start + len(keyword2)
+        while j < len(text) and brace_level > 0:
+            if text[j] == "{":
+                brace_level += 1
+            elif text[j] == "}":
+                brace_level -= 1
+            j += 1
+
+        if brace_level == 0:
+            yield text[start + len(keyword2) : j - 1]
+            i = j
+        else:
+            break
+
+
+def run(name: str, parse: Callable[[str], List[ImportSummary]], line: str) -> None:
+    started = time.perf_counter()
+    summaries = parse(line)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:>9}: summaries={len(summaries)} line={len(line) / 1e6:.1f}MB"
+        + f" time={elapsed:7.3f}s MB/s={len(line) / 1e6 / elapsed:7.1f}"
+    )
+
+
+def main(args: List[str]) -> None:
+    line = get_line(int(args[0]) if args else DEFAULT_SUMMARIES)
+    run("legacy", parse_legacy, line)
+    run("tokenizer", parse_import_summaries, line)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
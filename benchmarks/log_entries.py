@@ -0,0 +1,80 @@
+"""
+Benchmark: build log entries from the raw records yielded by the scanner.
+
+Compare the compact entries (slots, message kept as a range of the record bytes) with the
+previous representation (dataclass with a __dict__ and the decoded, stripped message).
+
+    $ python -m benchmarks.log_entries [N_ENTRIES]
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import (
+    get_log_record,
+    log_line_regex,
+)
+
+DEFAULT_ENTRIES = 200_000
+
+records = [
+    b"* INFO  2025-07-17T12:38:09,729 [TRACKER_PROGRAMS_DATA_SYNC AqujRwbbik6] Process started: "
+    + b"Starting Tracker programs data synchronization job. (NotificationLoggerUtil.java)\n",
+    b"* ERROR 2025-07-17T12:38:09,837 Sync summary: ImportSummary{status=ERROR, description='null'"
+    + b", importCount=[imports=0, updates=0, ignores=1], conflicts=[]}\n",
+]
+
+
+@dataclass
+class LegacyLogEntry:
+    raw_timestamp: Optional[str]
+    text: str
+
+
+def get_legacy_log_entry(record: bytes) -> LegacyLogEntry:
+    line = record.decode("utf-8", errors="replace").strip()
+    match = log_line_regex.match(line)
+    assert match
+    return LegacyLogEntry(raw_timestamp=match[1], text=line[match.end() :])
+
+
+def run(name: str, build: Callable[[bytes], object], n_entries: int) -> None:
+    inputs = [bytes(records[index % len(records)]) for index in range(n_entries)]
+
+    started = time.perf_counter()
+    for record in inputs:
+        build(record)
+    elapsed = time.perf_counter() - started
+
+    # Memory and blocks kept by the entries (the records are allocated before the snapshot)
+    tracemalloc.start()
+    size_before, blocks_before = count_blocks()
+    entries = [build(record) for record in inputs]
+    size_after, blocks_after = count_blocks()
+    tracemalloc.stop()
+    size, blocks = size_after - size_before, blocks_after - blocks_before
+
+    assert len(entries) == n_entries
+    print(
+        f"{name:>8}: entries/s={n_entries / elapsed:10.0f}"
+        + f" bytes/entry={size / n_entries:6.1f} allocations/entry={blocks / n_entries:4.1f}"
+    )
+
+
+def count_blocks() -> Tuple[int, int]:
+    """Size and number of the memory blocks allocated by Python (only while tracing)."""
+    stats = tracemalloc.take_snapshot().statistics("filename")
+    return sum(stat.size for stat in stats), sum(stat.count for stat in stats)
+
+
+def main(args: List[str]) -> None:
+    n_entries = int(args[0]) if args else DEFAULT_ENTRIES
+    run("legacy", get_legacy_log_entry, n_entries)
+    run("compact", get_log_record, n_entries)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
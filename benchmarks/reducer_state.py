@@ -0,0 +1,65 @@
+"""
+Benchmark: reduce a synthetic log with a single tracker sync job and many conflict errors.
+
+Reducing must scale linearly with the number of errors of a job (grouped by signature).
+
+    $ python -m benchmarks.reducer_state [N_ERRORS ...]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from functools import reduce
+from typing import Iterator, List
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import format_timestamp
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+
+DEFAULT_ERROR_COUNTS = [25_000, 50_000, 100_000]
+
+
+def get_log_entries(n_errors: int) -> Iterator[LogEntry]:
+    start = datetime(2025, 7, 17, 12, 0, 0)
+    end = start + timedelta(seconds=60)
+    section = "[TRACKER_PROGRAMS_DATA_SYNC AqujRwbbik6]"
+
+    yield LogEntry.from_text(
+        format_timestamp(start),
+        f"{section} Process started: Starting Tracker programs data synchronization",
+    )
+
+    for index in range(n_errors):
+        yield LogEntry.from_text(
+            None,
+            f"Caused by: org.postgresql.util.PSQLException: ERROR: duplicate key value {index}",
+        )
+
+    yield LogEntry.from_text(
+        format_timestamp(end), f"{section} Tracker programs data synchronization failed"
+    )
+
+
+def run(n_errors: int) -> float:
+    registry = JobRegistry.default()
+    state = registry.initial_state()
+    started = time.perf_counter()
+    state = reduce(registry.reducer, get_log_entries(n_errors), state)
+    elapsed = time.perf_counter() - started
+
+    tracker_programs_state = state.get(SyncJobType.TRACKER_PROGRAMS)
+    assert tracker_programs_state
+    (job,) = tracker_programs_state.parsed_jobs
+    assert sum(signature.count for signature in job.error_signatures) == n_errors
+    return elapsed
+
+
+def main(args: List[str]) -> None:
+    for n_errors in [int(arg) for arg in args] or DEFAULT_ERROR_COUNTS:
+        elapsed = run(n_errors)
+        print(f"errors={n_errors:>8} time={elapsed:8.3f}s errors/s={n_errors / elapsed:12.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
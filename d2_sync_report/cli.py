@@ -1,11 +1,16 @@
 from importlib.resources import files
 import re
 from dataclasses import dataclass, replace
-from typing import Annotated, Optional
+from datetime import datetime
+from typing import Annotated, List, Optional
 import tyro
 from tyro.conf import arg
 
 from d2_sync_report.data.dhis2_api import D2ApiReal
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import (
+    JobRegistry,
+    get_default_job_definitions_path,
+)
 from d2_sync_report.data.repositories.metadata_versioning_d2_repository import (
     MetadataVersioningD2Repository,
 )
@@ -18,9 +23,11 @@ from d2_sync_report.domain.entities.instance import (
     Instance,
     PersonalTokenAccessAuth,
 )
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
 from d2_sync_report.domain.usecases.send_sync_report_usecase import (
     SendSyncReportUseCase,
 )
+from d2_sync_report.domain.usecases.show_sync_job_status_usecase import ShowSyncJobStatusUseCase
 from d2_sync_report.data.repositories.message_d2_repository import MessageD2Repository
 from d2_sync_report.data.repositories.sync_job_report_d2_repository import (
     SyncJobReportD2Repository,
@@ -30,8 +37,12 @@ from d2_sync_report.data.repositories.sync_job_report_d2_repository import (
 @dataclass
 class Args:
     logs_folder_path: Annotated[
-        str,
-        arg(help="Folder containing file dhis.log", metavar="[DOCKER_CONTAINER:]FOLDER_PATH"),
+        List[str],
+        arg(
+            help="Folder containing file dhis.log, one for each node of a cluster (logs are merged"
+            + " by timestamp)",
+            metavar="[DOCKER_CONTAINER:]FOLDER_PATH [...]",
+        ),
     ]
     url: Annotated[str, arg(help="DHIS2 instance base URL", metavar="URL")]
     auth: Annotated[str, arg(help="USER:PASS or PAT token", metavar="AUTH")]
@@ -46,11 +57,77 @@ class Args:
             metavar="PATH",
         ),
     ] = None
+    job_definitions_path: Annotated[
+        Optional[str],
+        arg(help="Path to custom sync job definitions JSON file", metavar="PATH"),
+    ] = None
+    job_types: Annotated[
+        Optional[List[SyncJobType]],
+        arg(
+            help=f"Sync job types to report ({", ".join(type.name for type in SyncJobType)}),"
+            + " all the defined types if not set",
+            metavar="TYPE [TYPE ...]",
+        ),
+    ] = None
 
     ignore_cache: Annotated[bool, arg(help="Ignore cached state", default=False)] = False
+    since: Annotated[
+        Optional[datetime],
+        arg(
+            help="Report the logs after this date (i.e. 2025-07-20T10:00) instead of those since"
+            + " the last execution, without using nor saving the cached state",
+            metavar="DATETIME",
+        ),
+    ] = None
+    workers: Annotated[
+        int, arg(help="Processes to parse rotated log files in parallel", metavar="N")
+    ] = 1
+    pipeline: Annotated[
+        bool, arg(help="Reduce each sync job type in its own process", default=False)
+    ] = False
     notify_user_group: Annotated[
         Optional[str], arg(help="User group to send the report to", metavar="NAME or CODE")
     ] = None
+    follow: Annotated[
+        bool,
+        arg(
+            help="Keep running and report each sync job as soon as it ends (Docker containers are"
+            + " polled, syncing their local mirror)",
+            default=False,
+        ),
+    ] = False
+    docker_stream: Annotated[
+        bool,
+        arg(
+            help="Read the logs of Docker containers through a pipe instead of copying them to a"
+            + " local mirror (no disk space needed)",
+            default=False,
+        ),
+    ] = False
+    docker_mirror_path: Annotated[
+        Optional[str],
+        arg(
+            help="Folder for the local mirrors of the logs of Docker containers, docker-logs in the"
+            + " cache path if not set",
+            metavar="PATH",
+        ),
+    ] = None
+    cache_path: Annotated[
+        Optional[str],
+        arg(
+            help="Folder for the cached parse results, timestamps index and Docker logs mirrors,"
+            + " in the user cache folder if not set ($XDG_CACHE_HOME/d2-sync-report)",
+            metavar="PATH",
+        ),
+    ] = None
+    status_only: Annotated[
+        bool,
+        arg(
+            help="Only show the status, start and end of the jobs (no errors, suggestions or"
+            + " notifications), with its own cached state",
+            default=False,
+        ),
+    ] = False
 
 
 def main() -> None:
@@ -58,19 +135,55 @@ def main() -> None:
     instance = get_instance(args)
     api = D2ApiReal(instance)
     suggestions_path = args.suggestions_path or get_default_suggestions_path()
+    job_definitions_path = args.job_definitions_path or get_default_job_definitions_path()
+    registry = JobRegistry.from_file(job_definitions_path, args.job_types)
+
+    sync_job_report_repository = SyncJobReportD2Repository(
+        api,
+        args.logs_folder_path,
+        suggestions_path,
+        args.workers,
+        args.pipeline,
+        registry=registry,
+        status_only=args.status_only,
+        stream_docker_logs=args.docker_stream,
+        docker_mirror_path=args.docker_mirror_path,
+        cache_path=args.cache_path,
+    )
 
-    SendSyncReportUseCase(
+    if args.status_only and args.follow:
+        raise ValueError("Follow mode is not available with --status-only")
+    elif args.since and args.follow:
+        raise ValueError("Follow mode is not available with --since")
+    elif args.status_only:
+        ShowSyncJobStatusUseCase(
+            SyncJobReportExecutionFileRepository("status-cache.json"),
+            sync_job_report_repository,
+        ).execute(skip_cache=args.ignore_cache, since=args.since)
+        return
+
+    send_sync_report = SendSyncReportUseCase(
         SyncJobReportExecutionFileRepository(),
-        SyncJobReportD2Repository(api, args.logs_folder_path, suggestions_path),
+        sync_job_report_repository,
         MetadataVersioningD2Repository(api),
         UserD2Repository(api),
         MessageD2Repository(api),
-    ).execute(
-        user_group_name_to_send=args.notify_user_group,
-        skip_cache=args.ignore_cache,
-        instance=instance,
     )
 
+    if args.follow:
+        send_sync_report.execute_follow(
+            user_group_name_to_send=args.notify_user_group,
+            skip_cache=args.ignore_cache,
+            instance=instance,
+        )
+    else:
+        send_sync_report.execute(
+            user_group_name_to_send=args.notify_user_group,
+            skip_cache=args.ignore_cache,
+            instance=instance,
+            since=args.since,
+        )
+
 
 def get_default_suggestions_path() -> str:
     folder = "d2_sync_report.data.repositories.resources"
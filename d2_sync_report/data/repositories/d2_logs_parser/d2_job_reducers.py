@@ -1,115 +1,85 @@
-from dataclasses import dataclass
-from typing import List
-from d2_sync_report.data.repositories.d2_logs_parser.import_summaries import parse_import_summaries
+import re
+from datetime import timedelta
+from typing import List, Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.error_signatures import ErrorSignatures
+from d2_sync_report.data.repositories.d2_logs_parser.import_summaries import iter_import_summaries
 from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    UNTAGGED,
     SyncJobParserInProgress,
     LogEntry,
     SyncJobParserState,
 )
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    LogEntryClassification,
+)
 from d2_sync_report.domain.entities.sync_job_report import SyncJobReportItem, SyncJobType
-from d2_sync_report.utils.uniq import uniq
-
-
-@dataclass
-class Delimiters:
-    """
-    Patters that identify the start and end (success or error) of sync jobs.
-    To be used in the generic sync reducer.
-    """
 
-    open: List[str]
-    close_success: List[str]
-    close_error: List[str]
+# Example: "Process completed after 1h 5m 44.095s: ..."
+REPORTED_DURATION_REGEX = re.compile(r"\bafter (?:(\d+)h )?(?:(\d+)m )?(\d+(?:\.\d+)?)s\b")
 
 
 class D2JobReducers:
-    def data_sync_reducer(
-        self, state: SyncJobParserState, log_entry: LogEntry
-    ) -> SyncJobParserState:
-        matcher = LogEntryReducer(state, log_entry, section="DATA_SYNC")
-
-        delimiters = Delimiters(
-            open=["Starting DataValueSynchronization job"],
-            close_success=["Process completed after"],
-            close_error=["DataValueSynchronization failed"],
-        )
-
-        return self._generic_sync_reducer(state, matcher, SyncJobType.AGGREGATED, delimiters)
-
-    def event_programs_reducer(
-        self, state: SyncJobParserState, log_entry: LogEntry
-    ) -> SyncJobParserState:
-        matcher = LogEntryReducer(state, log_entry, section="EVENT_PROGRAMS_DATA_SYNC")
-
-        delimiters = Delimiters(
-            open=["Starting Event programs data synchronization"],
-            close_success=[
-                "Event programs data sync was successfully done",
-                "Event programs data synchronization skipped",
-            ],
-            close_error=["Event programs data synchronization failed"],
-        )
-
-        return self._generic_sync_reducer(state, matcher, SyncJobType.EVENT_PROGRAMS, delimiters)
-
-    def tracker_programs_reducer(
-        self, state: SyncJobParserState, log_entry: LogEntry
-    ) -> SyncJobParserState:
-        matcher = LogEntryReducer(state, log_entry, section="TRACKER_PROGRAMS_DATA_SYNC")
-
-        delimiters = Delimiters(
-            open=["Starting Tracker programs data synchronization"],
-            close_success=[
-                "Tracker programs data synchronization was successfully done",
-                "Tracker programs data synchronization skipped",
-            ],
-            close_error=["Tracker programs data synchronization failed"],
-        )
-        return self._generic_sync_reducer(state, matcher, SyncJobType.TRACKER_PROGRAMS, delimiters)
+    """
+    Reducers receive the classification of the log entry (see LogEntryClassifier), which is
+    computed once per line, instead of matching the patterns themselves.
+    """
 
-    def metadata_sync_reducer(
-        self, state: SyncJobParserState, log_entry: LogEntry
+    # Logs parsing is very similar for all syncs, just some tags and the start/close delimiters
+    # change (see JobRegistry). So a generic reducer handles all sync jobs.
+    def sync_job_reducer(
+        self,
+        type: SyncJobType,
+        state: SyncJobParserState,
+        log_entry: LogEntry,
+        classification: LogEntryClassification,
     ) -> SyncJobParserState:
-        matcher = LogEntryReducer(state, log_entry, section="META_DATA_SYNC")
-
-        delimiters = Delimiters(
-            open=["Metadata Sync cron Job started"],
-            close_success=["Metadata sync cron job ended"],
-            close_error=[],
-        )
+        matcher = LogEntryReducer(state, log_entry)
+        state = self._reduce_first_line(state, matcher, classification, type)
 
-        return self._generic_sync_reducer(
-            state, matcher, SyncJobType.METADATA, delimiters, section=False
-        )
+        # Causes and import summaries in the continuation lines belong to the job still open
+        # after the first line. In status only mode, the errors of the record are just counted.
+        if not state.current or state.current.type != type:
+            return state
+        elif classification.error_fragments:
+            return matcher.add_error_fragments()
+        elif classification.error_markers:
+            return state.count_errors(classification.error_markers)
+        else:
+            return state
 
-    # Logs parsing is very similar for all syncs, just some tags and the start/close delimiters change.
-    # So, to keep it DRY, let's create a generic reducer that can handle all sync jobs.
-    def _generic_sync_reducer(
+    def _reduce_first_line(
         self,
         state: SyncJobParserState,
         matcher: "LogEntryReducer",
+        classification: LogEntryClassification,
         type: SyncJobType,
-        delimiters: Delimiters,
-        section: bool = True,
     ) -> SyncJobParserState:
         # Search for starter string (i.e: "Starting Tracker programs data synchronization job")
-        if any(matcher.matches(open, section) for open in delimiters.open):
-            return matcher.open_sync_job(type=type)
+        if type in classification.opens:
+            return matcher.open_sync_job(type=type, job_uid=classification.get_job_uid(type))
         elif not state.current or state.current.type != type:
             return state
+
+        # Tagged lines go to the run of their job, lines without tag to the current one
+        state.select(classification.get_job_uid(type))
+
         # Search for success closer string (i.e: "Tracker programs data synchronization skipped")
-        elif any(matcher.matches(close, section) for close in delimiters.close_success):
+        if type in classification.closes_success:
             return matcher.close_sync_job(success=True)
         # Search for error closer string (i.e: "Tracker programs data synchronization failed")
-        elif any(matcher.matches(close, section) for close in delimiters.close_error):
+        elif type in classification.closes_error:
             return matcher.close_sync_job(success=False)
+        # Search for phase delimiters (i.e. "Stage started: Populating analytics tables")
+        elif type in classification.starts_phase:
+            return matcher.start_phase(classification.phase or "")
+        elif type in classification.ends_phase:
+            return matcher.end_phase()
         # Refactor: no matches+parse -> parse1() or parse2() or ... -> add_error of that output
-        elif matcher.matches_import_summaries():
+        elif classification.import_summaries:
             return matcher.parse_import_summaries()
-        elif matcher.matches_caused_by():
+        elif classification.caused_by:
             return matcher.add_error()
-        elif matcher.matches_error_detail():
-            return matcher.add_detail_error()
         else:
             return state
 
@@ -117,24 +87,11 @@ class D2JobReducers:
 class LogEntryReducer:
     """
     Encapsulate the logic to process log entries and manage the state of sync jobs.
-
-    Matches can include the section or not. Example for Metadata synchronization::
-
-       * INFO  2025-07-21T11:47:28,307 [META_DATA_SYNC aBcD9Zo0xrG] Process started
-
-    This way we can match against a specific job types.
     """
 
-    def __init__(self, state: SyncJobParserState, log_entry: LogEntry, section: str):
+    def __init__(self, state: SyncJobParserState, log_entry: LogEntry):
         self.state = state
         self.log_entry = log_entry
-        self.section = section
-
-    def matches(self, pattern: str, section: bool = False) -> bool:
-        line = self.log_entry.text.lower()
-        section_matches = ("[" + self.section.lower() + " ") in line if section else True
-        pattern_matches = pattern.lower() in line
-        return section_matches and pattern_matches
 
     def close_sync_job(self, success: bool) -> SyncJobParserState:
         state = self.state
@@ -143,71 +100,83 @@ class LogEntryReducer:
         if not state.current:
             return state
 
-        errors = uniq(state.current.errors)
+        errors = state.current.errors
+        end = log_entry.timestamp
 
         parsed = SyncJobReportItem(
             type=state.current.type,
-            success=success and not state.current.errors,
+            success=success and errors.count == 0,
             start=state.current.start,
-            end=log_entry.timestamp or state.current.start,
-            errors=errors,
+            end=end or state.current.start,
+            errors=errors.examples,
             suggestions=[],
+            error_signatures=errors.signatures,
+            omitted_errors=errors.omitted,
+            phases=state.current.phases,
+            import_count=state.current.import_count,
+            reported_duration=get_reported_duration(log_entry.text) if success else None,
+            node=state.current.node,
         )
 
-        return SyncJobParserState(
-            current=None,
-            parsed_jobs=state.parsed_jobs + [parsed],
-            last_processed_timestamp=log_entry.timestamp,
-        )
+        return state.close_job(parsed, timestamp=end)
 
-    def open_sync_job(self, type: SyncJobType) -> SyncJobParserState:
+    def open_sync_job(self, type: SyncJobType, job_uid: Optional[str]) -> SyncJobParserState:
         state = self.state
         log_entry = self.log_entry
 
-        if not log_entry.timestamp:
+        start = log_entry.timestamp
+
+        if not start:
             print("Log entry does not have a timestamp, cannot set start of sync job.")
             return state
 
-        return SyncJobParserState(
-            current=SyncJobParserInProgress(type=type, start=log_entry.timestamp, errors=[]),
-            parsed_jobs=state.parsed_jobs,
-            last_processed_timestamp=None,
+        return state.open_job(
+            SyncJobParserInProgress(
+                type=type, start=start, errors=ErrorSignatures(), node=log_entry.node
+            ),
+            job_uid or UNTAGGED,
         )
 
-    def matches_import_summaries(self):
-        return "ImportSummary{" in self.log_entry.text
+    def start_phase(self, name: str) -> SyncJobParserState:
+        start = self.log_entry.timestamp
+        return self.state.start_phase(name, start) if start else self.state
 
-    def matches_caused_by(self):
-        return "Caused by:" in self.log_entry.text
+    def end_phase(self) -> SyncJobParserState:
+        end = self.log_entry.timestamp
+        return self.state.end_phase(end) if end else self.state
 
-    def matches_error_detail(self):
-        return "Detail: " in self.log_entry.text
+    def add_error_fragments(self) -> SyncJobParserState:
+        """Add the causes and import summaries of the continuation lines (see LogEntry)."""
+        state = self.state.add_errors(list(self.log_entry.fragments))
 
-    def add_detail_error(self) -> SyncJobParserState:
-        """
-        If the log entry starts with "Detail: ", it usually follows a "Caused by" error message.
-        Let's concatenate it to the previous error message if that's the case.
-        """
-        text = self.log_entry.text
-        errors = self.state.current.errors if self.state.current else None
+        for text in self.log_entry.summaries:
+            state = self._add_import_summaries(text)
 
-        if text.startswith("Detail: ") and errors and "Caused by" in errors[-1]:
-            return self.state.append_to_last_error(text)
-        else:
-            return self.state
+        return state
 
     def parse_import_summaries(self) -> SyncJobParserState:
+        return self._add_import_summaries(self.log_entry.text)
+
+    def _add_import_summaries(self, text: str) -> SyncJobParserState:
         state = self.state
-        log_entry = self.log_entry
-        summaries = parse_import_summaries(log_entry.text)
+        errors: List[str] = []
 
-        errors = [
-            summary.format_summary()
-            for summary in summaries
-            if summary.status == "ERROR" or summary.conflicts
-        ]
+        # Counts are added to the totals of the job, summaries are not kept
+        for summary in iter_import_summaries(text):
+            state.add_import_count(summary.get_counts(), summary.conflicts_count)
+            if summary.status == "ERROR" or summary.has_conflicts:
+                errors.append(summary.format_summary())
 
         return state.add_errors(errors)
 
     def add_error(self):
         return self.state.add_errors([self.log_entry.text])
+
+
+def get_reported_duration(text: str) -> Optional[timedelta]:
+    match = REPORTED_DURATION_REGEX.search(text)
+    if not match:
+        return None
+
+    hours, minutes, seconds = match.groups()
+    return timedelta(hours=int(hours or 0), minutes=int(minutes or 0), seconds=float(seconds))
@@ -1,20 +1,51 @@
-import os
 import re
-from dataclasses import dataclass, replace
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
-from functools import reduce
-from typing import Iterator, List, Optional, Tuple
+from typing import Deque, Dict, Generator, Iterator, List, Optional, Sequence, Tuple, Union
 
 from d2_sync_report.data.dhis2_api import D2Api
-from d2_sync_report.data.repositories.d2_logs_parser.d2_job_reducers import D2JobReducers
-from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
-    LogEntry,
-    SyncJobParserState,
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.log_file_index import (
+    LogFileIndex,
+    LogFileIndexCache,
 )
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import (
+    COMPRESSED_OPENERS,
+    LogFileSegment,
+    get_log_file_checkpoints,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import (
+    get_log_entries,
+    merge_log_entries,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.d2_logs_parser.log_watcher import LogsWatcher
+from d2_sync_report.data.repositories.d2_logs_parser.logs_folder import (
+    LocalLogsFolder,
+    LogsFolder,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.parallel_reduction import (
+    PartialReduction,
+    merge_partial_reductions,
+    reduce_segments,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.parse_result_cache import ParseResultCache
+from d2_sync_report.data.repositories.d2_logs_parser.pipeline_reduction import reduce_pipelined
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import format_timestamp
+from d2_sync_report.data.repositories.d2_logs_parser.reducers_state import ReducersState
 from d2_sync_report.data.repositories.d2_logs_suggestions import (
     D2LogsSuggestions,
 )
-from d2_sync_report.domain.entities.sync_job_report import SyncJobReport, SyncJobReportItem
+from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobInProgress,
+    SyncJobReport,
+    SyncJobReportItem,
+    SyncJobReportStream,
+    SyncJobType,
+)
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
 from d2_sync_report.utils.uniq import uniq
 
 """
@@ -27,142 +58,433 @@ are not tagged.
 
 The repository uses a state machine approach to parse the logs, where it keeps track
 of the current synchronization job and its state.
+
+In a cluster, each node writes its own logs folder, and a job started in a node may log its errors
+from another. Given several folders, the entries of all nodes are merged by timestamp into a
+single stream, which is reduced sequentially. Jobs are reported with the node that started them.
 """
 
+rotated_log_file_regex = re.compile(
+    r"dhis\.log\.(\d+)(" + "|".join(re.escape(ext) for ext in COMPRESSED_OPENERS) + r")?$"
+)
+
 
 class D2LogsParser:
     api: D2Api
 
-    def __init__(self, api: D2Api, logs_folder_path: str, suggestions_path: str):
+    def __init__(
+        self,
+        api: D2Api,
+        logs_folder_path: Union[str, LogsFolder, Sequence[Union[str, LogsFolder]]],
+        suggestions_path: str,
+        workers: int = 1,
+        pipeline: bool = False,
+        index_cache: Optional[LogFileIndexCache] = None,
+        result_cache: Optional[ParseResultCache] = None,
+        registry: Optional[JobRegistry] = None,
+        status_only: bool = False,
+        node_names: Optional[Sequence[str]] = None,
+    ):
         self.api = api
-        self.logs_folder_path = logs_folder_path
-        self.d2_logs_suggestions = D2LogsSuggestions(self.api, suggestions_path)
-
-    def get(self, since: Optional[datetime] = None) -> SyncJobReport:
-        log_files = self._get_log_files()
-        print(f"Reading logs from: {", ".join(log_files)}")
-
-        def get_log_entries() -> Iterator[LogEntry]:
-            for log_file in log_files:
-                yield from self._get_log_entries(log_file, since)
+        self.logs_folders = get_logs_folders(logs_folder_path, node_names)
+        self.workers = workers
+        self.pipeline = pipeline
+        self.index_cache = index_cache
+        self.result_cache = result_cache
+        self.registry = registry or JobRegistry.default()
+        self.status_only = status_only
+
+        if status_only:
+            self.registry = self.registry.with_status_only()
+            self.d2_logs_suggestions: Optional[D2LogsSuggestions] = None
+        else:
+            self.d2_logs_suggestions = D2LogsSuggestions(self.api, suggestions_path)
+
+    def get(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> SyncJobReport:
+        return self.stream(since, log_files, jobs_in_progress).collect()
+
+    def stream(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> SyncJobReportStream:
+        """
+        Yield report items as jobs close, with suggestions resolved in a background thread.
+        Jobs of the live file are found closed while it is read; those of rotated files reduced
+        by file (in parallel or from the cache), and all in pipeline mode, once they are reduced.
+        In status-only mode, items have no errors nor suggestions.
+        """
+        items = self._get_items(since, log_files or [], jobs_in_progress or [])
+        return SyncJobReportStream(items if self.status_only else self._add_suggestions(items))
+
+    def follow(
+        self,
+        watcher: LogsWatcher,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> Iterator[SyncJobReport]:
+        """
+        Yield the report of the logs not processed yet and then, every time the watcher finds
+        changes, the report of the new lines (jobs closed in them and checkpoints). The state of
+        the reducers is kept in memory, checkpoints and jobs in progress are only needed to resume
+        in another execution. Rotations are followed by the checkpoints (see LogFile).
+        """
+        initial_state = self.registry.from_jobs_in_progress(jobs_in_progress or [])
+        state, report = collect(self._read(since, log_files or [], initial_state))
+        yield self._with_suggestions(report)
+
+        while True:
+            watcher.wait()
+            state, report = collect(self._read_new_lines(report.log_files, state))
+            yield self._with_suggestions(report)
+
+    def _get_items(
+        self,
+        since: Optional[datetime],
+        log_files: List[LogFileCheckpoint],
+        jobs_in_progress: List[SyncJobInProgress],
+    ) -> Generator[SyncJobReportItem, None, SyncJobReport]:
+        # Jobs not finished in the previous execution go on with the new lines
+        initial_state = self.registry.from_jobs_in_progress(jobs_in_progress)
+        _state, report = yield from self._read(since, log_files, initial_state)
+        return report
+
+    def _read(
+        self,
+        since: Optional[datetime],
+        log_files: List[LogFileCheckpoint],
+        initial_state: ReducersState,
+    ) -> Generator[SyncJobReportItem, None, Tuple[ReducersState, SyncJobReport]]:
+        if self.d2_logs_suggestions:
+            self.d2_logs_suggestions.copy_resources()
+        segments = self._get_log_file_segments(log_files)
+        print(f"Reading logs from: {", ".join(s.log_file.path for s in segments)}")
+
+        indexes = self.index_cache.load() if self.index_cache else {}
+        since_timestamp = format_timestamp(since) if since else None
+
+        pending_segments: List[LogFileSegment] = []
+        unchanged_indexes: List[LogFileIndex] = []
+
+        for segment in segments:
+            index = self._get_index(segment, indexes)
+
+            if segment.is_consumed:
+                print(f"Already processed: {segment.log_file.path}")
+                unchanged_indexes.extend([index] if index else [])
+            elif index and since_timestamp and self._is_before(segment, index, since_timestamp):
+                print(f"Skipped, all lines before {since_timestamp}: {segment.log_file.path}")
+                segment.end = segment.size = index.size
+                unchanged_indexes.append(index)
+            else:
+                # Without a gap between the indexed contents and the start, keep indexing from it
+                if index and segment.start <= index.size:
+                    index.load_into(segment)
+                pending_segments.append(segment)
+
+        state = yield from self._reduce(pending_segments, initial_state, since)
+
+        if self.index_cache:
+            updated_indexes = [LogFileIndex.from_segment(segment) for segment in pending_segments]
+            self.index_cache.save(unchanged_indexes + [i for i in updated_indexes if i])
+
+        return state, self._get_report(state, segments)
+
+    def _read_new_lines(
+        self, log_files: List[LogFileCheckpoint], state: ReducersState
+    ) -> Generator[SyncJobReportItem, None, Tuple[ReducersState, SyncJobReport]]:
+        """Reduce the lines written since the checkpoints, sequentially and without caches."""
+        segments = self._get_log_file_segments(log_files)
+        pending_segments = [segment for segment in segments if not segment.is_consumed]
+
+        if self.is_cluster:
+            entries = self._get_merged_log_entries(pending_segments, since=None)
+        else:
+            entries = self._get_log_entries(pending_segments, since=None)
 
-        (items, last_processed) = self._get_log_report_items(get_log_entries())
+        state = yield from self._reduce_entries(entries, state)
+        return state, self._get_report(state, segments)
 
-        self.d2_logs_suggestions.copy_resources()
+    def _get_report(self, state: ReducersState, segments: List[LogFileSegment]) -> SyncJobReport:
+        """Report without items (they are streamed), with what the next execution needs."""
+        data_sync_state = state.get(SyncJobType.AGGREGATED)
+        last_processed = data_sync_state.last_processed_timestamp if data_sync_state else None
 
         return SyncJobReport(
-            items=self._add_suggestions(items),
+            items=[],
             last_processed=last_processed or datetime.now(),
+            log_files=get_log_file_checkpoints(segments),
+            jobs_in_progress=state.jobs_in_progress,
         )
 
-    def _add_suggestions(self, items: List[SyncJobReportItem]) -> List[SyncJobReportItem]:
-        items_with_suggestions: List[SyncJobReportItem] = []
+    def _add_suggestions(
+        self, items: Generator[SyncJobReportItem, None, SyncJobReport]
+    ) -> Generator[SyncJobReportItem, None, SyncJobReport]:
+        """Get suggestions (which may request the API) while the logs are still being reduced."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending: Deque[Future[SyncJobReportItem]] = deque()
 
-        for item in items:
-            suggestions = [
-                suggestion
-                for error in item.errors
-                for suggestion in self.d2_logs_suggestions.get_suggestions_from_error(error)
-            ]
+            while True:
+                try:
+                    item = next(items)
+                except StopIteration as stop:
+                    report: SyncJobReport = stop.value
+                    break
 
-            item2 = replace(item, suggestions=uniq(suggestions))
-            items_with_suggestions.append(item2)
+                pending.append(executor.submit(self._add_item_suggestions, item))
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
 
-        return items_with_suggestions
+            while pending:
+                yield pending.popleft().result()
 
-    def _get_log_files(self) -> list[str]:
-        rotated_log_files = [
-            filename
-            for filename in os.listdir(self.logs_folder_path)
-            if re.match(r"dhis\.log\.\d+$", filename)
-        ]
+        return report
 
-        all_log_files = sorted(
-            rotated_log_files,
-            key=lambda filename: int(filename[len("dhis.log.") :]),
-        ) + ["dhis.log"]
+    def _with_suggestions(self, report: SyncJobReport) -> SyncJobReport:
+        return replace(report, items=[self._add_item_suggestions(item) for item in report.items])
 
-        return [os.path.join(self.logs_folder_path, log_file) for log_file in all_log_files]
+    def _add_item_suggestions(self, item: SyncJobReportItem) -> SyncJobReportItem:
+        if not self.d2_logs_suggestions:
+            return item
 
-    def _get_log_entries(
-        self, logs_file_path: str, since: Optional[datetime] = None
-    ) -> Iterator[LogEntry]:
-        parse = False if since else True
+        suggestions = [
+            suggestion
+            for error in item.errors
+            for suggestion in self.d2_logs_suggestions.get_suggestions_from_error(error)
+        ]
+
+        return replace(item, suggestions=uniq(suggestions))
 
-        with open(logs_file_path, "r", encoding="utf-8") as file:
-            for line0 in file:
-                line = line0.strip()
-                entry = self._get_log_entry(line)
+    def _get_index(
+        self, segment: LogFileSegment, indexes: Dict[str, LogFileIndex]
+    ) -> Optional[LogFileIndex]:
+        index = indexes.get(segment.log_file.fingerprint()) if indexes else None
+        return index if index and index.applies_to(segment.log_file) else None
 
-                if not entry:
-                    continue
+    def _is_before(self, segment: LogFileSegment, index: LogFileIndex, timestamp: str) -> bool:
+        """All lines in the file are before the timestamp, so there is no need to read it."""
+        return (
+            segment.use_since and index.is_complete(segment.log_file) and index.is_before(timestamp)
+        )
 
-                if not parse and entry.timestamp and since and entry.timestamp > since:
-                    parse = True
+    @property
+    def is_cluster(self) -> bool:
+        return len(self.logs_folders) > 1
 
-                if parse:
-                    yield entry
+    def _get_log_files(self, logs_folder: LogsFolder) -> list[str]:
+        # Oldest first (highest N), dhis.log last: the order of the lines. Older rotations may be
+        # compressed (dhis.log.N.gz)
+        rotated_log_files = [
+            (int(match[1]), filename)
+            for filename in logs_folder.list_file_names()
+            if (match := rotated_log_file_regex.match(filename))
+        ]
 
-    def _get_log_report_items(
-        self, log_entries: Iterator[LogEntry]
-    ) -> Tuple[List[SyncJobReportItem], Optional[datetime]]:
-        initial_state = SyncJobParserState.initial()
+        return [filename for _, filename in sorted(rotated_log_files, reverse=True)] + ["dhis.log"]
+
+    def _get_log_file_segments(self, checkpoints: List[LogFileCheckpoint]) -> List[LogFileSegment]:
+        segments: List[LogFileSegment] = []
+
+        for node, logs_folder in self.logs_folders:
+            # Checkpoints of other nodes must not count as previous executions of this one
+            node_checkpoints = [checkpoint for checkpoint in checkpoints if checkpoint.node == node]
+            segments.extend(
+                LogFileSegment.from_log_file(
+                    logs_folder.get_log_file(name, node), index, node_checkpoints
+                )
+                for index, name in enumerate(self._get_log_files(logs_folder))
+            )
+
+        return segments
+
+    def _reduce(
+        self,
+        pending_segments: List[LogFileSegment],
+        initial_state: ReducersState,
+        since: Optional[datetime],
+    ) -> Generator[SyncJobReportItem, None, ReducersState]:
+        """Yield the jobs as they are closed and return the final state."""
+        if self.is_cluster:
+            print(f"Merging the logs of {len(self.logs_folders)} nodes by timestamp")
+            entries = self._get_merged_log_entries(pending_segments, since)
+            return (yield from self._reduce_entries(entries, initial_state))
 
         # Sync jobs can run in parallel, so reduce parsers isolatedly and aggregate results at the end.
+        if self.pipeline:
+            state = reduce_pipelined(self.registry, pending_segments, initial_state, since)
+            yield from state.pop_parsed_jobs()
+            return state
+
+        # Rotated files can be reduced by file (in parallel or from the cache), the live file
+        # (where most new lines are) is then reduced sequentially, so its jobs are streamed.
+        rotated_segments = [s for s in pending_segments if not s.log_file.is_live]
+        live_segments = [s for s in pending_segments if s.log_file.is_live]
+        state = initial_state
+
+        if self._can_reduce_by_file(rotated_segments):
+            state = self._reduce_by_file(rotated_segments, initial_state, since)
+            yield from state.pop_parsed_jobs()
+            pending_segments = live_segments
+
+        entries = self._get_log_entries(pending_segments, since)
+        return (yield from self._reduce_entries(entries, state))
+
+    def _can_reduce_by_file(self, rotated_segments: List[LogFileSegment]) -> bool:
+        is_parallel = self.workers > 1 and len(rotated_segments) > 1
+        return bool(rotated_segments) and (is_parallel or self.result_cache is not None)
+
+    def _reduce_by_file(
+        self,
+        pending_segments: List[LogFileSegment],
+        initial_state: ReducersState,
+        since: Optional[datetime],
+    ) -> ReducersState:
+        """Reduce each file independently (or get its cached result) and merge the results."""
+        since_timestamp = format_timestamp(since) if since else None
+        cached_partials = [
+            self._get_cached_result(segment, since_timestamp) for segment in pending_segments
+        ]
 
-        initial_compositite_state = ReducersState(
-            initial_state, initial_state, initial_state, initial_state
+        missing_segments = [
+            segment
+            for segment, partial in zip(pending_segments, cached_partials)
+            if partial is None
+        ]
+        computed_partials = iter(
+            reduce_segments(self.registry, missing_segments, since, self.workers)
         )
 
-        state = reduce(ReducersState.reducer, log_entries, initial_compositite_state)
-
-        parsed_jobs = (
-            state.data_sync_state.parsed_jobs
-            + state.event_programs_state.parsed_jobs
-            + state.tracker_programs_state.parsed_jobs
-            + state.metadata_sync_state.parsed_jobs
+        partials: List[PartialReduction] = []
+        for segment, cached_partial in zip(pending_segments, cached_partials):
+            if cached_partial:
+                print(f"Using cached parse result: {segment.log_file.path}")
+                segment.update_progress(cached_partial.segment)
+                # The cached segment may have another path (the file was rotated since)
+                partials.append(replace(cached_partial, segment=segment))
+            else:
+                partial = next(computed_partials)
+                if self.result_cache and self._is_whole_rotated_file(segment, since_timestamp):
+                    self.result_cache.save(segment, self.registry.key, partial)
+                partials.append(partial)
+
+        if self.result_cache:
+            self.result_cache.evict()
+
+        return merge_partial_reductions(self.registry, partials, initial_state, since)
+
+    def _get_cached_result(
+        self, segment: LogFileSegment, since_timestamp: Optional[str]
+    ) -> Optional[PartialReduction]:
+        if not self.result_cache or segment.log_file.is_live or segment.start != 0:
+            return None
+
+        partial = self.result_cache.get(segment, self.registry.key)
+        first_timestamp = partial.segment.first_timestamp if partial else None
+        if partial and self._is_whole_file(segment, first_timestamp, since_timestamp):
+            return partial
+        else:
+            return None
+
+    def _is_whole_rotated_file(
+        self, segment: LogFileSegment, since_timestamp: Optional[str]
+    ) -> bool:
+        """The rotated file has been reduced from its first line."""
+        return (
+            not segment.log_file.is_live
+            and segment.start == 0
+            and self._is_whole_file(segment, segment.first_timestamp, since_timestamp)
         )
 
-        return (parsed_jobs, state.data_sync_state.last_processed_timestamp)
-
-    def _get_log_entry(self, line: str) -> Optional[LogEntry]:
-        # "* INFO 2025-07-16T09:04:50,123 Some message"
-        if not line.startswith("*"):
-            return LogEntry(timestamp=None, text=line)
+    def _is_whole_file(
+        self,
+        segment: LogFileSegment,
+        first_timestamp: Optional[str],
+        since_timestamp: Optional[str],
+    ) -> bool:
+        if since_timestamp is None or not segment.use_since:
+            return True
         else:
-            parts = line.split()
-            if len(parts) < 4:
-                error(f"Cannot parse: {line}")
-                return LogEntry(timestamp=None, text=line)
-
-            timestamp_str = parts[2]
-            try:
-                timestamp = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S,%f")
-            except ValueError:
-                error(f"Invalid timestamp: {line}")
-                return LogEntry(timestamp=None, text=line)
+            return first_timestamp is not None and first_timestamp > since_timestamp
 
-            return LogEntry(timestamp=timestamp, text=" ".join(parts[3:]))
-
-
-reducers = D2JobReducers()
-
-
-@dataclass
-class ReducersState:
-    data_sync_state: SyncJobParserState
-    event_programs_state: SyncJobParserState
-    tracker_programs_state: SyncJobParserState
-    metadata_sync_state: SyncJobParserState
-
-    @staticmethod
-    def reducer(state: "ReducersState", log_entry: LogEntry) -> "ReducersState":
-        state1 = reducers.data_sync_reducer(state.data_sync_state, log_entry)
-        state2 = reducers.event_programs_reducer(state.event_programs_state, log_entry)
-        state3 = reducers.tracker_programs_reducer(state.tracker_programs_state, log_entry)
-        state4 = reducers.metadata_sync_reducer(state.metadata_sync_state, log_entry)
-        return ReducersState(state1, state2, state3, state4)
+    def _get_log_entries(
+        self, segments: List[LogFileSegment], since: Optional[datetime]
+    ) -> Iterator[LogEntry]:
+        for segment in segments:
+            yield from get_log_entries(segment, self.registry.scanner, since)
 
+    def _get_merged_log_entries(
+        self, pending_segments: List[LogFileSegment], since: Optional[datetime]
+    ) -> Iterator[LogEntry]:
+        """Entries of all the nodes by timestamp (files of a node are read in order)."""
+        streams = [
+            (
+                node or logs_folder.path,
+                self._get_log_entries(
+                    [segment for segment in pending_segments if segment.log_file.node == node],
+                    since,
+                ),
+            )
+            for node, logs_folder in self.logs_folders
+        ]
 
-def error(message: str) -> None:
-    print(f"Error: {message}")
+        return merge_log_entries(streams)
+
+    def _reduce_entries(
+        self, entries: Iterator[LogEntry], initial_state: ReducersState
+    ) -> Generator[SyncJobReportItem, None, ReducersState]:
+        state = initial_state
+
+        for log_entry in entries:
+            c = self.registry.classifier.classify(log_entry)
+            if not c:
+                continue
+
+            state = ReducersState.classified_reducer(state, log_entry, c)
+            # Only entries with a close delimiter add jobs to the report
+            if c.closes_success or c.closes_error:
+                yield from state.pop_parsed_jobs()
+
+        return state
+
+
+def collect(
+    items: Generator[SyncJobReportItem, None, Tuple[ReducersState, SyncJobReport]],
+) -> Tuple[ReducersState, SyncJobReport]:
+    """Consume the items and return the final state and the report with the items."""
+    collected: List[SyncJobReportItem] = []
+
+    while True:
+        try:
+            collected.append(next(items))
+        except StopIteration as stop:
+            state, report = stop.value
+            return state, replace(report, items=collected)
+
+
+def get_logs_folders(
+    logs_folder_path: Union[str, LogsFolder, Sequence[Union[str, LogsFolder]]],
+    node_names: Optional[Sequence[str]],
+) -> List[Tuple[Optional[str], LogsFolder]]:
+    """
+    Return the node name and folder of each logs folder (paths are local folders). Entries are
+    only tagged with their node when there are several folders, named after their paths if
+    node_names is not set.
+    """
+    if isinstance(logs_folder_path, (str, LogsFolder)):
+        paths: List[Union[str, LogsFolder]] = [logs_folder_path]
+    else:
+        paths = list(logs_folder_path)
+
+    folders = [LocalLogsFolder(path) if isinstance(path, str) else path for path in paths]
+
+    if len(folders) == 1:
+        return [(None, folders[0])]
+    else:
+        return list(zip(node_names or [folder.path for folder in folders], folders))
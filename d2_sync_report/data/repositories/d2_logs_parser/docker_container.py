@@ -0,0 +1,166 @@
+"""
+Access to the log files of a Docker container through `docker exec`.
+
+Files can be read as a stream (the output of `tail -c +OFFSET` through a pipe, see
+ContainerFileReader), so they are parsed while they are transferred and nothing is written to the
+local disk, or copied to a local mirror (see DockerLogsMirror).
+"""
+
+import io
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import IO, BinaryIO, List, Optional, Union
+
+LOG_FILE_PATTERN = "dhis.log*"
+
+# Seeking forward up to this distance skips the bytes of the current stream instead of starting
+# a new one (starting a `docker exec` takes some tenths of a second)
+MAX_SKIP_SIZE = 1024 * 1024
+
+
+@dataclass
+class RemoteLogFile:
+    name: str
+    size: int
+    # Modification time, seconds since epoch
+    mtime: int
+    device: int = 0
+    inode: int = 0
+
+
+class DockerContainer:
+    """Commands to read the log files of a container."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def list_files(self, folder: str) -> List[RemoteLogFile]:
+        command = ["find", folder, "-maxdepth", "1", "-type", "f", "-name", LOG_FILE_PATTERN]
+        stat = ["-exec", "stat", "-c", "%s %Y %d %i %n", "{}", "+"]
+        output = self._exec(command + stat).decode()
+
+        return [
+            RemoteLogFile(
+                name=os.path.basename(path),
+                size=int(size),
+                mtime=int(mtime),
+                device=int(device),
+                inode=int(inode),
+            )
+            for line in output.splitlines()
+            for size, mtime, device, inode, path in [line.split(" ", 4)]
+        ]
+
+    def read_head(self, path: str, size: int) -> bytes:
+        return self._exec(["head", "-c", str(size), path])
+
+    def open_range(self, path: str, offset: int) -> io.RawIOBase:
+        """Stream the contents of the file from the offset (tail counts bytes from 1)."""
+        return ProcessOutput(["docker", "exec", self.name, "tail", "-c", f"+{offset + 1}", path])
+
+    def append_range(self, path: str, offset: int, file: BinaryIO) -> None:
+        """Write the contents of the file from the offset to the local file."""
+        self._run(["docker", "exec", self.name, "tail", "-c", f"+{offset + 1}", path], stdout=file)
+
+    def copy(self, path: str, local_path: str) -> None:
+        self._run(["docker", "cp", f"{self.name}:{path}", local_path])
+
+    def _exec(self, command: List[str]) -> bytes:
+        return self._run(["docker", "exec", self.name] + command, stdout=subprocess.PIPE)
+
+    def _run(self, command: List[str], stdout: Union[int, IO[bytes], None] = None) -> bytes:
+        result = subprocess.run(command, check=True, stdout=stdout)
+        return result.stdout or b""
+
+
+class ProcessOutput(io.RawIOBase):
+    """Output of a command, the command is killed if closed before the end."""
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        # Unbuffered, reads return what the pipe has (the reader has its own buffer)
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, bufsize=0)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        assert self.process.stdout is not None
+        data = self.process.stdout.read(len(buffer))
+        size = len(data)
+        memoryview(buffer).cast("B")[:size] = data
+
+        if size == 0 and self.process.wait() != 0:
+            command = " ".join(self.command)
+            raise OSError(f"Command failed ({self.process.returncode}): {command}")
+
+        return size
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        if self.process.stdout:
+            self.process.stdout.close()
+        self.process.wait()
+        super().close()
+
+
+class ContainerFileReader(io.RawIOBase):
+    """
+    File of a container, read through a stream that starts at the current position. Seeking
+    forward a short distance skips bytes of the stream, other seeks start a new stream.
+    """
+
+    def __init__(self, container: DockerContainer, path: str):
+        self.container = container
+        self.path = path
+        self.position = 0
+        self.stream: Optional[io.RawIOBase] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Container files can only be seeked from the start")
+
+        distance = offset - self.position
+
+        if self.stream is not None and 0 < distance <= MAX_SKIP_SIZE:
+            while self.position < offset and self.read(min(offset - self.position, MAX_SKIP_SIZE)):
+                pass
+        elif distance != 0:
+            self._close_stream()
+            self.position = offset
+
+        return self.position
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        if self.stream is None:
+            self.stream = self.container.open_range(self.path, self.position)
+
+        size = self.stream.readinto(buffer) or 0
+        self.position += size
+        return size
+
+    def close(self) -> None:
+        self._close_stream()
+        super().close()
+
+    def _close_stream(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+def open_container_file(container_name: str, path: str) -> io.BufferedReader:
+    return io.BufferedReader(ContainerFileReader(DockerContainer(container_name), path))
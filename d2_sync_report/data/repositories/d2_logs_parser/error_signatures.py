@@ -0,0 +1,109 @@
+"""
+Group the errors of a sync job by signature: the error with dates, periods, UIDs and numbers
+masked, so errors that only differ in the objects they refer to are counted together.
+
+A failed sync may log tens of thousands of errors. Each job only keeps a count and a few examples
+of each signature, with hard limits on the number of signatures and on the size of the kept
+texts, so memory and the size of the report do not grow with the number of errors.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from d2_sync_report.domain.entities.sync_job_report import SyncJobErrorSignature
+
+# Limits for each job
+MAX_SIGNATURES = 100
+MAX_EXAMPLES = 3
+# Characters of the signatures and examples kept
+MAX_SIZE = 1_000_000
+
+# Only the start of long errors (i.e. summaries with many conflicts) is used as signature
+MAX_SIGNATURE_LENGTH = 500
+
+# Dates (with optional time) and periods (2025W27, 2025Q1, ...), before numbers are masked
+DATE_OR_PERIOD_REGEX = re.compile(
+    r"\b\d{4}(?:(-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?)?)|(?:BiW|W|Q|S|B)\d{1,2}\b)"
+)
+
+# DHIS2 UID: a letter and 10 alphanumeric characters
+UID_REGEX = re.compile(r"\b[A-Za-z][A-Za-z0-9]{10}\b")
+
+NUMBER_REGEX = re.compile(r"\d+")
+
+
+def get_signature(error: str) -> str:
+    signature = DATE_OR_PERIOD_REGEX.sub(mask_date_or_period, error[:MAX_SIGNATURE_LENGTH])
+    signature = UID_REGEX.sub(mask_uid, signature)
+    return NUMBER_REGEX.sub("<n>", signature)
+
+
+def mask_date_or_period(match: re.Match[str]) -> str:
+    return "<date>" if match.group(1) else "<period>"
+
+
+def mask_uid(match: re.Match[str]) -> str:
+    # Words of the same length (i.e. "transaction") are not UIDs
+    word = match.group()
+    return word if word[1:].islower() else "<uid>"
+
+
+@dataclass
+class ErrorSignatures:
+    """Errors of a job in progress, grouped by signature. Mutated in place."""
+
+    by_signature: Dict[str, SyncJobErrorSignature] = field(default_factory=dict)
+    # Errors not counted in any signature, once the limits are reached or when errors are only
+    # counted (status only)
+    omitted: int = 0
+    size: int = 0
+
+    @staticmethod
+    def from_signatures(signatures: List[SyncJobErrorSignature], omitted: int) -> "ErrorSignatures":
+        errors = ErrorSignatures(omitted=omitted)
+
+        for signature in signatures:
+            errors.by_signature[signature.signature] = SyncJobErrorSignature(
+                signature.signature, signature.count, list(signature.examples)
+            )
+            errors.size += len(signature.signature) + sum(map(len, signature.examples))
+
+        return errors
+
+    @property
+    def count(self) -> int:
+        return self.omitted + sum(signature.count for signature in self.by_signature.values())
+
+    @property
+    def signatures(self) -> List[SyncJobErrorSignature]:
+        return list(self.by_signature.values())
+
+    @property
+    def examples(self) -> List[str]:
+        return [
+            example for signature in self.by_signature.values() for example in signature.examples
+        ]
+
+    def add(self, errors: Iterable[str]) -> None:
+        for error in errors:
+            key = get_signature(error)
+            signature = self.by_signature.get(key)
+
+            if signature is None:
+                if len(self.by_signature) >= MAX_SIGNATURES or self.size + len(key) > MAX_SIZE:
+                    self.omitted += 1
+                    continue
+
+                signature = self.by_signature[key] = SyncJobErrorSignature(key, 0, [])
+                self.size += len(key)
+
+            signature.count += 1
+
+            if (
+                len(signature.examples) < MAX_EXAMPLES
+                and self.size + len(error) <= MAX_SIZE
+                and error not in signature.examples
+            ):
+                signature.examples.append(error)
+                self.size += len(error)
@@ -15,8 +15,26 @@ ImportSummary{
 """
 
 import re
-from dataclasses import dataclass
-from typing import Iterator, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+# Conflicts kept in full for each line, the rest are only counted (a line may have thousands)
+MAX_CONFLICTS = 100
+
+SUMMARY_START = "ImportSummary{"
+
+# Tokens in a summary: fields (key=value or key='value', after a brace, a comma or the start of a
+# conflict), conflicts and braces. The regex skips the rest of the text in C, instead of looping
+# over every character.
+TOKEN_REGEX = re.compile(r"(ImportConflict\{|[{,]) ?(\w+)=('?)|ImportConflict\{|[{}]")
+
+# Closing quote of a quoted value: the value itself may contain quotes (i.e. "can't")
+QUOTED_VALUE_END_REGEX = re.compile(r"'(?=[,}\]])")
+
+STATUS_REGEX = re.compile(r"\w+")
+
+# Example: "imports=926, updates=0, ignores=74, deletes=0"
+COUNT_REGEX = re.compile(r"(\w+)=(\d+)")
 
 
 @dataclass
@@ -25,7 +43,22 @@ class ImportSummary:
     description: Optional[str] = None
     import_count: Optional[str] = None
     reference: Optional[str] = None
-    conflicts: Optional[str] = None
+    conflicts: List[str] = field(default_factory=list)
+    # Conflicts over the limit of the line (see MAX_CONFLICTS), not kept
+    omitted_conflicts: int = 0
+
+    @property
+    def has_conflicts(self) -> bool:
+        return bool(self.conflicts or self.omitted_conflicts)
+
+    @property
+    def conflicts_count(self) -> int:
+        return len(self.conflicts) + self.omitted_conflicts
+
+    def get_counts(self) -> Dict[str, int]:
+        """Counts of the import count by key (imports, updates, ignores, deletes)."""
+        counts = COUNT_REGEX.findall(self.import_count) if self.import_count else []
+        return {key: int(value) for key, value in counts}
 
     def format_summary(self) -> str:
         summary = self
@@ -34,7 +67,10 @@ class ImportSummary:
             [summary.description]
             if summary.status != "SUCCESS" and summary.description and summary.description != "null"
             else []
-        ) + ([summary.conflicts] if summary.conflicts else [])
+        ) + summary.conflicts
+
+        if summary.omitted_conflicts:
+            message_parts.append(f"(+{summary.omitted_conflicts} more conflicts)")
 
         message = " ".join(message_parts)
 
@@ -47,61 +83,76 @@ class ImportSummary:
         )
 
 
-def parse_import_summaries(line: str) -> List[ImportSummary]:
-    summary_blocks = parse_with_brackets("ImportSummary", line)
-    summaries: List[ImportSummary] = []
-
-    for block in summary_blocks:
-        # An orthodox parsing would use a proper grammar parser, let's keep it simple and use regexps.
-        status_match = re.search(r"status=(\w+)", block)
-        description_match = re.search(r"description='(.*?)'", block)
-        import_count_match = re.search(r"importCount=\[(.*?)\]", block)
-        reference_match = re.search(r"reference='(.*?)'", block)
-        conflicts_match = re.search(r"ImportConflict\{(.*?)\}", block, re.DOTALL)
-
-        summary = ImportSummary(
-            status=status_match.group(1) if status_match else None,
-            description=description_match.group(1) if description_match else None,
-            import_count=import_count_match.group(1) if import_count_match else None,
-            reference=reference_match.group(1) if reference_match else None,
-            conflicts=(conflicts_match.group(1).strip() if conflicts_match else None),
-        )
-
-        summaries.append(summary)
-
-    return summaries
+def parse_import_summaries(line: str, max_conflicts: int = MAX_CONFLICTS) -> List[ImportSummary]:
+    return list(iter_import_summaries(line, max_conflicts))
 
 
-def parse_with_brackets(keyword: str, text: str) -> Iterator[str]:
+def iter_import_summaries(line: str, max_conflicts: int = MAX_CONFLICTS) -> Iterator[ImportSummary]:
     """
-    Parses text for occurrences of a "keyword{...}", supports balanced braces.
-
-    For example, it can parse ImportSummary blocks like:
-
-        ImportSummary{some error} -> "some error"
-        ImportConflict{{error 1}, {error2}} -> "{error 1}, {error2}"
+    Yield the summaries of the line in a single pass. Only the values are sliced from the line,
+    summary blocks are not copied. Blocks with unbalanced braces (truncated lines) are ignored.
     """
-    keyword2 = keyword + "{"
-    i = 0
-
-    while i < len(text):
-        start = text.find(keyword2, i)
-        if start == -1:
-            break
-
-        brace_level = 1
-        j = start + len(keyword2)
-        while j < len(text) and brace_level > 0:
-            if text[j] == "{":
-                brace_level += 1
-            elif text[j] == "}":
-                brace_level -= 1
-            j += 1
-
-        if brace_level == 0:
-            content = text[start + len(keyword2) : j - 1]
-            yield content
-            i = j
+    kept_conflicts = 0
+    pos = line.find(SUMMARY_START)
+
+    while pos != -1:
+        summary = ImportSummary()
+        # Start at the opening brace, it may be part of the first field token
+        pos += len(SUMMARY_START) - 1
+        depth = 0
+        # Start and depth of the conflict being read
+        conflict_start = 0
+        conflict_depth: Optional[int] = None
+
+        while token := TOKEN_REGEX.search(line, pos):
+            pos = token.end()
+            separator, key, quote = token.group(1, 2, 3)
+
+            if separator == "{":
+                depth += 1
+            elif separator and separator != ",":
+                # Conflict starting with a field, its quoted value is skipped below
+                if conflict_depth is None:
+                    conflict_start, conflict_depth = token.end(1), depth
+                depth += 1
+
+            if key is None:
+                brace = token.group()
+                if brace == "}":
+                    depth -= 1
+                    if depth == conflict_depth:
+                        if kept_conflicts < max_conflicts:
+                            summary.conflicts.append(line[conflict_start : token.start()].strip())
+                            kept_conflicts += 1
+                        else:
+                            summary.omitted_conflicts += 1
+                        conflict_depth = None
+                else:
+                    if brace != "{" and conflict_depth is None:
+                        conflict_start, conflict_depth = pos, depth
+                    depth += 1
+            elif quote:
+                # Values are skipped as a whole, they may contain braces
+                if value_end := QUOTED_VALUE_END_REGEX.search(line, pos):
+                    if depth == 1 and key == "description":
+                        summary.description = line[pos : value_end.start()]
+                    elif depth == 1 and key == "reference":
+                        summary.reference = line[pos : value_end.start()]
+                    pos = value_end.end()
+            elif depth == 1 and key == "status":
+                status = STATUS_REGEX.match(line, pos)
+                summary.status = status.group() if status else None
+            elif depth == 1 and key == "importCount" and line.startswith("[", pos):
+                count_end = line.find("]", pos)
+                if count_end != -1:
+                    summary.import_count = line[pos + 1 : count_end]
+                    pos = count_end + 1
+
+            if depth == 0:
+                break
         else:
-            # Unbalanced braces; abort
+            # Unbalanced braces (truncated line)
             break
+
+        yield summary
+        pos = line.find(SUMMARY_START, pos)
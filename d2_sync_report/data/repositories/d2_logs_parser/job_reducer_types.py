@@ -1,47 +1,206 @@
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from d2_sync_report.domain.entities.sync_job_report import SyncJobReportItem, SyncJobType
+from d2_sync_report.data.repositories.d2_logs_parser.error_signatures import ErrorSignatures
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import parse_timestamp
+from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobImportCount,
+    SyncJobPhase,
+    SyncJobReportItem,
+    SyncJobType,
+)
 
+# Phases kept for a job (an analytics table update has a few stages for each table type)
+MAX_PHASES = 200
 
-@dataclass
+
+@dataclass(slots=True)
 class LogEntry:
-    timestamp: Optional[datetime]
-    text: str
+    """
+    Log record: a line with a timestamp and its continuation lines (stack traces, causes). Only
+    the error fragments and import summaries of the continuation lines are kept (see
+    log_reader.get_log_record).
+
+    Most entries are only classified and discarded, or just open/close a job, so the message is
+    kept as a range of the bytes of the record (classified as bytes, see LogEntryClassifier) and
+    only decoded when a reducer needs the text (i.e. to keep it as an error).
+    """
+
+    # Fixed-width timestamp string, parsed only when needed (see log_timestamps)
+    raw_timestamp: Optional[str]
+    buffer: bytes
+    start: int
+    end: int
+    fragments: Tuple[str, ...] = ()
+    summaries: Tuple[str, ...] = ()
+    # Node of the cluster that wrote the entry, when the logs of several nodes are merged
+    node: Optional[str] = None
+    _text: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @staticmethod
+    def from_text(
+        raw_timestamp: Optional[str],
+        text: str,
+        fragments: Sequence[str] = (),
+        summaries: Sequence[str] = (),
+    ) -> "LogEntry":
+        buffer = text.encode()
+        return LogEntry(
+            raw_timestamp, buffer, 0, len(buffer), tuple(fragments), tuple(summaries), _text=text
+        )
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            message = self.buffer[self.start : self.end]
+            self._text = message.decode("utf-8", errors="replace").rstrip()
+        return self._text
+
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        return parse_timestamp(self.raw_timestamp) if self.raw_timestamp else None
+
+    def contains(self, marker: bytes) -> bool:
+        return self.buffer.find(marker, self.start, self.end) != -1
 
 
 @dataclass
+class Delimiters:
+    """
+    Patters that identify the start and end (success or error) of sync jobs, and the start and
+    end of their phases (the name of a phase follows its start delimiter).
+    To be used in the generic sync reducer.
+    """
+
+    open: List[str]
+    close_success: List[str]
+    close_error: List[str]
+    phase_start: List[str] = field(default_factory=list)
+    phase_end: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SyncJobDefinition:
+    """
+    Sync job type with the section that tags its log lines and the delimiters of its executions.
+    When match_section is set, delimiters only match on lines tagged with the section. When
+    untagged_lines is not set, lines without section tag (causes, error fragments and import
+    summaries) are not attributed to the runs of the job, only its tagged lines are.
+    """
+
+    type: SyncJobType
+    section: str
+    delimiters: Delimiters
+    match_section: bool = True
+    untagged_lines: bool = True
+
+
+@dataclass(slots=True)
 class SyncJobParserInProgress:
     type: SyncJobType
     start: datetime
-    errors: List[str]
+    errors: ErrorSignatures
+    phases: List[SyncJobPhase] = field(default_factory=list)
+    import_count: SyncJobImportCount = field(default_factory=SyncJobImportCount)
+    node: Optional[str] = None
+
+
+# Key of the run of a job opened by a line without section tag (i.e. metadata sync)
+UNTAGGED = ""
 
 
 @dataclass
 class SyncJobParserState:
-    current: Union[SyncJobParserInProgress, None]
+    """
+    State of the parser for a job type.
+
+    Jobs may have tens of thousands of errors and a log window thousands of jobs, so the state is
+    mutated in place (errors are grouped by signature, parsed jobs are appended) instead of being
+    copied on every log entry. Methods still return the state, so reducers keep their signature.
+
+    Several runs of a job type may be in progress at once (i.e. different data sync job
+    configurations), so runs are kept by the UID of the section tag of their lines
+    ("[DATA_SYNC lp1KgFgSNcp]"), in order of activity: the last run is the current one, which
+    receives the lines without tag (see select).
+    """
+
+    runs: Dict[str, SyncJobParserInProgress]
     parsed_jobs: List[SyncJobReportItem]
     last_processed_timestamp: Optional[datetime]
 
     @staticmethod
     def initial() -> "SyncJobParserState":
-        return SyncJobParserState(current=None, parsed_jobs=[], last_processed_timestamp=None)
+        return SyncJobParserState(runs={}, parsed_jobs=[], last_processed_timestamp=None)
+
+    @property
+    def current(self) -> Optional[SyncJobParserInProgress]:
+        return self.runs[next(reversed(self.runs))] if self.runs else None
+
+    def select(self, job_uid: Optional[str]) -> "SyncJobParserState":
+        """Make the run of the job UID (if in progress) the current one."""
+        if job_uid is not None and job_uid in self.runs:
+            self.runs[job_uid] = self.runs.pop(job_uid)
+
+        return self
+
+    def open_job(
+        self, current: SyncJobParserInProgress, job_uid: str = UNTAGGED
+    ) -> "SyncJobParserState":
+        # A run of the same job that never closed (i.e. the server was restarted) is discarded
+        self.runs.pop(job_uid, None)
+        self.runs[job_uid] = current
+        self.last_processed_timestamp = None
+        return self
+
+    def close_job(
+        self, parsed: SyncJobReportItem, timestamp: Optional[datetime]
+    ) -> "SyncJobParserState":
+        if self.runs:
+            self.runs.popitem()
+        self.parsed_jobs.append(parsed)
+        self.last_processed_timestamp = timestamp
+        return self
 
     def add_errors(self, errors: List[str]) -> "SyncJobParserState":
-        if not self.current:
-            return self
-        else:
-            return replace(self, current=replace(self.current, errors=self.current.errors + errors))
-
-    def append_to_last_error(self, error: str) -> "SyncJobParserState":
-        """
-        Append a text to the last error in the current job's errors list, using separator " - "
-        """
-        if not self.current or not self.current.errors:
-            return self
-        else:
-            last_error = self.current.errors[-1]
-            print(f"Appending to last error: '{last_error}' with '{error}'")
-            updated_errors = self.current.errors[:-1] + [last_error + " - " + error]
-            return replace(self, current=replace(self.current, errors=updated_errors))
+        if self.current:
+            self.current.errors.add(errors)
+
+        return self
+
+    def count_errors(self, count: int) -> "SyncJobParserState":
+        """Count errors that are not kept (status only, see LogEntryClassifier)."""
+        if self.current:
+            self.current.errors.omitted += count
+
+        return self
+
+    def add_import_count(self, counts: Dict[str, int], conflicts: int) -> "SyncJobParserState":
+        """Add the counts of an import summary (see ImportSummary.get_counts) to the totals."""
+        if self.current:
+            total = self.current.import_count
+            total.imported += counts.get("imports", 0)
+            total.updated += counts.get("updates", 0)
+            total.ignored += counts.get("ignores", 0)
+            total.deleted += counts.get("deleted", 0) + counts.get("deletes", 0)
+            total.conflicts += conflicts
+
+        return self
+
+    def start_phase(self, name: str, start: datetime) -> "SyncJobParserState":
+        if self.current and len(self.current.phases) < MAX_PHASES:
+            self.current.phases.append(SyncJobPhase(name=name, start=start))
+
+        return self
+
+    def end_phase(self, end: datetime) -> "SyncJobParserState":
+        phases = self.current.phases if self.current else []
+        if phases and phases[-1].end is None:
+            phases[-1].end = end
+
+        return self
+
+    def pop_parsed_jobs(self) -> List[SyncJobReportItem]:
+        """Return the jobs closed so far and forget them (they are streamed to the caller)."""
+        parsed_jobs, self.parsed_jobs = self.parsed_jobs, []
+        return parsed_jobs
@@ -0,0 +1,78 @@
+"""
+Registry of the sync job types enabled for a parse.
+
+Job definitions (section tag and delimiters, see SyncJobDefinition) are read from a JSON file,
+so new job log formats are supported without code changes. They are compiled once, at startup,
+into the classifier (a single regex for the delimiters of all the jobs) and the scanner, which
+only look for the patterns of the enabled jobs. The registry is passed to the worker processes.
+
+A status-only registry only looks for the open and close delimiters (see LogEntryClassifier).
+"""
+
+import hashlib
+from importlib.resources import files
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    LogEntry,
+    SyncJobDefinition,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    LogEntryClassifier,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_scanner import LogScanner
+from d2_sync_report.data.repositories.d2_logs_parser.reducers_state import ReducersState
+from d2_sync_report.domain.entities.sync_job_report import SyncJobInProgress, SyncJobType
+
+
+class JobDefinitionsProps(BaseModel):
+    jobs: List[SyncJobDefinition]
+
+
+class JobRegistry:
+    def __init__(self, definitions: List[SyncJobDefinition], status_only: bool = False):
+        self.definitions = definitions
+        self.status_only = status_only
+        self.types = [definition.type for definition in definitions]
+        self.classifier = LogEntryClassifier(definitions, status_only)
+        self.scanner = LogScanner(self.classifier.patterns, self.classifier.follower_patterns)
+
+        # Reductions depend on the definitions and the mode (see ParseResultCache)
+        contents = JobDefinitionsProps(jobs=definitions).model_dump_json()
+        mode = "status" if status_only else "full"
+        self.key = hashlib.sha1(f"{mode}:{contents}".encode()).hexdigest()
+
+    @staticmethod
+    def from_file(path: str, types: Optional[List[SyncJobType]] = None) -> "JobRegistry":
+        """Load the job definitions, only those of the given types if any."""
+        with open(path, "r", encoding="utf-8") as f:
+            definitions = JobDefinitionsProps.model_validate_json(f.read()).jobs
+
+        return JobRegistry(
+            [definition for definition in definitions if not types or definition.type in types]
+        )
+
+    @staticmethod
+    def default() -> "JobRegistry":
+        return JobRegistry.from_file(get_default_job_definitions_path())
+
+    def with_status_only(self) -> "JobRegistry":
+        return self if self.status_only else JobRegistry(self.definitions, status_only=True)
+
+    def initial_state(self) -> ReducersState:
+        return ReducersState.initial(self.types)
+
+    def from_jobs_in_progress(self, jobs: List[SyncJobInProgress]) -> ReducersState:
+        return ReducersState.from_jobs_in_progress(self.types, jobs)
+
+    def reducer(self, state: ReducersState, log_entry: LogEntry) -> ReducersState:
+        # Classify the entry once and only pass it to the reducers that are concerned by it
+        c = self.classifier.classify(log_entry)
+        return ReducersState.classified_reducer(state, log_entry, c) if c else state
+
+
+def get_default_job_definitions_path() -> str:
+    folder = "d2_sync_report.data.repositories.resources"
+    return str(files(folder).joinpath("job_definitions.json"))
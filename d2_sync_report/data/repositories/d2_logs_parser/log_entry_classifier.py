@@ -0,0 +1,271 @@
+"""
+Classify each log entry once, before it reaches the job reducers.
+
+Most lines in dhis.log are unrelated to sync jobs. The line is lowercased once and a single
+compiled regular expression with the delimiters of all the job definitions (see JobRegistry) and
+the markers finds them all in one pass. Lines without matches are discarded. Each delimiter found
+is then looked up to know the jobs it opens or closes, and the sections it must be tagged with, so
+each reducer just checks the resulting classification. Classification works on the raw bytes of
+the message, so entries are not decoded (see LogEntry).
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    LogEntry,
+    SyncJobDefinition,
+    SyncJobParserState,
+)
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+from d2_sync_report.utils.uniq import uniq
+
+# Markers are case-sensitive, delimiters are not
+IMPORT_SUMMARY_MARKER = "ImportSummary{"
+CAUSED_BY_MARKER = "Caused by:"
+ERROR_DETAIL_MARKER = "Detail: "
+
+import_summary_marker = IMPORT_SUMMARY_MARKER.encode()
+caused_by_marker = CAUSED_BY_MARKER.encode()
+
+# Errors only counted in status only mode, without parsing them (a cause, a failed import)
+ERROR_COUNT_MARKERS = [CAUSED_BY_MARKER, IMPORT_SUMMARY_MARKER + "status=ERROR"]
+error_count_markers = [marker.encode() for marker in ERROR_COUNT_MARKERS]
+
+# Example: "[META_DATA_SYNC aBcD9Zo0xrG] Process started"
+SECTION_REGEX = re.compile(rb"\[(\w+) ")
+SECTION_TAG_REGEX = re.compile(rb"\[(\w+) (\w+)\]")
+
+# Example: "Stage started: Updating resource tables (ControlledJobProgress.java [taskScheduler-3])"
+SOURCE_LOCATION_REGEX = re.compile(r"\s*\([\w$.]+ \[[^\]]*\]\)$")
+
+
+@dataclass(frozen=True)
+class LogEntryClassification:
+    opens: FrozenSet[SyncJobType]
+    closes_success: FrozenSet[SyncJobType]
+    closes_error: FrozenSet[SyncJobType]
+    starts_phase: FrozenSet[SyncJobType]
+    ends_phase: FrozenSet[SyncJobType]
+    # Name of the phase started by the entry (the text after the delimiter)
+    phase: Optional[str]
+    import_summaries: bool
+    caused_by: bool
+    # Causes or import summaries in the continuation lines
+    error_fragments: bool
+    # Errors in the record, counted by their markers (status only, see LogEntryClassifier)
+    error_markers: int
+    section: Optional[str]
+    job_uid: Optional[str]
+    # Job type of the section tag, if it is the section of a sync job
+    tagged_type: Optional[SyncJobType]
+    # Job types that only take their tagged lines (see SyncJobDefinition.untagged_lines)
+    tagged_lines_only: FrozenSet[SyncJobType]
+
+    def concerns(self, type: SyncJobType, state: SyncJobParserState) -> bool:
+        """Return True if the reducer of the job type must process the entry."""
+        if type in self.opens:
+            return True
+        elif not state.runs:
+            return False
+        else:
+            return self.concerns_open_job(type)
+
+    def concerns_open_job(self, type: SyncJobType) -> bool:
+        """Return True if the entry affects a job of this type that is in progress."""
+        # Lines tagged with the section of another sync job belong to a run of that job
+        if self.tagged_type is not None and self.tagged_type != type:
+            return False
+
+        takes_errors = self.tagged_type == type or type not in self.tagged_lines_only
+
+        return (
+            type in self.closes_success
+            or type in self.closes_error
+            or type in self.starts_phase
+            or type in self.ends_phase
+            or (
+                takes_errors
+                and (
+                    self.import_summaries
+                    or self.caused_by
+                    or self.error_fragments
+                    or self.error_markers > 0
+                )
+            )
+        )
+
+    def get_job_uid(self, type: SyncJobType) -> Optional[str]:
+        """UID of the run of the job type the entry is tagged with, if any."""
+        return self.job_uid if self.tagged_type == type else None
+
+
+# Kinds of delimiter, in the order of the fields of LogEntryClassification
+OPEN, CLOSE_SUCCESS, CLOSE_ERROR, PHASE_START, PHASE_END = range(5)
+
+
+@dataclass(frozen=True)
+class Delimiter:
+    kind: int
+    type: SyncJobType
+    # Lowercased section the line must be tagged with, None if it matches any line
+    section: Optional[bytes]
+
+
+class LogEntryClassifier:
+    """
+    With status_only, only the open and close delimiters are searched: phases are ignored and
+    errors are not parsed, only counted with their markers (see ERROR_COUNT_MARKERS), so jobs only
+    get their status, start and end, with the same success as in the full report.
+    """
+
+    def __init__(self, definitions: List[SyncJobDefinition], status_only: bool = False):
+        self.status_only = status_only
+        kinds = [OPEN, CLOSE_SUCCESS, CLOSE_ERROR] if status_only else None
+        # Lowercased delimiter -> jobs it opens or closes (several jobs may share a delimiter)
+        self.delimiters: Dict[bytes, List[Delimiter]] = {}
+
+        for definition in definitions:
+            section = lower(definition.section) if definition.match_section else None
+            for kind, patterns in enumerate(get_patterns_by_kind(definition, kinds)):
+                for pattern in patterns:
+                    delimiter = Delimiter(kind=kind, type=definition.type, section=section)
+                    self.delimiters.setdefault(lower(pattern), []).append(delimiter)
+
+        markers = (
+            [] if status_only else [m.lower() for m in [IMPORT_SUMMARY_MARKER, CAUSED_BY_MARKER]]
+        )
+        # A detail logged as a record of its own only matters right after a cause (the reader
+        # appends it), so it is only searched in the records that follow a candidate (see
+        # LogScanner) and it is not classified.
+        self.follower_patterns = [] if status_only else [ERROR_DETAIL_MARKER.lower()]
+        error_markers = [m.lower() for m in ERROR_COUNT_MARKERS] if status_only else []
+        # Lowercased patterns that any relevant line contains (used by LogScanner). Delimiters that
+        # must be tagged are only found in lines with the tag of their section, which is searched
+        # instead: a single pattern, however many delimiters the job has.
+        self.patterns = uniq(
+            [f"[{d.section.lower()} " for d in definitions if d.match_section]
+            + [
+                pattern.lower()
+                for d in definitions
+                if not d.match_section
+                for patterns in get_patterns_by_kind(d, kinds)
+                for pattern in patterns
+            ]
+            + markers
+            + error_markers
+        )
+
+        self.section_types = {lower(d.section): d.type for d in definitions}
+        self.tagged_lines_only = frozenset(d.type for d in definitions if not d.untagged_lines)
+
+        # A single regex finds all the delimiters and markers of all job types, so the cost per
+        # line does not depend on the number of job types. Longest patterns first, so a delimiter
+        # that contains another one wins. Search on the lowercased line: a case-insensitive regex
+        # is many times slower.
+        self.patterns_regex = re.compile(
+            b"|".join(
+                re.escape(pattern)
+                for pattern in sorted(
+                    {*self.delimiters, *(lower(marker) for marker in markers)},
+                    key=len,
+                    reverse=True,
+                )
+            )
+        )
+
+    def classify(self, log_entry: LogEntry) -> Optional[LogEntryClassification]:
+        """Return the classification of the entry, None if no reducer is interested in it."""
+        message = log_entry.buffer[log_entry.start : log_entry.end]
+        line = message.lower()
+        matches = self.patterns_regex.findall(line)
+        has_errors = not self.status_only
+
+        has_fragments = has_errors and bool(log_entry.fragments or log_entry.summaries)
+        error_markers = 0 if has_errors else count_error_markers(log_entry)
+
+        if not matches and not has_fragments and not error_markers:
+            return None
+
+        tag_match = SECTION_TAG_REGEX.search(message)
+        types_by_kind, phase_match = self._get_types_by_kind(message, matches)
+
+        return LogEntryClassification(
+            opens=frozenset(types_by_kind[OPEN]),
+            closes_success=frozenset(types_by_kind[CLOSE_SUCCESS]),
+            closes_error=frozenset(types_by_kind[CLOSE_ERROR]),
+            starts_phase=frozenset(types_by_kind[PHASE_START]),
+            ends_phase=frozenset(types_by_kind[PHASE_END]),
+            phase=get_phase_name(message, line, phase_match) if phase_match else None,
+            import_summaries=has_errors and import_summary_marker in message,
+            caused_by=has_errors and caused_by_marker in message,
+            error_fragments=has_fragments,
+            error_markers=error_markers,
+            section=tag_match.group(1).decode() if tag_match else None,
+            job_uid=tag_match.group(2).decode() if tag_match else None,
+            tagged_type=self.section_types.get(tag_match.group(1).lower()) if tag_match else None,
+            tagged_lines_only=self.tagged_lines_only,
+        )
+
+    def _get_types_by_kind(
+        self, message: bytes, matches: List[bytes]
+    ) -> Tuple[List[Set[SyncJobType]], Optional[bytes]]:
+        """Return the job types of each kind of delimiter, and the phase start delimiter."""
+        types_by_kind: List[Set[SyncJobType]] = [set() for _ in range(PHASE_END + 1)]
+        sections: Optional[Set[bytes]] = None
+        phase_match: Optional[bytes] = None
+
+        # Markers are not delimiters, they have no entry
+        for match in matches:
+            for delimiter in self.delimiters.get(match, []):
+                if delimiter.section is not None:
+                    if sections is None:
+                        sections = {s.lower() for s in SECTION_REGEX.findall(message)}
+                    if delimiter.section not in sections:
+                        continue
+
+                types_by_kind[delimiter.kind].add(delimiter.type)
+                if delimiter.kind == PHASE_START:
+                    phase_match = match
+
+        return types_by_kind, phase_match
+
+
+def get_patterns_by_kind(
+    definition: SyncJobDefinition, kinds: Optional[List[int]] = None
+) -> List[List[str]]:
+    """
+    Delimiters of the definition, in the order of the kinds of delimiter (OPEN, ...). Only those of
+    the given kinds if any (the rest are empty).
+    """
+    delimiters = definition.delimiters
+    patterns_by_kind = [
+        delimiters.open,
+        delimiters.close_success,
+        delimiters.close_error,
+        delimiters.phase_start,
+        delimiters.phase_end,
+    ]
+
+    return [
+        patterns if kinds is None or kind in kinds else []
+        for kind, patterns in enumerate(patterns_by_kind)
+    ]
+
+
+def count_error_markers(log_entry: LogEntry) -> int:
+    """Errors in the message and the continuation lines of the entry, without decoding them."""
+    buffer = log_entry.buffer
+    return sum(buffer.count(marker, log_entry.start) for marker in error_count_markers)
+
+
+def get_phase_name(message: bytes, line: bytes, phase_match: bytes) -> str:
+    # The lowercased line has the same offsets as the message (bytes.lower only changes ASCII)
+    start = line.find(phase_match) + len(phase_match)
+    name = message[start:].decode("utf-8", errors="replace").strip()
+    return SOURCE_LOCATION_REGEX.sub("", name).lstrip(":").strip()
+
+
+def lower(pattern: str) -> bytes:
+    return pattern.lower().encode()
@@ -0,0 +1,116 @@
+"""
+Sparse index of the timestamps of the log files, cached between executions.
+
+While a file is read, we keep the offset and timestamp of a line every few MB (see INDEX_INTERVAL),
+and the time range of the file. With the index, the reader binary-searches the offset where lines
+after the since cut-off start, instead of reading the file from its beginning, and a file whose
+last line is before the cut-off is skipped without reading it (or decompressing it, which is the
+slow part for compressed rotations).
+
+Entries are keyed by the fingerprint of the file. Log files only grow, so the index of a plain file
+is still valid for its first bytes while it grows. A compressed file is only indexed as a whole.
+Only the entries of the files present in the logs folder are kept.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import (
+    IndexPoint,
+    LogFile,
+    LogFileSegment,
+    is_sorted,
+)
+from d2_sync_report.data.repositories.file_cache import FileCache, get_default_cache_folder
+
+
+@dataclass
+class LogFileIndex:
+    fingerprint: str
+    # Size on disk of the file when it was indexed
+    file_size: int
+    # Size of the indexed contents (decompressed size for compressed files)
+    size: int
+    first_timestamp: Optional[str]
+    last_timestamp: str
+    points: List[IndexPoint]
+
+    @staticmethod
+    def from_segment(segment: LogFileSegment) -> Optional["LogFileIndex"]:
+        """Build the index of a file that has been read up to its end."""
+        if segment.last_timestamp is None:
+            return None
+
+        return LogFileIndex(
+            fingerprint=segment.log_file.fingerprint(),
+            file_size=segment.log_file.size,
+            size=segment.end,
+            first_timestamp=segment.first_timestamp,
+            last_timestamp=segment.last_timestamp,
+            points=segment.index_points,
+        )
+
+    def applies_to(self, log_file: LogFile) -> bool:
+        if log_file.compression:
+            return self.file_size == log_file.size
+        else:
+            return log_file.size >= self.size
+
+    def is_complete(self, log_file: LogFile) -> bool:
+        """The file has not changed since it was indexed."""
+        return self.file_size == log_file.size
+
+    def is_before(self, timestamp: str) -> bool:
+        # Only reliable if timestamps grow along the file
+        timestamps = [point.timestamp for point in self.points] + [self.last_timestamp]
+        return is_sorted(timestamps) and self.last_timestamp <= timestamp
+
+    def load_into(self, segment: LogFileSegment) -> None:
+        segment.first_timestamp = self.first_timestamp
+        segment.last_timestamp = self.last_timestamp
+        segment.index_points = list(self.points)
+
+
+class LogFileIndexCache:
+    def __init__(self, path: Optional[str] = None):
+        path = path or os.path.join(get_default_cache_folder(), "log-files-index.json")
+        self.cache = FileCache(LogFileIndexCacheProps, path, verbose=False)
+
+    def load(self) -> Dict[str, LogFileIndex]:
+        props = self.cache.load()
+        if props is None:
+            return {}
+
+        return {
+            log_file.fingerprint: LogFileIndex(
+                fingerprint=log_file.fingerprint,
+                file_size=log_file.file_size,
+                size=log_file.size,
+                first_timestamp=log_file.first_timestamp,
+                last_timestamp=log_file.last_timestamp,
+                points=[IndexPoint(*point) for point in log_file.points],
+            )
+            for log_file in props.log_files
+        }
+
+    def save(self, indexes: List[LogFileIndex]) -> None:
+        props = LogFileIndexCacheProps(
+            log_files=[LogFileIndexProps(**vars(index)) for index in indexes]
+        )
+        self.cache.save(props)
+
+
+class LogFileIndexProps(BaseModel):
+    fingerprint: str
+    file_size: int
+    size: int
+    first_timestamp: Optional[str]
+    last_timestamp: str
+    points: List[Tuple[int, str]]
+
+
+class LogFileIndexCacheProps(BaseModel):
+    log_files: List[LogFileIndexProps] = []
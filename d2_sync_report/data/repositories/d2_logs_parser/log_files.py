@@ -0,0 +1,281 @@
+"""
+Log files identity and incremental reading.
+
+DHIS2 rotates its log (dhis.log -> dhis.log.N), so a file cannot be identified by its name
+alone. We use the device/inode and a fingerprint (hash of the first bytes of the file), which is
+stable while the file grows. With a matching checkpoint from the previous execution, the reader
+can seek straight to the last processed offset instead of re-reading the whole file.
+
+Older rotations may be compressed by logrotate (dhis.log.N.gz, .bz2 or .xz). They are read as a
+decompressed stream, so offsets and fingerprints always refer to the decompressed contents.
+
+Files of a Docker container (container is set, path is the path in the container) are read through
+a pipe from `docker exec` (see ContainerFileReader), with no local copy.
+"""
+
+import bisect
+import bz2
+import gzip
+import hashlib
+import lzma
+import os
+from dataclasses import dataclass, field
+from io import BufferedIOBase, BufferedReader
+from typing import BinaryIO, Callable, Dict, List, NamedTuple, Optional, Union
+
+from d2_sync_report.data.repositories.d2_logs_parser.docker_container import (
+    RemoteLogFile,
+    open_container_file,
+)
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
+
+FINGERPRINT_SIZE = 1024
+
+LIVE_LOG_FILE_NAME = "dhis.log"
+
+# Minimum distance between the points of the sparse timestamps index of a file
+INDEX_INTERVAL = 4 * 1024 * 1024
+
+# Extension -> function to open the file (path or binary stream) as a decompressed binary stream
+COMPRESSED_OPENERS: Dict[str, Callable[[Union[str, BinaryIO]], BufferedIOBase]] = {
+    ".gz": lambda path: gzip.open(path, "rb"),
+    ".bz2": lambda path: bz2.open(path, "rb"),
+    ".xz": lambda path: lzma.open(path, "rb"),
+}
+
+
+class IndexPoint(NamedTuple):
+    """Offset of a log line with a timestamp and its timestamp."""
+
+    offset: int
+    timestamp: str
+
+
+@dataclass
+class LogFile:
+    path: str
+    name: str
+    device: int
+    inode: int
+    # Size on disk (compressed size for compressed files)
+    size: int
+    compression: Optional[str] = None
+    # Node of the cluster whose logs folder contains the file (logs of several nodes)
+    node: Optional[str] = None
+    # Name of the Docker container that contains the file
+    container: Optional[str] = None
+    _fingerprints: Dict[int, str] = field(default_factory=dict, repr=False)
+
+    @staticmethod
+    def from_path(path: str, node: Optional[str] = None) -> "LogFile":
+        stat = os.stat(path)
+        extension = os.path.splitext(path)[1]
+
+        return LogFile(
+            path=path,
+            name=os.path.basename(path),
+            device=stat.st_dev,
+            inode=stat.st_ino,
+            size=stat.st_size,
+            compression=extension if extension in COMPRESSED_OPENERS else None,
+            node=node,
+        )
+
+    @staticmethod
+    def from_remote(
+        container: str, folder: str, remote_file: RemoteLogFile, node: Optional[str] = None
+    ) -> "LogFile":
+        extension = os.path.splitext(remote_file.name)[1]
+
+        return LogFile(
+            path=folder.rstrip("/") + "/" + remote_file.name,
+            name=remote_file.name,
+            device=remote_file.device,
+            inode=remote_file.inode,
+            size=remote_file.size,
+            compression=extension if extension in COMPRESSED_OPENERS else None,
+            node=node,
+            container=container,
+        )
+
+    def open(self) -> BufferedIOBase:
+        """Open the file in binary mode, decompressing it on the fly if needed."""
+        if not self.compression:
+            return self.open_raw()
+        elif not self.container:
+            return COMPRESSED_OPENERS[self.compression](self.path)
+        else:
+            raw_file = self.open_raw()
+            return DecompressedFile(COMPRESSED_OPENERS[self.compression](raw_file), raw_file)
+
+    def open_raw(self) -> BufferedReader:
+        """Open the file in binary mode, as stored (compressed files are not decompressed)."""
+        if self.container:
+            return open_container_file(self.container, self.path)
+        else:
+            return open(self.path, "rb")
+
+    @property
+    def is_live(self) -> bool:
+        """The live file is still being written, so its last line may be incomplete."""
+        return self.name == LIVE_LOG_FILE_NAME
+
+    def fingerprint(self, size: int = FINGERPRINT_SIZE) -> str:
+        if size not in self._fingerprints:
+            with self.open() as file:
+                self._fingerprints[size] = hashlib.sha1(file.read(size)).hexdigest()
+
+        return self._fingerprints[size]
+
+    def find_checkpoint(self, checkpoints: List[LogFileCheckpoint]) -> Optional[LogFileCheckpoint]:
+        """
+        Return the checkpoint of this same file in a previous execution, if any.
+
+        The fingerprint must match (a truncated or replaced file has a different head), and
+        we prefer checkpoints of the same inode and name when there are several candidates.
+        The size of the decompressed contents of a compressed file is unknown, so the size check
+        only applies to plain files.
+        """
+        candidates = [
+            checkpoint
+            for checkpoint in checkpoints
+            if 0 < checkpoint.size
+            and (self.compression or checkpoint.size <= self.size)
+            and checkpoint.fingerprint == self.fingerprint(min(checkpoint.size, FINGERPRINT_SIZE))
+        ]
+
+        def score(checkpoint: LogFileCheckpoint) -> int:
+            same_inode = (checkpoint.device, checkpoint.inode) == (self.device, self.inode)
+            return 2 * same_inode + (checkpoint.name == self.name)
+
+        return max(candidates, key=score, default=None)
+
+    def to_checkpoint(self, processed_offset: int) -> LogFileCheckpoint:
+        return LogFileCheckpoint(
+            name=self.name,
+            device=self.device,
+            inode=self.inode,
+            size=self.size,
+            fingerprint=self.fingerprint(min(self.size, FINGERPRINT_SIZE)),
+            processed_offset=processed_offset,
+            node=self.node,
+        )
+
+
+class DecompressedFile(BufferedReader):
+    """Decompressed stream of a file that is closed with it (decompressors leave it open)."""
+
+    def __init__(self, decompressed: BufferedIOBase, file: BinaryIO):
+        super().__init__(decompressed)  # type: ignore[arg-type]
+        self.file = file
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self.file.close()
+
+
+@dataclass
+class LogFileSegment:
+    """
+    Portion of a log file to process in the current execution.
+
+    - start: offset where reading starts (start of the file or processed offset of the checkpoint).
+    - end: offset up to where the file has been read (complete lines), updated while reading.
+    - size: size of the contents, unknown for a compressed file until it has been read once.
+    - first_timestamp/last_timestamp: time range of the lines read, updated while reading.
+    - index_points: sparse index of timestamps (from the cached index), updated while reading.
+    """
+
+    log_file: LogFile
+    index: int
+    start: int
+    use_since: bool
+    end: int
+    size: Optional[int]
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+    index_points: List[IndexPoint] = field(default_factory=list)
+
+    @staticmethod
+    def from_log_file(
+        log_file: LogFile, index: int, checkpoints: List[LogFileCheckpoint]
+    ) -> "LogFileSegment":
+        checkpoint = log_file.find_checkpoint(checkpoints)
+        size = get_contents_size(log_file, checkpoint)
+
+        if checkpoint:
+            # Jobs still in progress are restored from the previous execution, so lines already
+            # processed do not need to be read again.
+            return LogFileSegment(
+                log_file=log_file,
+                index=index,
+                start=checkpoint.processed_offset,
+                use_since=False,
+                end=checkpoint.processed_offset,
+                size=size,
+            )
+        else:
+            # If other files have checkpoints, this is a new file (i.e. a new dhis.log after a
+            # rotation), so all its lines are new. Otherwise, use the since timestamp.
+            return LogFileSegment(
+                log_file=log_file,
+                index=index,
+                start=0,
+                use_since=not checkpoints,
+                end=0,
+                size=size,
+            )
+
+    @property
+    def is_consumed(self) -> bool:
+        """There is nothing new to read in the file."""
+        return self.size is not None and self.start >= self.size
+
+    def add_timestamp(self, offset: int, timestamp: str) -> None:
+        """Add the timestamp of a line to the sparse index, if far enough from the last point."""
+        if offset == 0:
+            self.first_timestamp = timestamp
+
+        if not self.index_points or offset >= self.index_points[-1].offset + INDEX_INTERVAL:
+            self.index_points.append(IndexPoint(offset, timestamp))
+
+    def get_seek_offset(self, since_timestamp: str) -> int:
+        """
+        Return the offset of the last indexed line not after since_timestamp. Timestamps grow
+        along the file, so lines before it are not after since_timestamp either. If the index
+        shows they do not (i.e. the clock was changed), start from the beginning.
+        """
+        timestamps = [point.timestamp for point in self.index_points]
+        if not is_sorted(timestamps + ([self.last_timestamp] if self.last_timestamp else [])):
+            return self.start
+
+        index = bisect.bisect_right(timestamps, since_timestamp) - 1
+        return max(self.start, self.index_points[index].offset) if index >= 0 else self.start
+
+    def update_progress(self, segment: "LogFileSegment") -> None:
+        """Copy the reading progress of the same segment (i.e. read in another process)."""
+        self.end = segment.end
+        self.first_timestamp = segment.first_timestamp
+        self.last_timestamp = segment.last_timestamp
+        self.index_points = segment.index_points
+
+
+def is_sorted(values: List[str]) -> bool:
+    return all(a <= b for a, b in zip(values, values[1:]))
+
+
+def get_contents_size(log_file: LogFile, checkpoint: Optional[LogFileCheckpoint]) -> Optional[int]:
+    if not log_file.compression:
+        return log_file.size
+    elif checkpoint and (checkpoint.name, checkpoint.size) == (log_file.name, log_file.size):
+        # Compressed files never change and are always read to the end
+        return checkpoint.processed_offset
+    else:
+        return None
+
+
+def get_log_file_checkpoints(segments: List[LogFileSegment]) -> List[LogFileCheckpoint]:
+    """Build the checkpoints for the next execution, which starts where this one stopped."""
+    return [segment.log_file.to_checkpoint(processed_offset=segment.end) for segment in segments]
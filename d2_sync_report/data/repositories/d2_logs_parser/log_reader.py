@@ -0,0 +1,212 @@
+"""
+Read the log entries of a log file segment.
+
+Only candidate records (see LogScanner) are decoded and turned into log entries. A record is a line
+with a timestamp and its continuation lines, which are mostly stack frames ("at org.hisp...").
+Those are skipped without decoding them, only the causes the reducers use are kept, each one with
+the details that follow it (i.e. "Caused by: ... duplicate key - Detail: Key (uid)=(...)"), and the
+import summaries. A detail logged as a record of its own, right after the record of a cause, is
+appended to that cause too.
+
+The logs of the nodes of a cluster are read as one stream per node, merged by timestamp.
+"""
+
+import heapq
+import re
+from datetime import datetime
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    CAUSED_BY_MARKER,
+    ERROR_DETAIL_MARKER,
+    IMPORT_SUMMARY_MARKER,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_scanner import LogScanner
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import (
+    TIMESTAMP_FORMAT,
+    TIMESTAMP_PATTERN,
+    format_timestamp,
+)
+
+# "* LEVEL TIMESTAMP MESSAGE", with a non-empty message
+log_line_regex = re.compile(r"\*\s+\S+\s+(" + TIMESTAMP_PATTERN + r")\s+(?=\S)")
+log_line_bytes_regex = re.compile(log_line_regex.pattern.encode())
+
+caused_by_marker = CAUSED_BY_MARKER.encode()
+error_detail_marker = ERROR_DETAIL_MARKER.encode()
+import_summary_marker = IMPORT_SUMMARY_MARKER.encode()
+
+
+def get_log_entries(
+    segment: LogFileSegment, scanner: LogScanner, since: Optional[datetime] = None
+) -> Iterator[LogEntry]:
+    """Entries of the candidate records of the scanner (built for the enabled job types)."""
+    # Open in binary mode so we can seek, keep track of byte offsets and scan raw blocks
+    with segment.log_file.open() as file:
+        # With a checkpoint, the start offset is exact, so the since timestamp is not needed.
+        # Fixed-width timestamps can be compared as strings, no need to parse them.
+        if since and segment.use_since:
+            start = scanner.find_first_after(file, segment, format_timestamp(since))
+        else:
+            start = segment.start
+
+        if start is None:
+            return
+
+        # Only records that may be relevant for the reducers are decoded
+        yield from join_detail_records(scanner.scan(file, segment, start))
+
+
+def join_detail_records(records: Iterable[Tuple[int, bytes]]) -> Iterator[LogEntry]:
+    """
+    Entries of the records (offset and contents). An entry with a cause is held until the next
+    record: if it is a detail right after it (i.e. "* ERROR ... Detail: Key (uid)=(...)"), the
+    detail is appended to the last cause, as for the details in continuation lines.
+    """
+    held: Optional[LogEntry] = None
+    held_end = -1
+
+    for offset, record in records:
+        entry = get_log_record(record)
+
+        if held and entry and offset == held_end and is_detail(entry):
+            held = append_detail(held, entry.text)
+            held_end = offset + len(record)
+            continue
+        elif held:
+            yield held
+            held = None
+
+        if entry and has_cause(entry):
+            held, held_end = entry, offset + len(record)
+        elif entry:
+            yield entry
+
+    if held:
+        yield held
+
+
+def merge_log_entries(streams: Sequence[Tuple[str, Iterable[LogEntry]]]) -> Iterator[LogEntry]:
+    """
+    Merge the entries of several nodes (node name and its entries, in order) by timestamp,
+    tagging each entry with its node. Only the next entry of each node is kept in the heap, so
+    no node's logs are loaded into memory. Entries with the same timestamp keep the node order.
+    """
+    tagged_streams = [tag_log_entries(node, entries) for node, entries in streams]
+
+    for _timestamp, entry in heapq.merge(*tagged_streams, key=itemgetter(0)):
+        yield entry
+
+
+def tag_log_entries(node: str, entries: Iterable[LogEntry]) -> Iterator[Tuple[str, LogEntry]]:
+    # Continuation records without timestamp are sorted with the last entry of the node
+    timestamp = ""
+
+    for entry in entries:
+        entry.node = node
+        timestamp = entry.raw_timestamp or timestamp
+        yield timestamp, entry
+
+
+def get_log_record(record: bytes) -> Optional[LogEntry]:
+    line_end = record.find(b"\n")
+    line_end = len(record) if line_end == -1 else line_end
+
+    if record.startswith(b"*"):
+        entry = get_first_line_entry(record, line_end)
+        continuation_start = line_end + 1
+    else:
+        # The first line of the record was processed in a previous execution or file
+        entry = LogEntry(None, record, 0, 0)
+        continuation_start = 0
+
+    # Most records are a single line
+    if entry and continuation_start < len(record):
+        lines = record[continuation_start:].split(b"\n")
+        # A detail after a cause on the first line is appended to it, as for continuation causes
+        head = [entry.text] if entry.contains(caused_by_marker) else []
+        fragments = get_error_fragments(head, lines)
+        if head:
+            entry = LogEntry.from_text(entry.raw_timestamp, fragments[0])
+        entry.fragments = tuple(fragments[len(head) :])
+        entry.summaries = tuple(decode(line) for line in lines if import_summary_marker in line)
+
+    return entry
+
+
+def has_cause(entry: LogEntry) -> bool:
+    return bool(entry.fragments) or entry.contains(caused_by_marker)
+
+
+def is_detail(entry: LogEntry) -> bool:
+    return entry.raw_timestamp is not None and entry.text.startswith(ERROR_DETAIL_MARKER)
+
+
+def append_detail(entry: LogEntry, detail: str) -> LogEntry:
+    """Append the detail to the last cause of the entry (see has_cause)."""
+    if entry.fragments:
+        entry.fragments = entry.fragments[:-1] + (f"{entry.fragments[-1]} - {detail}",)
+        return entry
+    else:
+        text = f"{entry.text} - {detail}"
+        return LogEntry.from_text(entry.raw_timestamp, text, (), entry.summaries)
+
+
+def get_first_line_entry(record: bytes, line_end: int) -> Optional[LogEntry]:
+    # Fast path: keep the timestamp as a string and the range of the message, not decoded yet
+    match = log_line_bytes_regex.match(record, 0, line_end)
+    if match:
+        return LogEntry(match[1].decode(), record, match.end(), line_end)
+    else:
+        return get_log_entry(decode(record[:line_end]))
+
+
+def get_error_fragments(fragments: List[str], lines: List[bytes]) -> List[str]:
+    """Return the causes in the lines, with their details appended ("CAUSE - DETAIL")."""
+    fragments = list(fragments)
+
+    for line in lines:
+        if caused_by_marker in line:
+            fragments.append(decode(line))
+        elif fragments and line.lstrip().startswith(error_detail_marker):
+            fragments[-1] = fragments[-1] + " - " + decode(line)
+
+    return fragments
+
+
+def decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="replace").strip()
+
+
+def get_log_entry(line: str) -> Optional[LogEntry]:
+    # "* INFO 2025-07-16T09:04:50,123 Some message"
+    if not line.startswith("*"):
+        return LogEntry.from_text(None, line)
+
+    # Fast path: keep the timestamp as a string and slice the message
+    match = log_line_regex.match(line)
+    if match:
+        return LogEntry.from_text(match[1], line[match.end() :])
+
+    parts = line.split()
+    if len(parts) < 4:
+        error(f"Cannot parse: {line}")
+        return LogEntry.from_text(None, line)
+
+    timestamp_str = parts[2]
+    try:
+        timestamp = datetime.strptime(timestamp_str, TIMESTAMP_FORMAT)
+    except ValueError:
+        error(f"Invalid timestamp: {line}")
+        return LogEntry.from_text(None, line)
+
+    # Non-standard timestamp (i.e. no milliseconds), normalize it to the fixed-width format
+    raw_timestamp = format_timestamp(timestamp)
+    return LogEntry.from_text(raw_timestamp, " ".join(parts[3:]))
+
+
+def error(message: str) -> None:
+    print(f"Error: {message}")
@@ -0,0 +1,30 @@
+"""
+DHIS2 log timestamps have a fixed width (i.e. "2025-07-16T09:04:50,123"), so they can be kept
+as raw strings and compared lexicographically. Parsing to datetime (datetime.strptime is slow)
+is only needed when a reducer uses it, typically to set the start/end of a job.
+"""
+
+from datetime import datetime
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S,%f"
+
+# Example: "2025-07-16T09:04:50,123"
+TIMESTAMP_PATTERN = r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d,\d{3}"
+
+
+def parse_timestamp(raw: str) -> datetime:
+    """Parse a fixed-width timestamp string by slicing its fields."""
+    return datetime(
+        int(raw[0:4]),
+        int(raw[5:7]),
+        int(raw[8:10]),
+        int(raw[11:13]),
+        int(raw[14:16]),
+        int(raw[17:19]),
+        int(raw[20:23]) * 1000,
+    )
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format datetime as a fixed-width timestamp, truncated to milliseconds."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S,") + f"{value.microsecond // 1000:03d}"
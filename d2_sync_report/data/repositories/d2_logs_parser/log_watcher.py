@@ -0,0 +1,148 @@
+"""
+Wait for changes in the logs folders (follow mode, see D2LogsParser.follow).
+
+On Linux, inotify (through libc, no extra dependencies) wakes us up as soon as a log file in the
+folder is written, created or renamed (i.e. a rotation), so waiting uses no CPU. Events of other
+files (i.e. dhis-audit.log) are ignored. Elsewhere, the folders are polled: the name, inode, size
+and mtime of their log files are compared every few seconds.
+
+DHIS2 writes lines in bursts, so after a change we let the writes settle before returning: a burst
+is read in a single pass instead of one pass per line.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
+
+# Seconds to let a burst of writes settle before reading the new lines
+SETTLE_DELAY = 1.0
+
+# Seconds between checks of the folders when inotify is not available
+POLL_INTERVAL = 2.0
+
+# inotify events (see inotify(7)): contents written and files created, renamed or deleted
+IN_MODIFY = 0x002
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# Events were lost, any file may have changed
+IN_Q_OVERFLOW = 0x4000
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len] (NUL-padded)
+EVENT_HEADER = struct.Struct("iIII")
+
+EVENTS_READ_SIZE = 64 * 1024
+
+LOG_FILE_PREFIX = "dhis.log"
+
+
+class LogsWatcher(ABC):
+    @abstractmethod
+    def wait(self) -> None:
+        """Block until some log file of the folders has changed."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyLogsWatcher(LogsWatcher):
+    def __init__(self, folders: Sequence[str], settle_delay: float = SETTLE_DELAY):
+        self.settle_delay = settle_delay
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = check_result(libc.inotify_init1(os.O_CLOEXEC))
+
+        try:
+            for folder in folders:
+                check_result(libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK))
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self) -> None:
+        # Events only wake us up, the changed files are found by the parser
+        while not has_log_file_events(self._read_events()):
+            pass
+
+        time.sleep(self.settle_delay)
+
+        while select.select([self.fd], [], [], 0)[0]:
+            os.read(self.fd, EVENTS_READ_SIZE)
+
+    def _read_events(self) -> bytes:
+        select.select([self.fd], [], [])
+        return os.read(self.fd, EVENTS_READ_SIZE)
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingLogsWatcher(LogsWatcher):
+    def __init__(self, folders: Sequence[str], interval: float = POLL_INTERVAL):
+        self.folders = list(folders)
+        self.interval = interval
+        self.snapshot = self._get_snapshot()
+
+    def wait(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._get_snapshot()
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                return
+
+    def _get_snapshot(self) -> List[Tuple[str, int, int, int]]:
+        snapshot: List[Tuple[str, int, int, int]] = []
+
+        for folder in self.folders:
+            for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+                if not entry.name.startswith(LOG_FILE_PREFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed while listing the folder (i.e. an old rotation)
+                    continue
+                snapshot.append((entry.path, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+
+        return snapshot
+
+
+def get_logs_watcher(folders: Sequence[str]) -> LogsWatcher:
+    """Use inotify where it is available (Linux), poll the folders otherwise."""
+    try:
+        return InotifyLogsWatcher(folders)
+    except (AttributeError, OSError) as error:
+        print(f"Cannot watch the logs with inotify ({error}), polling every {POLL_INTERVAL}s")
+        return PollingLogsWatcher(folders)
+
+
+def has_log_file_events(events: bytes) -> bool:
+    """Return True if some of the inotify events (see EVENT_HEADER) concern a log file."""
+    offset = 0
+
+    while offset + EVENT_HEADER.size <= len(events):
+        _wd, mask, _cookie, name_size = EVENT_HEADER.unpack_from(events, offset)
+        offset += EVENT_HEADER.size
+        name = events[offset : offset + name_size].rstrip(b"\0")
+        offset += name_size
+
+        if mask & IN_Q_OVERFLOW or name.startswith(LOG_FILE_PREFIX.encode()):
+            return True
+
+    return False
+
+
+def check_result(result: int) -> int:
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
@@ -0,0 +1,56 @@
+"""
+Folders with the log files of a DHIS2 instance: a local folder, or a folder of a Docker container
+whose files are read through a pipe (no local copy, see ContainerFileReader).
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.docker_container import (
+    DockerContainer,
+    RemoteLogFile,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFile
+
+
+class LogsFolder(ABC):
+    path: str
+
+    @abstractmethod
+    def list_file_names(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_log_file(self, name: str, node: Optional[str] = None) -> LogFile:
+        """Return a file of the folder, as listed by the last call of list_file_names."""
+        pass
+
+
+class LocalLogsFolder(LogsFolder):
+    def __init__(self, path: str):
+        self.path = path
+
+    def list_file_names(self) -> List[str]:
+        return os.listdir(self.path)
+
+    def get_log_file(self, name: str, node: Optional[str] = None) -> LogFile:
+        return LogFile.from_path(os.path.join(self.path, name), node)
+
+
+class ContainerLogsFolder(LogsFolder):
+    def __init__(self, container_name: str, path: str, container: Optional[DockerContainer] = None):
+        self.path = path
+        self.container = container or DockerContainer(container_name)
+        # Sizes and inodes of the files, from a single listing of the folder
+        self.files: Dict[str, RemoteLogFile] = {}
+
+    def list_file_names(self) -> List[str]:
+        self.files = {file.name: file for file in self.container.list_files(self.path)}
+        return list(self.files)
+
+    def get_log_file(self, name: str, node: Optional[str] = None) -> LogFile:
+        if name not in self.files:
+            raise FileNotFoundError(f"Log file not found: {self.container.name}:{self.path}/{name}")
+
+        return LogFile.from_remote(self.container.name, self.path, self.files[name], node)
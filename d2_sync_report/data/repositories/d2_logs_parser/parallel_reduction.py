@@ -0,0 +1,178 @@
+"""
+Reduce log files independently: in parallel worker processes, one per file, or from the cached
+result of a rotated file (see ParseResultCache).
+
+Each file is reduced independently, starting from an empty state. A job in progress at the end
+of a file goes on in the next one, so the partial result of a file also keeps, for each job type,
+the entries that would affect such a job: those found before the first job of that type is opened
+in the file (the head). Partial results are then stitched in file order: head entries are replayed
+on the jobs left open by the previous files and, once a job is opened in the file, the runs of the
+partial result take over (runs left open by the previous files are kept, unless a run with the
+same job UID was opened again).
+
+Concurrent runs of a job type (see SyncJobParserState) may keep logging after another run was
+opened in the file. Those entries (orphans) would need the runs of the previous files, so the file
+is then reduced again from the stitched state. This is rare, a job is not usually configured twice.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    UNTAGGED,
+    LogEntry,
+    SyncJobParserState,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    LogEntryClassification,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import get_log_entries
+from d2_sync_report.data.repositories.d2_logs_parser.reducers_state import (
+    ReducersState,
+    reducers,
+)
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+
+
+@dataclass
+class PartialReduction:
+    """
+    Result of reducing a single log file.
+
+    - segment: the worker works on a copy of the segment, updated while reading the file.
+    - heads: for each job type, entries before the first job opened in the file.
+    - opened_keys: for each job type, job UIDs of the runs opened in the file.
+    - orphans: for each job type, whether there are entries for runs not opened in the file
+      after the first job opened in the file.
+    """
+
+    segment: LogFileSegment
+    state: ReducersState
+    heads: List[List[LogEntry]]
+    opened_keys: List[List[str]]
+    orphans: List[bool]
+
+
+def reduce_segments(
+    registry: JobRegistry, segments: List[LogFileSegment], since: Optional[datetime], workers: int
+) -> List[PartialReduction]:
+    if workers <= 1 or len(segments) <= 1:
+        return [reduce_segment(registry, segment, since) for segment in segments]
+
+    print(f"Reducing {len(segments)} log files with {workers} workers")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        n_segments = len(segments)
+        partials = list(
+            executor.map(reduce_segment, [registry] * n_segments, segments, [since] * n_segments)
+        )
+
+    for segment, partial in zip(segments, partials):
+        segment.update_progress(partial.segment)
+
+    return partials
+
+
+def reduce_segment(
+    registry: JobRegistry, segment: LogFileSegment, since: Optional[datetime]
+) -> PartialReduction:
+    state = registry.initial_state()
+    heads: List[List[LogEntry]] = [[] for _ in registry.types]
+    opened_keys: List[List[str]] = [[] for _ in registry.types]
+    orphans = [False for _ in registry.types]
+
+    for log_entry in get_log_entries(segment, registry.scanner, since):
+        c = registry.classifier.classify(log_entry)
+        if not c:
+            continue
+
+        for index, (type, sub_state) in enumerate(zip(state.types, state.states)):
+            if opened_keys[index] and not orphans[index]:
+                orphans[index] = is_orphan(c, type, sub_state, opened_keys[index])
+
+        state = ReducersState.classified_reducer(state, log_entry, c)
+
+        for index, (type, sub_state) in enumerate(zip(state.types, state.states)):
+            if type in c.opens and sub_state.runs:
+                job_uid = c.get_job_uid(type) or UNTAGGED
+                if job_uid in sub_state.runs and job_uid not in opened_keys[index]:
+                    opened_keys[index].append(job_uid)
+            elif not opened_keys[index] and c.concerns_open_job(type):
+                # Keep the decoded text, not the record, so the result can be stored as JSON
+                heads[index].append(
+                    LogEntry.from_text(
+                        log_entry.raw_timestamp,
+                        log_entry.text,
+                        log_entry.fragments,
+                        log_entry.summaries,
+                    )
+                )
+
+    return PartialReduction(
+        segment=segment, state=state, heads=heads, opened_keys=opened_keys, orphans=orphans
+    )
+
+
+def is_orphan(
+    c: LogEntryClassification, type: SyncJobType, state: SyncJobParserState, opened_keys: List[str]
+) -> bool:
+    """Return True if the entry could belong to a run opened in a previous file."""
+    if type in c.opens or not c.concerns_open_job(type):
+        return False
+
+    job_uid = c.get_job_uid(type)
+    # Untagged entries go to the current run, tagged ones to the run of their job UID
+    return not state.runs or (job_uid is not None and job_uid not in opened_keys)
+
+
+def merge_partial_reductions(
+    registry: JobRegistry,
+    partials: List[PartialReduction],
+    initial_state: Optional[ReducersState] = None,
+    since: Optional[datetime] = None,
+) -> ReducersState:
+    """
+    Stitch the partial results, in file order (oldest rotation first, as the lines were written),
+    from the initial state (jobs in progress).
+    """
+    states = (initial_state or registry.initial_state()).states
+
+    for partial in partials:
+        if any(orphans and state.runs for orphans, state in zip(partial.orphans, states)):
+            print(f"Reducing again (concurrent runs of a job): {partial.segment.log_file.path}")
+            reducers_state = ReducersState(registry.types, states)
+            for log_entry in get_log_entries(partial.segment, registry.scanner, since):
+                reducers_state = registry.reducer(reducers_state, log_entry)
+            states = reducers_state.states
+            continue
+
+        for index, type in enumerate(registry.types):
+            state = states[index]
+
+            # Entries before the first job opened in the file only affect the jobs left open
+            for log_entry in partial.heads[index]:
+                if not state.runs:
+                    break
+
+                c = registry.classifier.classify(log_entry)
+                if c and c.concerns(type, state):
+                    state = reducers.sync_job_reducer(type, state, log_entry, c)
+
+            # Runs opened in the file are more recent than those left open, which they replace
+            if partial.opened_keys[index]:
+                own_state = partial.state.states[index]
+                runs = {
+                    job_uid: job
+                    for job_uid, job in state.runs.items()
+                    if job_uid not in partial.opened_keys[index]
+                }
+                state.runs = {**runs, **own_state.runs}
+                state.parsed_jobs.extend(own_state.parsed_jobs)
+                state.last_processed_timestamp = own_state.last_processed_timestamp
+
+            states[index] = state
+
+    return ReducersState(registry.types, states)
@@ -0,0 +1,95 @@
+"""
+Cache of the reduction of rotated log files.
+
+Once rotated (dhis.log -> dhis.log.N), the contents of a log file never change, so its partial
+reduction (closed jobs, jobs open at its edges and time range, see PartialReduction) can be stored
+and reused when the whole history is processed again (i.e. with --ignore-cache). Each result is
+stored in its own file, named after a hash of the size, head and tail of the file and the key of
+the job definitions it was reduced with (see JobRegistry). Inode and mtime are not part of the key,
+as they change every time the logs are copied from a Docker container.
+Least recently used results are evicted when there are more than max_entries.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from pydantic import BaseModel
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFile, LogFileSegment
+from d2_sync_report.data.repositories.file_cache import get_default_cache_folder
+from d2_sync_report.data.repositories.d2_logs_parser.parallel_reduction import PartialReduction
+
+HASHED_SIZE = 64 * 1024
+
+# Part of the key: change it when the reduction of a file changes, so older results are not used
+RESULT_VERSION = 2
+
+MAX_ENTRIES = 64
+
+
+class ParseResultProps(BaseModel):
+    partial: PartialReduction
+
+
+class ParseResultCache:
+    def __init__(self, folder: Optional[str] = None, max_entries: int = MAX_ENTRIES):
+        self.folder = folder or os.path.join(get_default_cache_folder(), "parse-results")
+        self.max_entries = max_entries
+
+    def get(self, segment: LogFileSegment, definitions_key: str) -> Optional[PartialReduction]:
+        path = self._get_path(segment.log_file, definitions_key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                partial = ParseResultProps.model_validate_json(f.read()).partial
+        except ValueError as exc:
+            print(f"Parse result load error: {exc}")
+            os.remove(path)
+            return None
+
+        # Used as last access time for the eviction
+        os.utime(path)
+        return partial
+
+    def save(
+        self, segment: LogFileSegment, definitions_key: str, partial: PartialReduction
+    ) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._get_path(segment.log_file, definitions_key)
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(ParseResultProps(partial=partial).model_dump_json())
+
+        print(f"Parse result saved: {path}")
+
+    def evict(self) -> None:
+        if not os.path.isdir(self.folder):
+            return
+
+        paths = [
+            os.path.join(self.folder, filename)
+            for filename in os.listdir(self.folder)
+            if filename.endswith(".json")
+        ]
+        paths_by_recent_use = sorted(paths, key=os.path.getmtime, reverse=True)
+
+        for path in paths_by_recent_use[self.max_entries :]:
+            os.remove(path)
+            print(f"Parse result evicted: {path}")
+
+    def _get_path(self, log_file: LogFile, definitions_key: str) -> str:
+        return os.path.join(self.folder, f"{get_contents_key(log_file, definitions_key)}.json")
+
+
+def get_contents_key(log_file: LogFile, definitions_key: str) -> str:
+    digest = hashlib.sha1(f"{RESULT_VERSION}:{log_file.size}:{definitions_key}".encode())
+
+    with log_file.open_raw() as file:
+        digest.update(file.read(HASHED_SIZE))
+        file.seek(max(0, log_file.size - HASHED_SIZE))
+        digest.update(file.read(HASHED_SIZE))
+
+    return digest.hexdigest()
@@ -0,0 +1,157 @@
+"""
+Reduce log entries in a pipeline: one worker process per sync job type.
+
+Reducers of different job types never share state, so the main process reads and classifies the
+log entries and fans them out to a worker for each job type, which runs its reducer. Reading,
+classification and reduction overlap, which helps on multi-core hosts with a single huge file
+(files are reduced in parallel by parallel_reduction instead).
+
+Entries are sent in batches over bounded queues: when a worker falls behind, the reader blocks
+until there is room in its queue, so memory does not grow with the size of the file. Each worker
+returns its final state and states are merged in the order of ReducersState, so the report is the
+same as a sequential reduction.
+"""
+
+import multiprocessing
+import queue
+from datetime import datetime
+from multiprocessing.process import BaseProcess
+from typing import Any, List, Optional, Sequence, Tuple
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    LogEntry,
+    SyncJobParserState,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    LogEntryClassification,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import get_log_entries
+from d2_sync_report.data.repositories.d2_logs_parser.reducers_state import (
+    ReducersState,
+    reducers,
+)
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+
+# Entries sent to a worker in a single message
+BATCH_SIZE = 500
+
+# Batches waiting in the queue of a worker before the reader blocks
+QUEUE_SIZE = 16
+
+# Seconds to wait on a queue before checking that the workers are still alive
+QUEUE_TIMEOUT = 1.0
+
+Batch = List[Tuple[LogEntry, LogEntryClassification]]
+
+
+def reduce_pipelined(
+    registry: JobRegistry,
+    segments: List[LogFileSegment],
+    initial_state: ReducersState,
+    since: Optional[datetime],
+) -> ReducersState:
+    context = multiprocessing.get_context()
+    entries_queues: List[Any] = [context.Queue(maxsize=QUEUE_SIZE) for _ in registry.types]
+    results_queue: Any = context.Queue()
+
+    processes = [
+        context.Process(
+            target=reduce_entries,
+            args=(index, type, sub_state, entries_queue, results_queue),
+            daemon=True,
+        )
+        for index, (type, sub_state, entries_queue) in enumerate(
+            zip(registry.types, initial_state.states, entries_queues)
+        )
+    ]
+
+    print(f"Reducing log entries with {len(processes)} job type workers")
+    for process in processes:
+        process.start()
+
+    try:
+        batches: List[Batch] = [[] for _ in registry.types]
+
+        for segment in segments:
+            for log_entry in get_log_entries(segment, registry.scanner, since):
+                c = registry.classifier.classify(log_entry)
+                if not c:
+                    continue
+
+                for index, type in enumerate(registry.types):
+                    # Whether the job is open is only known by the worker, which checks concerns()
+                    if type in c.opens or c.concerns_open_job(type):
+                        batches[index].append((log_entry, c))
+
+                        if len(batches[index]) >= BATCH_SIZE:
+                            put(entries_queues[index], batches[index], processes[index])
+                            batches[index] = []
+
+        for batch, entries_queue, process in zip(batches, entries_queues, processes):
+            put(entries_queue, batch, process)
+            put(entries_queue, None, process)
+
+        # Read the results before joining, a process does not exit until its queue is flushed
+        results = [get_result(results_queue, processes) for _ in processes]
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+
+    for process in processes:
+        process.join()
+
+    states: List[SyncJobParserState] = [SyncJobParserState.initial() for _ in registry.types]
+    for index, state, error in results:
+        if error:
+            raise error
+        states[index] = state
+
+    return ReducersState(registry.types, states)
+
+
+def reduce_entries(
+    index: int,
+    type: SyncJobType,
+    state: SyncJobParserState,
+    entries_queue: Any,
+    results_queue: Any,
+) -> None:
+    """Worker: reduce the batches of entries of a job type until it gets None."""
+    error: Optional[Exception] = None
+
+    while (batch := entries_queue.get()) is not None:
+        # On error, keep consuming batches so the reader does not block on a full queue
+        if error:
+            continue
+
+        try:
+            for log_entry, c in batch:
+                if c.concerns(type, state):
+                    state = reducers.sync_job_reducer(type, state, log_entry, c)
+        except Exception as exc:
+            error = exc
+
+    results_queue.put((index, state, error))
+
+
+def put(entries_queue: Any, batch: Optional[Batch], process: BaseProcess) -> None:
+    while True:
+        try:
+            entries_queue.put(batch, timeout=QUEUE_TIMEOUT)
+            return
+        except queue.Full:
+            if not process.is_alive():
+                raise RuntimeError(f"Reducer worker exited unexpectedly: {process.name}")
+
+
+def get_result(results_queue: Any, processes: Sequence[BaseProcess]) -> Tuple[Any, ...]:
+    while True:
+        try:
+            return results_queue.get(timeout=QUEUE_TIMEOUT)
+        except queue.Empty:
+            failed = [p.name for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"Reducer worker exited unexpectedly: {", ".join(failed)}")
@@ -0,0 +1,105 @@
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.d2_job_reducers import D2JobReducers
+from d2_sync_report.data.repositories.d2_logs_parser.error_signatures import ErrorSignatures
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import (
+    LogEntry,
+    SyncJobParserInProgress,
+    SyncJobParserState,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_entry_classifier import (
+    LogEntryClassification,
+)
+from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobInProgress,
+    SyncJobReportItem,
+    SyncJobType,
+)
+
+reducers = D2JobReducers()
+
+
+@dataclass
+class ReducersState:
+    """State of the reducer of each enabled job type (see JobRegistry), in the same order."""
+
+    types: List[SyncJobType]
+    states: List[SyncJobParserState]
+
+    @staticmethod
+    def initial(types: List[SyncJobType]) -> "ReducersState":
+        # States are mutated in place, so each reducer needs its own instance.
+        return ReducersState(list(types), [SyncJobParserState.initial() for _ in types])
+
+    @staticmethod
+    def from_jobs_in_progress(
+        types: List[SyncJobType], jobs: List[SyncJobInProgress]
+    ) -> "ReducersState":
+        """
+        Initial state with the jobs still in progress at the end of the previous execution.
+        Jobs of types not enabled are dropped.
+        """
+        state = ReducersState.initial(types)
+
+        for job in jobs:
+            sub_state = state.get(job.type)
+            if sub_state:
+                sub_state.open_job(
+                    SyncJobParserInProgress(
+                        type=job.type,
+                        start=job.start,
+                        errors=ErrorSignatures.from_signatures(job.errors, job.omitted_errors),
+                        phases=list(job.phases),
+                        import_count=replace(job.import_count),
+                        node=job.node,
+                    ),
+                    job.job_uid,
+                )
+
+        return state
+
+    @staticmethod
+    def classified_reducer(
+        state: "ReducersState", log_entry: LogEntry, c: LogEntryClassification
+    ) -> "ReducersState":
+        # Only pass the entry to the reducers that are concerned by it
+        return ReducersState(
+            state.types,
+            [
+                (
+                    reducers.sync_job_reducer(type, sub_state, log_entry, c)
+                    if c.concerns(type, sub_state)
+                    else sub_state
+                )
+                for type, sub_state in zip(state.types, state.states)
+            ],
+        )
+
+    def get(self, type: SyncJobType) -> Optional[SyncJobParserState]:
+        """State of the job type, None if the type is not enabled."""
+        return next((s for t, s in zip(self.types, self.states) if t == type), None)
+
+    def pop_parsed_jobs(self) -> List[SyncJobReportItem]:
+        """Jobs closed since the last call (see SyncJobParserState.pop_parsed_jobs)."""
+        return [
+            job for state in self.states if state.parsed_jobs for job in state.pop_parsed_jobs()
+        ]
+
+    @property
+    def jobs_in_progress(self) -> List[SyncJobInProgress]:
+        """Jobs not finished yet, to be restored in the next execution."""
+        return [
+            SyncJobInProgress(
+                type=job.type,
+                start=job.start,
+                errors=job.errors.signatures,
+                job_uid=job_uid,
+                omitted_errors=job.errors.omitted,
+                phases=list(job.phases),
+                import_count=replace(job.import_count),
+                node=job.node,
+            )
+            for state in self.states
+            for job_uid, job in state.runs.items()
+        ]
@@ -0,0 +1,257 @@
+"""
+Local mirror of the logs folder of a Docker container, kept between executions.
+
+Copying the whole folder (every rotation included) on each execution moves gigabytes for a few new
+lines. Instead, the files in the container are listed with their size and mtime, and compared with
+those of the last sync (stored in the mirror folder):
+
+- Unchanged files are not copied.
+- A file that continues a local copy (same head, not smaller) only gets the new bytes appended.
+  That's the live dhis.log, but also dhis.log.1 after a rotation, as the local dhis.log is
+  renamed. Renamed compressed rotations are found by their size and mtime instead.
+- Any other file (i.e. a new compressed rotation) is copied whole.
+- Files no longer in the container are removed.
+
+Local files keep their inode while they grow or are renamed, as in the container, so log file
+checkpoints and indexes (see LogFile) work on the mirror as on a local logs folder.
+
+In follow mode, the containers cannot be watched, so the mirrors are synced every few seconds and
+the changes of their files are found as in a polled local folder (see DockerLogsMirrorsWatcher).
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from d2_sync_report.data.repositories.d2_logs_parser.docker_container import (
+    DockerContainer,
+    RemoteLogFile,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import (
+    COMPRESSED_OPENERS,
+    FINGERPRINT_SIZE,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.log_watcher import (
+    POLL_INTERVAL,
+    PollingLogsWatcher,
+)
+from d2_sync_report.data.repositories.file_cache import get_default_cache_folder
+
+MANIFEST_FILE_NAME = ".mirror.json"
+
+# Rotated files being renamed, moved aside so they are not overwritten by another file
+STAGING_FOLDER_NAME = ".rotated"
+
+
+class RemoteLogFileProps(BaseModel):
+    name: str
+    size: int
+    mtime: int
+    device: int = 0
+    inode: int = 0
+
+
+class MirrorManifestProps(BaseModel):
+    files: List[RemoteLogFileProps] = []
+
+
+class DockerLogsMirror:
+    def __init__(
+        self,
+        container_name: str,
+        container_folder: str,
+        mirror_folder: Optional[str] = None,
+        container: Optional[DockerContainer] = None,
+    ):
+        self.container_folder = container_folder
+        self.container = container or DockerContainer(container_name)
+        self.mirror_folder = mirror_folder or get_mirror_folder(container_name, container_folder)
+
+    def __enter__(self) -> str:
+        self.sync()
+        return self.mirror_folder
+
+    def __exit__(
+        self,
+        _exc_type: Optional[type],
+        _exc_val: Optional[BaseException],
+        _exc_tb: Optional[object],
+    ) -> None:
+        # The mirror is kept for the next execution
+        pass
+
+    def sync(self) -> None:
+        os.makedirs(self.mirror_folder, exist_ok=True)
+        remote_files = self.container.list_files(self.container_folder)
+        synced = {file.name: file for file in self._load_manifest() if self._exists(file.name)}
+
+        changed_files = [file for file in remote_files if synced.get(file.name) != file]
+        unchanged_names = {file.name for file in remote_files if synced.get(file.name) == file}
+        reusable_names = [name for name in synced if name not in unchanged_names]
+
+        # Name -> name of the local file it continues (None to copy it whole)
+        sources = {
+            file.name: self._find_source(file, reusable_names, synced) for file in changed_files
+        }
+
+        # Move the rotated files aside first, their names may be taken by other files
+        staging_folder = os.path.join(self.mirror_folder, STAGING_FOLDER_NAME)
+        os.makedirs(staging_folder, exist_ok=True)
+        for name, source_name in sources.items():
+            if source_name and source_name != name:
+                os.replace(self._get_path(source_name), os.path.join(staging_folder, source_name))
+
+        for file in changed_files:
+            source_name = sources[file.name]
+
+            if source_name is None:
+                self._copy(file)
+                continue
+            elif source_name != file.name:
+                os.replace(os.path.join(staging_folder, source_name), self._get_path(file.name))
+                print(f"Rotated: {source_name} -> {file.name}")
+
+            if file.size > os.path.getsize(self._get_path(file.name)):
+                self._append(file)
+
+        self._remove_old_files(remote_files)
+        self._save_manifest(remote_files)
+
+    def _find_source(
+        self, file: RemoteLogFile, reusable_names: List[str], synced: Dict[str, RemoteLogFile]
+    ) -> Optional[str]:
+        """
+        Find the local file the remote file is a continuation of, preferring the same name. Plain
+        files are compared by their head, compressed files (which never change) by size and mtime.
+        """
+        names = sorted(reusable_names, key=lambda name: name != file.name)
+
+        if is_compressed(file.name):
+            source_name = next((name for name in names if is_same_file(synced[name], file)), None)
+        elif names:
+            path = self._get_remote_path(file.name)
+            remote_head = self.container.read_head(path, FINGERPRINT_SIZE)
+            source_name = next(
+                (name for name in names if self._is_head_of(name, file, remote_head)), None
+            )
+        else:
+            source_name = None
+
+        if source_name is not None:
+            reusable_names.remove(source_name)
+
+        return source_name
+
+    def _is_head_of(self, name: str, file: RemoteLogFile, remote_head: bytes) -> bool:
+        """The local file has the first bytes of the remote file."""
+        path = self._get_path(name)
+        size = os.path.getsize(path)
+        if is_compressed(name) or size > file.size:
+            return False
+
+        with open(path, "rb") as local_file:
+            local_head = local_file.read(FINGERPRINT_SIZE)
+
+        return remote_head.startswith(local_head)
+
+    def _append(self, file: RemoteLogFile) -> None:
+        local_path = self._get_path(file.name)
+        offset = os.path.getsize(local_path)
+
+        with open(local_path, "ab") as local_file:
+            self.container.append_range(self._get_remote_path(file.name), offset, local_file)
+
+        print(f"Appended: {file.name} ({os.path.getsize(local_path) - offset} bytes)")
+
+    def _copy(self, file: RemoteLogFile) -> None:
+        # Replace the file (not overwrite it), it is a different file with a new inode
+        local_path = self._get_path(file.name)
+        if os.path.exists(local_path):
+            os.remove(local_path)
+
+        self.container.copy(self._get_remote_path(file.name), local_path)
+        print(f"Copied: {file.name} ({file.size} bytes)")
+
+    def _remove_old_files(self, remote_files: List[RemoteLogFile]) -> None:
+        names = {file.name for file in remote_files}
+        folders = [self.mirror_folder, os.path.join(self.mirror_folder, STAGING_FOLDER_NAME)]
+
+        for folder in folders:
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                is_old = folder != self.mirror_folder or name not in names
+                if is_old and os.path.isfile(path) and name != MANIFEST_FILE_NAME:
+                    os.remove(path)
+
+    def _load_manifest(self) -> List[RemoteLogFile]:
+        path = self._get_path(MANIFEST_FILE_NAME)
+        if not os.path.exists(path):
+            return []
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                props = MirrorManifestProps.model_validate_json(f.read())
+        except ValueError as exc:
+            print(f"Mirror manifest load error, copying all files: {exc}")
+            return []
+
+        return [RemoteLogFile(**file.model_dump()) for file in props.files]
+
+    def _save_manifest(self, remote_files: List[RemoteLogFile]) -> None:
+        # Sizes as listed, local copies may have more bytes (appends start at the local size)
+        props = MirrorManifestProps(
+            files=[RemoteLogFileProps(**vars(file)) for file in remote_files]
+        )
+        with open(self._get_path(MANIFEST_FILE_NAME), "w", encoding="utf-8") as f:
+            f.write(props.model_dump_json(indent=4) + "\n")
+
+    def _exists(self, name: str) -> bool:
+        return os.path.isfile(self._get_path(name))
+
+    def _get_path(self, name: str) -> str:
+        return os.path.join(self.mirror_folder, name)
+
+    def _get_remote_path(self, name: str) -> str:
+        return self.container_folder.rstrip("/") + "/" + name
+
+
+class DockerLogsMirrorsWatcher(PollingLogsWatcher):
+    """Poll the logs folders, syncing the mirrors of the Docker containers before each check."""
+
+    def __init__(
+        self,
+        mirrors: Sequence[DockerLogsMirror],
+        folders: Sequence[str],
+        interval: float = POLL_INTERVAL,
+    ):
+        self.mirrors = list(mirrors)
+        super().__init__(folders, interval)
+
+    def _get_snapshot(self) -> List[Tuple[str, int, int, int]]:
+        for mirror in self.mirrors:
+            mirror.sync()
+
+        return super()._get_snapshot()
+
+
+def get_mirror_folder(
+    container_name: str, container_folder: str, mirrors_path: Optional[str] = None
+) -> str:
+    """Mirror of a container folder, in the user cache folder if mirrors_path is not set."""
+    mirrors_path = mirrors_path or get_default_mirrors_path()
+    name = re.sub(r"[^\w.-]+", "_", f"{container_name}-{container_folder}").strip("_")
+    return os.path.join(mirrors_path, name)
+
+
+def get_default_mirrors_path() -> str:
+    return os.path.join(get_default_cache_folder(), "docker-logs")
+
+
+def is_same_file(synced: RemoteLogFile, file: RemoteLogFile) -> bool:
+    return (synced.size, synced.mtime) == (file.size, file.mtime)
+
+
+def is_compressed(name: str) -> bool:
+    return os.path.splitext(name)[1] in COMPRESSED_OPENERS
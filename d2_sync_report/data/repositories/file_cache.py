@@ -3,17 +3,20 @@ from typing import Generic, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
-
 Props = TypeVar("Props", bound=BaseModel)
 
+CACHE_FOLDER_NAME = "d2-sync-report"
+
 
 class FileCache(Generic[Props]):
-    def __init__(self, props_class: Type[Props], filename: str):
+    def __init__(self, props_class: Type[Props], filename: str, verbose: bool = True):
         self.props_class = props_class
         self.filename = filename
+        self.verbose = verbose
 
     def save(self, props: Props) -> None:
         cache_path = self._get_cache_path()
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
         with open(cache_path, "w", encoding="utf-8") as f:
             f.write(props.model_dump_json(indent=4) + "\n")
 
@@ -28,7 +31,8 @@ class FileCache(Generic[Props]):
                 with open(cache_path, "r", encoding="utf-8") as f:
                     data = f.read()
                 cache_props = self.props_class.model_validate_json(data)
-                print(f"Cache: {cache_props}")
+                if self.verbose:
+                    print(f"Cache: {cache_props}")
                 return cache_props
             except ValueError as exc:
                 print(f"Cache load error: {exc}")
@@ -41,3 +45,9 @@ class FileCache(Generic[Props]):
     def _get_cache_path(self) -> str:
         script_folder = os.path.dirname(os.path.dirname(__file__))
         return os.path.join(script_folder, self.filename)
+
+
+def get_default_cache_folder() -> str:
+    """User cache folder for large data: $XDG_CACHE_HOME/d2-sync-report (~/.cache by default)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, CACHE_FOLDER_NAME)
@@ -1,38 +1,153 @@
-from typing import Optional
+import os
+from typing import Generator, List, Optional, Sequence, Union
 from datetime import datetime
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from typing import Iterator
 
 from d2_sync_report.data.dhis2_api import D2Api
 from d2_sync_report.data.repositories.d2_logs_parser.d2_logs_parser import D2LogsParser
-from d2_sync_report.data.repositories.docker_sync_temporal_folder import DockerSyncTemporalFolder
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.log_file_index import LogFileIndexCache
+from d2_sync_report.data.repositories.d2_logs_parser.log_watcher import get_logs_watcher
+from d2_sync_report.data.repositories.d2_logs_parser.logs_folder import (
+    ContainerLogsFolder,
+    LocalLogsFolder,
+    LogsFolder,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.parse_result_cache import ParseResultCache
+from d2_sync_report.data.repositories.docker_logs_mirror import (
+    DockerLogsMirror,
+    DockerLogsMirrorsWatcher,
+    get_mirror_folder,
+)
+from d2_sync_report.data.repositories.file_cache import get_default_cache_folder
 from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobInProgress,
     SyncJobReport,
+    SyncJobReportItem,
+    SyncJobReportStream,
 )
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
 from d2_sync_report.domain.repositories.sync_job_report_repository import (
     SyncJobReportRepository,
 )
 
 
 class SyncJobReportD2Repository(SyncJobReportRepository):
-    def __init__(self, api: D2Api, logs_folder: str, suggestions_path: str):
+    def __init__(
+        self,
+        api: D2Api,
+        logs_folder: Union[str, Sequence[str]],
+        suggestions_path: str,
+        workers: int = 1,
+        pipeline: bool = False,
+        registry: Optional[JobRegistry] = None,
+        status_only: bool = False,
+        stream_docker_logs: bool = False,
+        docker_mirror_path: Optional[str] = None,
+        cache_path: Optional[str] = None,
+    ):
         self.api = api
-        self.logs_folder = logs_folder
+        # Several folders (one for each node of a cluster) are merged, nodes named after them
+        self.logs_folders = [logs_folder] if isinstance(logs_folder, str) else list(logs_folder)
         self.suggestions_path = suggestions_path
+        self.workers = workers
+        self.pipeline = pipeline
+        self.registry = registry
+        self.status_only = status_only
+        # Read the logs of Docker containers through a pipe instead of a local mirror
+        self.stream_docker_logs = stream_docker_logs
+        # Parse results, indexes and Docker logs mirrors (may be large) go to the user cache folder
+        self.cache_path = cache_path or get_default_cache_folder()
+        self.docker_mirror_path = docker_mirror_path or os.path.join(self.cache_path, "docker-logs")
+
+    def stream(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> SyncJobReportStream:
+        return SyncJobReportStream(self._get_items(since, log_files, jobs_in_progress))
+
+    def _get_items(
+        self,
+        since: Optional[datetime],
+        log_files: Optional[List[LogFileCheckpoint]],
+        jobs_in_progress: Optional[List[SyncJobInProgress]],
+    ) -> Generator[SyncJobReportItem, None, SyncJobReport]:
+        # Folders (a local mirror for Docker containers) must be available until the stream ends
+        with ExitStack() as stack:
+            logs_folders = [
+                stack.enter_context(self._local_or_docker_folder(name))
+                for name in self.logs_folders
+            ]
+            stream = self._get_parser(logs_folders).stream(
+                since=since, log_files=log_files, jobs_in_progress=jobs_in_progress
+            )
+            return (yield from stream.items)
 
-    def get(self, since: Optional[datetime] = None) -> SyncJobReport:
-        with local_or_docker_folder(self.logs_folder) as logs_folder:
-            return D2LogsParser(self.api, logs_folder, self.suggestions_path).get(since=since)
+    def follow(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> Iterator[SyncJobReport]:
+        # Docker containers are followed through their mirrors (also with stream_docker_logs),
+        # which the watcher syncs when created and before each check of the folders
+        mirrors = {
+            name: self._get_docker_mirror(name)
+            for name in self.logs_folders
+            if is_docker_folder(name)
+        }
+        folders = [
+            mirrors[name].mirror_folder if name in mirrors else name for name in self.logs_folders
+        ]
+        watcher = (
+            DockerLogsMirrorsWatcher(list(mirrors.values()), folders)
+            if mirrors
+            else get_logs_watcher(folders)
+        )
+        try:
+            parser = self._get_parser([LocalLogsFolder(folder) for folder in folders])
+            yield from parser.follow(watcher, since, log_files, jobs_in_progress)
+        finally:
+            watcher.close()
 
+    @contextmanager
+    def _local_or_docker_folder(self, name: str) -> Iterator[LogsFolder]:
+        """
+        Context manager that handles local (PATH) or docker (CONTAINER:PATH) paths. Docker logs are
+        synced to a local mirror, or read straight from the container if stream_docker_logs is set.
+        """
+        if is_docker_folder(name):
+            container_name, container_path = name.split(":", 1)
+            if self.stream_docker_logs:
+                yield ContainerLogsFolder(container_name, container_path)
+            else:
+                with self._get_docker_mirror(name) as folder:
+                    yield LocalLogsFolder(folder)
+        else:
+            yield LocalLogsFolder(name)
 
-@contextmanager
-def local_or_docker_folder(name: str) -> Iterator[str]:
-    """
-    Context manager that handles local (PATH) or docker (CONTAINER:PATH) paths.
-    """
-    if ":" in name:
+    def _get_docker_mirror(self, name: str) -> DockerLogsMirror:
         container_name, container_path = name.split(":", 1)
-        with DockerSyncTemporalFolder(container_name, container_path) as docker_logs_folder:
-            yield docker_logs_folder
-    else:
-        yield name
+        mirror_folder = get_mirror_folder(container_name, container_path, self.docker_mirror_path)
+        return DockerLogsMirror(container_name, container_path, mirror_folder)
+
+    def _get_parser(self, logs_folders: List[LogsFolder]) -> D2LogsParser:
+        return D2LogsParser(
+            self.api,
+            logs_folders,
+            self.suggestions_path,
+            self.workers,
+            self.pipeline,
+            index_cache=LogFileIndexCache(os.path.join(self.cache_path, "log-files-index.json")),
+            result_cache=ParseResultCache(os.path.join(self.cache_path, "parse-results")),
+            registry=self.registry,
+            status_only=self.status_only,
+            node_names=self.logs_folders,
+        )
+
+
+def is_docker_folder(name: str) -> bool:
+    return ":" in name
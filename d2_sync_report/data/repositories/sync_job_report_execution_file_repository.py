@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -5,18 +6,32 @@ from d2_sync_report.data.repositories.file_cache import FileCache
 from d2_sync_report.domain.repositories.sync_job_report_execution_repository import (
     SyncJobReportExecutionRepository,
 )
-from typing import Optional
+from typing import List, Optional
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
+from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobErrorSignature,
+    SyncJobImportCount,
+    SyncJobInProgress,
+    SyncJobPhase,
+    SyncJobType,
+)
 from d2_sync_report.domain.entities.sync_job_report_execution import SyncJobReportExecution
 
 
 class SyncJobReportExecutionFileRepository(SyncJobReportExecutionRepository):
-    def __init__(self):
-        self.cache = FileCache(FileCacheProps, "cache.json")
+    def __init__(self, filename: str = "cache.json"):
+        self.cache = FileCache(FileCacheProps, filename)
 
     def save_last(self, execution: SyncJobReportExecution) -> None:
         props = FileCacheProps(
             last_processed=execution.last_processed,
             last_sync=execution.last_sync,
+            log_files=[
+                LogFileCheckpointProps(**vars(log_file)) for log_file in execution.log_files
+            ],
+            jobs_in_progress=[
+                SyncJobInProgressProps(**asdict(job)) for job in execution.jobs_in_progress
+            ],
         )
         self.cache.save(props)
 
@@ -26,10 +41,64 @@ class SyncJobReportExecutionFileRepository(SyncJobReportExecutionRepository):
             return None
 
         return SyncJobReportExecution(
-            last_processed=props.last_processed, last_sync=props.last_sync
+            last_processed=props.last_processed,
+            last_sync=props.last_sync,
+            log_files=[LogFileCheckpoint(**log_file.model_dump()) for log_file in props.log_files],
+            jobs_in_progress=[
+                SyncJobInProgress(
+                    **job.model_dump(exclude={"errors", "phases", "import_count"}),
+                    errors=[SyncJobErrorSignature(**error.model_dump()) for error in job.errors],
+                    phases=[SyncJobPhase(**phase.model_dump()) for phase in job.phases],
+                    import_count=SyncJobImportCount(**job.import_count.model_dump()),
+                )
+                for job in props.jobs_in_progress
+            ],
         )
 
 
+class LogFileCheckpointProps(BaseModel):
+    name: str
+    device: int
+    inode: int
+    size: int
+    fingerprint: str
+    processed_offset: int
+    node: Optional[str] = None
+
+
+class SyncJobErrorSignatureProps(BaseModel):
+    signature: str
+    count: int
+    examples: List[str]
+
+
+class SyncJobPhaseProps(BaseModel):
+    name: str
+    start: datetime
+    end: Optional[datetime] = None
+
+
+class SyncJobImportCountProps(BaseModel):
+    imported: int = 0
+    updated: int = 0
+    ignored: int = 0
+    deleted: int = 0
+    conflicts: int = 0
+
+
+class SyncJobInProgressProps(BaseModel):
+    type: SyncJobType
+    start: datetime
+    errors: List[SyncJobErrorSignatureProps]
+    job_uid: str = ""
+    omitted_errors: int = 0
+    phases: List[SyncJobPhaseProps] = []
+    import_count: SyncJobImportCountProps = SyncJobImportCountProps()
+    node: Optional[str] = None
+
+
 class FileCacheProps(BaseModel):
     last_processed: datetime
     last_sync: datetime
+    log_files: List[LogFileCheckpointProps] = []
+    jobs_in_progress: List[SyncJobInProgressProps] = []
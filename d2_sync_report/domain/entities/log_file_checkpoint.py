@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class LogFileCheckpoint:
+    """
+    Identity of a log file and the byte offset already processed in the last execution.
+
+    A file is identified by its device/inode and a fingerprint of its first bytes, so we can
+    follow it after a rotation (i.e. dhis.log -> dhis.log.1), where the name changes.
+    """
+
+    name: str
+    device: int
+    inode: int
+    size: int
+    fingerprint: str
+    # Offset up to where the file has been processed (complete lines)
+    processed_offset: int
+    # Node of the cluster whose logs folder contains the file (logs of several nodes)
+    node: Optional[str] = None
@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import List
-from datetime import datetime
+from typing import Generator, Iterator, List, Optional
+from datetime import datetime, timedelta
+
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
 
 
 class SyncJobType(str, Enum):
@@ -9,6 +11,47 @@ class SyncJobType(str, Enum):
     EVENT_PROGRAMS = "eventProgramsData"
     TRACKER_PROGRAMS = "trackerProgramsData"
     METADATA = "metadata"
+    # Scheduler jobs that are not syncs but compete with them for the database
+    ANALYTICS_TABLE = "analyticsTable"
+    CONTINUOUS_ANALYTICS_TABLE = "continuousAnalyticsTable"
+    RESOURCE_TABLE = "resourceTable"
+
+
+@dataclass
+class SyncJobPhase:
+    """Stage of a job (i.e. "Populating analytics tables"), without end if it did not finish."""
+
+    name: str
+    start: datetime
+    end: Optional[datetime] = None
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        return self.end - self.start if self.end else None
+
+
+@dataclass
+class SyncJobErrorSignature:
+    """Errors that only differ in UIDs, numbers, dates or periods, with some examples."""
+
+    signature: str
+    count: int
+    examples: List[str]
+
+
+@dataclass
+class SyncJobImportCount:
+    """Totals of the import summaries of a job."""
+
+    imported: int = 0
+    updated: int = 0
+    ignored: int = 0
+    deleted: int = 0
+    conflicts: int = 0
+
+    @property
+    def records(self) -> int:
+        return self.imported + self.updated + self.ignored + self.deleted
 
 
 @dataclass
@@ -17,11 +60,106 @@ class SyncJobReportItem:
     success: bool
     start: datetime
     end: datetime
+    # Examples of each signature
     errors: List[str]
     suggestions: List[str]
+    error_signatures: List[SyncJobErrorSignature] = field(default_factory=list)
+    # Errors not counted in any signature (limit of signatures reached)
+    omitted_errors: int = 0
+    phases: List[SyncJobPhase] = field(default_factory=list)
+    import_count: SyncJobImportCount = field(default_factory=SyncJobImportCount)
+    # Duration in the completion line of the job ("Process completed after 1m 2.5s")
+    reported_duration: Optional[timedelta] = None
+    # Node of the cluster that started the job, when the logs of several nodes are merged
+    node: Optional[str] = None
+
+    @property
+    def duration(self) -> timedelta:
+        return self.end - self.start
+
+    @property
+    def records_per_second(self) -> Optional[float]:
+        seconds = (self.reported_duration or self.duration).total_seconds()
+        records = self.import_count.records
+        return records / seconds if records and seconds > 0 else None
+
+
+@dataclass
+class SyncJobInProgress:
+    """Sync job that had not finished when the logs were processed, with the errors so far."""
+
+    type: SyncJobType
+    start: datetime
+    errors: List[SyncJobErrorSignature]
+    # UID of the section tag of the run, empty for jobs without tag
+    job_uid: str = ""
+    omitted_errors: int = 0
+    phases: List[SyncJobPhase] = field(default_factory=list)
+    import_count: SyncJobImportCount = field(default_factory=SyncJobImportCount)
+    node: Optional[str] = None
+
+
+@dataclass
+class SyncJobStatus:
+    """Entry of a status timeline: a finished job (with success and end) or a running one."""
+
+    type: SyncJobType
+    start: datetime
+    end: Optional[datetime] = None
+    success: Optional[bool] = None
+    node: Optional[str] = None
 
 
 @dataclass
 class SyncJobReport:
     items: List[SyncJobReportItem]
     last_processed: datetime
+    log_files: List[LogFileCheckpoint] = field(default_factory=list)
+    jobs_in_progress: List[SyncJobInProgress] = field(default_factory=list)
+
+    def get_status_timeline(self) -> List[SyncJobStatus]:
+        """Finished and running jobs, by start."""
+        statuses = [
+            SyncJobStatus(
+                type=item.type,
+                start=item.start,
+                end=item.end,
+                success=item.success,
+                node=item.node,
+            )
+            for item in self.items
+        ] + [
+            SyncJobStatus(type=job.type, start=job.start, node=job.node)
+            for job in self.jobs_in_progress
+        ]
+
+        return sorted(statuses, key=lambda status: status.start)
+
+
+class SyncJobReportStream:
+    """
+    Items of a report, yielded as soon as their sync job closes. Once the items have been
+    consumed, `report` holds the rest of the report (last processed, log files and jobs in
+    progress), which must be saved for the next execution.
+    """
+
+    def __init__(self, items: Generator[SyncJobReportItem, None, SyncJobReport]):
+        self.items = items
+        self.report: Optional[SyncJobReport] = None
+
+    def __iter__(self) -> Iterator[SyncJobReportItem]:
+        return self
+
+    def __next__(self) -> SyncJobReportItem:
+        try:
+            return next(self.items)
+        except StopIteration as stop:
+            self.report = stop.value
+            raise
+
+    def collect(self) -> SyncJobReport:
+        """Consume the stream and return the whole report, with items grouped by job type."""
+        items = list(self)
+        assert self.report is not None
+        types = list(SyncJobType)
+        return replace(self.report, items=sorted(items, key=lambda item: types.index(item.type)))
@@ -1,8 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import List
+
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
+from d2_sync_report.domain.entities.sync_job_report import SyncJobInProgress
 
 
 @dataclass
 class SyncJobReportExecution:
     last_processed: datetime
     last_sync: datetime
+    log_files: List[LogFileCheckpoint] = field(default_factory=list)
+    jobs_in_progress: List[SyncJobInProgress] = field(default_factory=list)
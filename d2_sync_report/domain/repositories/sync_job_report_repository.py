@@ -1,12 +1,38 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional
+from d2_sync_report.domain.entities.log_file_checkpoint import LogFileCheckpoint
 from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobInProgress,
     SyncJobReport,
+    SyncJobReportStream,
 )
 
 
 class SyncJobReportRepository(ABC):
     @abstractmethod
-    def get(self, since: Optional[datetime] = None) -> SyncJobReport:
+    def stream(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> SyncJobReportStream:
         pass
+
+    @abstractmethod
+    def follow(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> Iterator[SyncJobReport]:
+        """Report of the pending logs, then a report of the new lines each time they change."""
+        pass
+
+    def get(
+        self,
+        since: Optional[datetime] = None,
+        log_files: Optional[List[LogFileCheckpoint]] = None,
+        jobs_in_progress: Optional[List[SyncJobInProgress]] = None,
+    ) -> SyncJobReport:
+        return self.stream(since, log_files, jobs_in_progress).collect()
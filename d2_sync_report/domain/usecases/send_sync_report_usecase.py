@@ -1,12 +1,15 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 from d2_sync_report.domain.entities.instance import Instance
 from d2_sync_report.domain.entities.message import Message
 from d2_sync_report.domain.entities.metadata_versioning import MetadataVersioning
 from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobErrorSignature,
+    SyncJobPhase,
     SyncJobReport,
     SyncJobReportItem,
+    SyncJobReportStream,
     SyncJobType,
 )
 from d2_sync_report.domain.entities.sync_job_report_execution import SyncJobReportExecution
@@ -22,6 +25,9 @@ from d2_sync_report.domain.repositories.sync_job_report_repository import (
 )
 from d2_sync_report.domain.repositories.user_repository import UserRepository
 
+# In follow mode, checkpoints are saved with each report sent, and at least this often
+FOLLOW_CACHE_INTERVAL = timedelta(minutes=1)
+
 
 class SendSyncReportUseCase:
     message_subject = "DHIS2 Sync Job Report"
@@ -45,13 +51,66 @@ class SendSyncReportUseCase:
         instance: Instance,
         user_group_name_to_send: Optional[str],
         skip_cache: bool,
+        since: Optional[datetime] = None,
     ) -> SyncJobReport:
+        """
+        Send the report of the logs since the last execution, formatting the items as they are
+        streamed (the returned report has no items). With since, report the logs after it
+        instead: it is a query of its own, so the cache is neither used nor saved.
+        """
         now = datetime.now()
         user_emails = self.get_users_in_group(user_group_name_to_send)
-        since, reports = self.get_reports(skip_cache)
+        report_since, stream = self.get_reports(skip_cache, since)
+        formatted_reports = self.format_reports(instance, stream)
+        assert stream.report is not None
         metadata_versioning = self.metadata_versioning_repository.get()
-        contents = self.get_message_contents(now, since, reports, instance, metadata_versioning)
+        contents = self.get_message_contents(
+            now, report_since, formatted_reports, instance, metadata_versioning
+        )
+
+        self.send(contents, user_emails)
+        self.save_cache(skip_cache or since is not None, stream.report)
+        return stream.report
+
+    def execute_follow(
+        self,
+        instance: Instance,
+        user_group_name_to_send: Optional[str],
+        skip_cache: bool,
+    ) -> None:
+        """Keep running: send a report as soon as some jobs close, until interrupted."""
+        user_emails = self.get_users_in_group(user_group_name_to_send)
+        last = self.get_last_execution(skip_cache)
+        since = last.last_processed if last else None
+        last_saved = datetime.now()
+        print(f"Following logs since: {since or '-'}")
+
+        try:
+            for reports in self.sync_job_report.follow(
+                since=since,
+                log_files=last.log_files if last else None,
+                jobs_in_progress=last.jobs_in_progress if last else None,
+            ):
+                now = datetime.now()
 
+                if reports.items:
+                    metadata_versioning = self.metadata_versioning_repository.get()
+                    formatted_reports = self.format_reports(instance, reports.items)
+                    self.send(
+                        self.get_message_contents(
+                            now, since, formatted_reports, instance, metadata_versioning
+                        ),
+                        user_emails,
+                    )
+                    since = now
+
+                if reports.items or now - last_saved >= FOLLOW_CACHE_INTERVAL:
+                    self.save_cache(skip_cache, reports)
+                    last_saved = now
+        except KeyboardInterrupt:
+            print("Stopped following logs")
+
+    def send(self, contents: str, user_emails: Optional[List[str]]) -> None:
         if not user_emails:
             print(contents)
         else:
@@ -59,14 +118,11 @@ class SendSyncReportUseCase:
             response = self.message_repository.send(message)
             print(f"Send email response: {response}")
 
-        self.save_cache(skip_cache, reports)
-        return reports
-
     def get_message_contents(
         self,
         now: datetime,
         since: Optional[datetime],
-        reports: SyncJobReport,
+        formatted_reports: List[str],
         instance: Instance,
         metadata_versioning: MetadataVersioning,
     ) -> str:
@@ -81,18 +137,31 @@ class SendSyncReportUseCase:
             ]
         )
 
-        formatted_reports = (
-            "\n\n".join(self._format_report(instance, report) for report in reports.items)
-            or f"No sync jobs found: {period}"
-        )
+        body = "\n\n".join(formatted_reports) or f"No sync jobs found: {period}"
+
+        return header + "\n\n\n" + body
 
-        return header + "\n\n\n" + formatted_reports
+    def format_reports(self, instance: Instance, items: Iterable[SyncJobReportItem]) -> List[str]:
+        """Format the items as they come (only the text is kept), grouped by job type."""
+        formatted: Dict[SyncJobType, List[str]] = {type: [] for type in SyncJobType}
+        for item in items:
+            formatted[item.type].append(self._format_report(instance, item))
 
-    def get_reports(self, skip_cache: bool):
-        since = self.get_since_datetime(skip_cache)
+        return [text for texts in formatted.values() for text in texts]
+
+    def get_reports(
+        self, skip_cache: bool, since: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], SyncJobReportStream]:
+        # Without checkpoints, the reader seeks to since with the timestamps index
+        last = None if since else self.get_last_execution(skip_cache)
+        since = since or (last.last_processed if last else None)
         print(f"Fetching reports since: {since or '-'}")
-        reports = self.sync_job_report.get(since=since)
-        return since, reports
+        stream = self.sync_job_report.stream(
+            since=since,
+            log_files=last.log_files if last else None,
+            jobs_in_progress=last.jobs_in_progress if last else None,
+        )
+        return since, stream
 
     def get_users_in_group(self, user_group_to_send: Optional[str]) -> Optional[List[str]]:
         if not user_group_to_send:
@@ -102,9 +171,8 @@ class SendSyncReportUseCase:
         print(f"Users in group '{user_group_to_send}': {user_emails or 'NONE'}")
         return user_emails
 
-    def get_since_datetime(self, skip_cache: bool) -> Optional[datetime]:
-        last = None if skip_cache else self.sync_job_report_execution_repository.get_last()
-        return last.last_processed if last else None
+    def get_last_execution(self, skip_cache: bool) -> Optional[SyncJobReportExecution]:
+        return None if skip_cache else self.sync_job_report_execution_repository.get_last()
 
     def save_cache(self, skip_cache: bool, reports: SyncJobReport) -> None:
         if not skip_cache:
@@ -112,6 +180,8 @@ class SendSyncReportUseCase:
                 SyncJobReportExecution(
                     last_processed=reports.last_processed,
                     last_sync=datetime.now(),
+                    log_files=reports.log_files,
+                    jobs_in_progress=reports.jobs_in_progress,
                 )
             )
 
@@ -120,25 +190,64 @@ class SendSyncReportUseCase:
 
         parts: List[Optional[str]] = [
             f"Type: {report_type_names[report.type]}",
+            f"Node: {report.node}" if report.node else None,
             f"Status: {"SUCCESS" if report.success else "ERROR"}",
             f"Start: {format_datetime(report.start)}",
             f"End: {format_datetime(report.end)}",
+            f"Duration: {format_duration(report.duration)}",
+            format_import_count(report),
         ]
 
-        def add_index(group: List[str], msg: str, idx: int) -> str:
+        def add_index(group: Sequence[object], msg: str, idx: int) -> str:
             return indent + f"[{idx + 1}/{len(group)}] {msg}"
 
+        def format_signature(signature: SyncJobErrorSignature) -> str:
+            # Repeated errors show the masked signature and an example with the actual values
+            if signature.count == 1 and signature.examples:
+                return signature.examples[0]
+
+            example = (
+                f"\n{indent * 3}Example: {signature.examples[0]}" if signature.examples else ""
+            )
+            return f"({signature.count} errors) {signature.signature}{example}"
+
+        def format_phase(phase: SyncJobPhase) -> str:
+            duration = format_duration(phase.duration) if phase.duration else "not completed"
+            return f"{phase.name}: {duration}"
+
+        signatures = report.error_signatures
+        omitted_errors_str = (
+            [indent + f"[+] {report.omitted_errors} more errors (too many different errors)"]
+            if report.omitted_errors
+            else []
+        )
+
         errors_str = (
             "\n".join(
                 [
                     "Errors:",
                     *[
-                        add_index(report.errors, error, idx)
-                        for (idx, error) in enumerate(report.errors)
+                        add_index(signatures, format_signature(signature), idx)
+                        for (idx, signature) in enumerate(signatures)
                     ],
+                    *omitted_errors_str,
                 ]
             )
-            if report.errors
+            if signatures or report.omitted_errors
+            else ""
+        )
+
+        phases_str = (
+            "\n".join(
+                [
+                    "Phases:",
+                    *[
+                        add_index(report.phases, format_phase(phase), idx)
+                        for idx, phase in enumerate(report.phases)
+                    ],
+                ]
+            )
+            if report.phases
             else ""
         )
 
@@ -158,6 +267,7 @@ class SendSyncReportUseCase:
 
         return (
             "\n".join(compact(parts))
+            + ("\n" + phases_str if phases_str else "")
             + "\n"
             + errors_str
             + ("\n" + suggestions_str if suggestions_str else "")
@@ -169,6 +279,9 @@ report_type_names: dict[SyncJobType, str] = {
     SyncJobType.EVENT_PROGRAMS: "Event programs data sync",
     SyncJobType.TRACKER_PROGRAMS: "Tracker programs data sync",
     SyncJobType.METADATA: "Metadata synchronization",
+    SyncJobType.ANALYTICS_TABLE: "Analytics tables update",
+    SyncJobType.CONTINUOUS_ANALYTICS_TABLE: "Continuous analytics tables update",
+    SyncJobType.RESOURCE_TABLE: "Resource tables update",
 }
 
 
@@ -177,6 +290,34 @@ def compact(xs: list[str | None]) -> list[str]:
     return [x for x in xs if x is not None]
 
 
+def format_import_count(report: SyncJobReportItem) -> Optional[str]:
+    """Totals of the import summaries and throughput of the job, None if nothing was imported."""
+    count = report.import_count
+    if not count.records and not count.conflicts:
+        return None
+
+    records_per_second = report.records_per_second
+    throughput = f" ({records_per_second:.1f} records/s)" if records_per_second else ""
+
+    return (
+        f"Records: {count.imported} imported, {count.updated} updated, {count.ignored} ignored"
+        + f", {count.deleted} deleted, {count.conflicts} conflicts{throughput}"
+    )
+
+
+def format_duration(duration: timedelta) -> str:
+    """Format duration to string: 1h 02m 03s, 2m 03s or 3.4s."""
+    hours, rest = divmod(int(duration.total_seconds()), 3600)
+    minutes, seconds = divmod(rest, 60)
+
+    if hours:
+        return f"{hours}h {minutes:02d}m {seconds:02d}s"
+    elif minutes:
+        return f"{minutes}m {seconds:02d}s"
+    else:
+        return f"{duration.total_seconds():.1f}s"
+
+
 def format_datetime(dt: Optional[datetime], if_empty: str = "NO-DATE") -> str:
     """Format datetime to string in the format YYYY-MM-DD HH:MM:SS."""
     return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else if_empty
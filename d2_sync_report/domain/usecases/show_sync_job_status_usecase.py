@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Optional
+
+from d2_sync_report.domain.entities.sync_job_report import SyncJobStatus
+from d2_sync_report.domain.entities.sync_job_report_execution import SyncJobReportExecution
+from d2_sync_report.domain.repositories.sync_job_report_execution_repository import (
+    SyncJobReportExecutionRepository,
+)
+from d2_sync_report.domain.repositories.sync_job_report_repository import (
+    SyncJobReportRepository,
+)
+from d2_sync_report.domain.usecases.send_sync_report_usecase import (
+    format_datetime,
+    report_type_names,
+)
+
+
+class ShowSyncJobStatusUseCase:
+    """
+    Print the status timeline of the jobs since the last execution (i.e. for a dashboard polled
+    every minute). The report repository is expected to be in status-only mode, and the execution
+    repository must not be the one of the full report, or the full report would skip those lines.
+    """
+
+    def __init__(
+        self,
+        sync_job_report_execution_repository: SyncJobReportExecutionRepository,
+        sync_job_report_repository: SyncJobReportRepository,
+    ):
+        self.sync_job_report_execution_repository = sync_job_report_execution_repository
+        self.sync_job_report = sync_job_report_repository
+
+    def execute(self, skip_cache: bool, since: Optional[datetime] = None) -> List[SyncJobStatus]:
+        """With since, show the jobs after it instead (the cache is neither used nor saved)."""
+        skip_cache = skip_cache or since is not None
+        last = None if skip_cache else self.sync_job_report_execution_repository.get_last()
+        report = self.sync_job_report.get(
+            since=since or (last.last_processed if last else None),
+            log_files=last.log_files if last else None,
+            jobs_in_progress=last.jobs_in_progress if last else None,
+        )
+        timeline = report.get_status_timeline()
+
+        print("\n".join(format_status(status) for status in timeline) or "No sync jobs found")
+
+        if not skip_cache:
+            self.sync_job_report_execution_repository.save_last(
+                SyncJobReportExecution(
+                    last_processed=report.last_processed,
+                    last_sync=datetime.now(),
+                    log_files=report.log_files,
+                    jobs_in_progress=report.jobs_in_progress,
+                )
+            )
+
+        return timeline
+
+
+def format_status(status: SyncJobStatus) -> str:
+    state = get_state(status.success)
+    end = format_datetime(status.end, if_empty="...")
+    node = f" ({status.node})" if status.node else ""
+    return (
+        f"{format_datetime(status.start)} -> {end} {state:<7} {report_type_names[status.type]}"
+        + node
+    )
+
+
+def get_state(success: Optional[bool]) -> str:
+    if success is None:
+        return "RUNNING"
+    else:
+        return "SUCCESS" if success else "ERROR"
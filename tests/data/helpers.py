@@ -0,0 +1,137 @@
+"""Log fixtures and parser factory shared by the test modules."""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Union
+
+from d2_sync_report.cli import get_default_suggestions_path
+from d2_sync_report.data.dhis2_api import D2Api
+from d2_sync_report.data.repositories.d2_logs_parser.d2_logs_parser import D2LogsParser
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFile, LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import get_log_entries
+from d2_sync_report.data.repositories.d2_logs_parser.logs_folder import LogsFolder
+from d2_sync_report.data.repositories.d2_logs_parser.reducers_state import ReducersState
+from d2_sync_report.domain.entities.sync_job_report import SyncJobReport
+from tests.data.d2_api_mock import D2ApiMock
+from tests.data.request_mocks import request_mocks
+
+suggestions_path = get_default_suggestions_path()
+
+fixtures = sorted(os.listdir(os.path.join(os.path.dirname(__file__), "logs")))
+
+
+def get_parser(
+    folder: Union[Path, LogsFolder, List[Path]],
+    api: Optional[D2Api] = None,
+    suggestions_path: str = suggestions_path,
+    **options: Any,
+) -> D2LogsParser:
+    """Parser with the API mocks. Several folders are the nodes of a cluster, named after them."""
+    if isinstance(folder, list):
+        options.setdefault("node_names", [path.name for path in folder])
+        logs_folder_path: Any = [str(path) for path in folder]
+    else:
+        logs_folder_path = folder if isinstance(folder, LogsFolder) else str(folder)
+
+    return D2LogsParser(
+        api=api or D2ApiMock(request_mocks),
+        logs_folder_path=logs_folder_path,
+        suggestions_path=suggestions_path,
+        **options,
+    )
+
+
+def get_report(folder: Path, previous: Optional[SyncJobReport] = None) -> SyncJobReport:
+    parser = get_parser(folder)
+
+    if previous:
+        return parser.get(
+            since=previous.last_processed,
+            log_files=previous.log_files,
+            jobs_in_progress=previous.jobs_in_progress,
+        )
+    else:
+        return parser.get()
+
+
+def get_log_folder(folder: str) -> str:
+    return os.path.join(os.path.dirname(__file__), "logs", folder)
+
+
+def read_lines(fixture: str) -> List[str]:
+    with open(os.path.join(get_log_folder(fixture), "dhis.log"), encoding="utf-8") as file:
+        return file.read().splitlines()
+
+
+def copy_log(folder: Path, fixture: str) -> Path:
+    log_path = folder / "dhis.log"
+    shutil.copy(os.path.join(get_log_folder(fixture), "dhis.log"), log_path)
+    return log_path
+
+
+def append_lines(log_path: Path, lines: List[str], newline: bool = True) -> None:
+    with open(log_path, "a", encoding="utf-8") as file:
+        file.write("\n".join(lines) + ("\n" if newline else ""))
+
+
+def write_compressed(path: Path, lines: List[str]) -> None:
+    openers: Dict[str, Callable[..., IO[str]]] = {
+        ".gz": gzip.open,
+        ".bz2": bz2.open,
+        ".xz": lzma.open,
+    }
+    opener = openers[path.suffix]
+    with opener(path, "wt", encoding="utf-8") as file:
+        file.write("".join(line + "\n" for line in lines))
+
+
+def write_log_files(folder: Path, contents: List[List[str]]) -> List[LogFileSegment]:
+    """Write rotated files (oldest first, dhis.log last) and return their segments."""
+    for path in folder.glob("dhis.log*"):
+        path.unlink()
+
+    names = [f"dhis.log.{len(contents) - index - 1}" for index in range(len(contents))]
+    names[-1] = "dhis.log"
+    paths = [folder / name for name in names]
+
+    for path, lines in zip(paths, contents):
+        path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+    return [
+        LogFileSegment.from_log_file(LogFile.from_path(str(path)), index, [])
+        for index, path in enumerate(paths)
+    ]
+
+
+def get_concurrent_tracker_lines() -> List[str]:
+    """Two runs of the tracker job: the second opens and logs errors, the first one closes."""
+    first_run = read_lines("tracker-programs-data-sync-success")
+    second_run = [
+        line.replace("AqujRwbbik6", "BqujRwbbik6")
+        for line in read_lines("tracker-programs-data-sync-error")
+    ]
+    opened = next(index for index, line in enumerate(first_run) if "Process started" in line) + 1
+    return first_run[:opened] + second_run[:-2] + first_run[opened:] + second_run[-2:]
+
+
+def reduce_sequentially(
+    segments: List[LogFileSegment], registry: Optional[JobRegistry] = None
+) -> ReducersState:
+    registry = registry or JobRegistry.default()
+    state = registry.initial_state()
+
+    for segment in segments:
+        for log_entry in get_log_entries(segment, registry.scanner):
+            state = registry.reducer(state, log_entry)
+
+    return state
+
+
+def assert_datetime_equals(actual: datetime, expected: datetime):
+    assert actual.replace(microsecond=0) == expected
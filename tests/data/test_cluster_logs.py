@@ -0,0 +1,66 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import merge_log_entries
+from tests.data.helpers import get_parser, read_lines, write_log_files
+
+
+def test_logs_of_several_nodes_are_merged_by_timestamp(tmp_path: Path):
+    lines = read_lines("event-programs-data-sync-error")
+    node_a, node_b = split_records_between_nodes(lines, "Starting Event programs data sync")
+    for name, node_lines in [("node-a", node_a), ("node-b", node_b), ("single", lines)]:
+        (tmp_path / name).mkdir()
+        write_log_files(tmp_path / name, [node_lines])
+
+    report = get_parser([tmp_path / "node-a", tmp_path / "node-b"]).get()
+    (single_item,) = get_parser([tmp_path / "single"]).get().items
+
+    (item,) = report.items
+    assert item.node == "node-a"
+    assert replace(item, node=None) == single_item
+    assert [log_file.node for log_file in report.log_files] == ["node-a", "node-b"]
+
+    # Each node goes on from its own checkpoint in the next execution
+    parser = get_parser([tmp_path / "node-a", tmp_path / "node-b"])
+    assert parser.get(log_files=report.log_files).items == []
+
+
+def test_merged_entries_are_tagged_with_their_node():
+    node_a = [entry("2025-07-16T10:00:00,000", "a1"), entry(None, "a1 cause")]
+    node_b = [entry("2025-07-16T09:00:00,000", "b1"), entry("2025-07-16T11:00:00,000", "b2")]
+
+    merged = list(merge_log_entries([("a", node_a), ("b", node_b)]))
+
+    assert [(e.node, e.text) for e in merged] == [
+        ("b", "b1"),
+        ("a", "a1"),
+        ("a", "a1 cause"),
+        ("b", "b2"),
+    ]
+
+
+## Helpers
+def entry(raw_timestamp: Optional[str], text: str) -> LogEntry:
+    return LogEntry.from_text(raw_timestamp, text)
+
+
+def split_records_between_nodes(lines: List[str], open_text: str) -> List[List[str]]:
+    """Records that open the job go to the first node, the rest alternate between both."""
+    records: List[List[str]] = []
+    for line in lines:
+        if line.startswith("*") or not records:
+            records.append([])
+        records[-1].append(line)
+
+    nodes: List[List[str]] = [[], []]
+    others = 0
+    for record in records:
+        if open_text in record[0]:
+            nodes[0].extend(record)
+        else:
+            others += 1
+            nodes[others % 2].extend(record)
+
+    return nodes
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from tests.data.helpers import append_lines, get_concurrent_tracker_lines, get_report, read_lines
+
+
+def test_concurrent_runs_of_a_job_are_reported_separately(tmp_path: Path):
+    append_lines(tmp_path / "dhis.log", get_concurrent_tracker_lines())
+
+    report = get_report(tmp_path)
+
+    # The first run closes without errors, those logged after the second run opened are its own
+    assert [(item.type, item.success, bool(item.errors)) for item in report.items] == [
+        ("trackerProgramsData", True, False),
+        ("trackerProgramsData", False, True),
+    ]
+
+
+def test_concurrent_runs_in_progress_are_kept_across_runs(tmp_path: Path):
+    lines = get_concurrent_tracker_lines()
+    log_path = tmp_path / "dhis.log"
+    # Both runs opened, none closed yet
+    append_lines(log_path, lines[:-4])
+    report1 = get_report(tmp_path)
+    assert [job.job_uid for job in report1.jobs_in_progress] == ["AqujRwbbik6", "BqujRwbbik6"]
+
+    append_lines(log_path, lines[-4:])
+    report2 = get_report(tmp_path, previous=report1)
+
+    full_path = tmp_path / "full"
+    full_path.mkdir()
+    append_lines(full_path / "dhis.log", lines)
+    assert report2.items == get_report(full_path).items
+    assert report2.jobs_in_progress == []
+
+
+def test_errors_of_a_sync_job_are_not_attributed_to_an_overlapping_analytics_run(tmp_path: Path):
+    analytics_lines = read_lines("analytics-table-success")
+    # The tracker job runs while the analytics tables are populated
+    lines = (
+        analytics_lines[:5] + read_lines("tracker-programs-data-sync-error") + analytics_lines[5:]
+    )
+    append_lines(tmp_path / "dhis.log", lines)
+
+    report = get_report(tmp_path)
+
+    analytics_job, tracker_job = sorted(report.items, key=lambda item: item.type)
+    assert tracker_job.type == "trackerProgramsData" and tracker_job.errors
+    assert analytics_job.type == "analyticsTable" and analytics_job.success
+    assert analytics_job.errors == [] and analytics_job.import_count.records == 0
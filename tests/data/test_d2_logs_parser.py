@@ -1,11 +1,12 @@
-import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-from d2_sync_report.cli import get_default_suggestions_path
+import pytest
+
 from d2_sync_report.data.repositories.d2_logs_parser.d2_logs_parser import D2LogsParser
-from d2_sync_report.domain.entities.sync_job_report import SyncJobReportItem
+from d2_sync_report.domain.entities.sync_job_report import SyncJobImportCount, SyncJobReportItem
 from tests.data.d2_api_mock import D2ApiMock, Expectations
+from tests.data.helpers import assert_datetime_equals, get_log_folder, suggestions_path
 from tests.data.request_mocks import request_mocks
 
 ## Aggregated data synchronization
@@ -88,6 +89,67 @@ def test_metadata_sync_error():
     assert len(report.errors) == 2
 
 
+## Analytics and resource tables
+
+
+def test_analytics_table_success_with_phases():
+    repository = get_repo(folder="analytics-table-success")
+    reports = repository.get().items
+
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.type == "analyticsTable"
+    assert report.success is True
+    assert report.duration.total_seconds() == pytest.approx(344.095)
+    assert report.reported_duration == timedelta(minutes=5, seconds=44.095)
+    assert [phase.name for phase in report.phases] == [
+        "Updating resource tables",
+        "Populating analytics tables",
+        "Swapping analytics tables",
+    ]
+    assert [phase.duration.total_seconds() for phase in report.phases if phase.duration] == [
+        pytest.approx(12.4),
+        pytest.approx(330.48),
+        pytest.approx(1.2),
+    ]
+
+
+def test_resource_table_error_ends_the_failed_phase():
+    repository = get_repo(folder="resource-table-error")
+    reports = repository.get().items
+
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.type == "resourceTable"
+    assert report.success is False
+    (phase,) = report.phases
+    assert phase.name == "Generating resource tables"
+    assert_datetime_equals(phase.end or phase.start, datetime(2025, 7, 18, 3, 0, 41))
+
+
+## Import totals
+
+
+def test_import_counts_are_totalled_with_throughput():
+    repository = get_repo(folder="tracker-programs-data-sync-error")
+    (report,) = repository.get().items
+
+    assert report.import_count == SyncJobImportCount(
+        imported=1859, updated=8, ignored=132, deleted=0, conflicts=5
+    )
+    assert report.reported_duration == timedelta(seconds=0.109)
+    assert report.records_per_second == pytest.approx(1999 / 0.109)
+
+
+def test_jobs_without_import_summaries_have_no_throughput():
+    repository = get_repo(folder="data-synchronization-success")
+    (report,) = repository.get().items
+
+    assert report.import_count.records == 0
+    assert report.reported_duration is not None
+    assert report.records_per_second is None
+
+
 ## Test errors and suggestions
 
 
@@ -279,14 +341,6 @@ def get_report_with_error_and_suggestions():
     return reports[0]
 
 
-def assert_datetime_equals(actual: datetime, expected: datetime):
-    assert actual.replace(microsecond=0) == expected
-
-
-def get_log_folder(folder: str) -> str:
-    return os.path.join(os.path.dirname(__file__), "logs", folder)
-
-
 def test_tracker_programs_data_sync_error():
     repository = get_repo(folder="tracker-programs-data-sync-error")
     reports = repository.get().items
@@ -297,9 +351,6 @@ def test_tracker_programs_data_sync_error():
     assert report.success is False
 
 
-suggestions_path = get_default_suggestions_path()
-
-
 def get_repo(folder: str, expectations: Optional[Expectations] = None) -> D2LogsParser:
     return D2LogsParser(
         api=D2ApiMock(expectations or request_mocks),
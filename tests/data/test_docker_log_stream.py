@@ -0,0 +1,119 @@
+import io
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser.docker_container import (
+    ContainerFileReader,
+    DockerContainer,
+    RemoteLogFile,
+)
+from d2_sync_report.data.repositories.d2_logs_parser.logs_folder import ContainerLogsFolder
+from d2_sync_report.data.repositories.d2_logs_parser.parse_result_cache import ParseResultCache
+from d2_sync_report.domain.entities.sync_job_report import SyncJobReport
+from tests.data.helpers import append_lines, get_parser, read_lines, write_compressed
+
+# Streams opened in the container: (file name, offset)
+Streams = List[Tuple[str, int]]
+
+
+def test_container_logs_give_the_same_report_as_local_logs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    folder = tmp_path / "container"
+    folder.mkdir()
+    write_compressed(folder / "dhis.log.2.gz", read_lines("event-programs-data-sync-success"))
+    append_lines(folder / "dhis.log.1", read_lines("tracker-programs-data-sync-success"))
+    append_lines(folder / "dhis.log", read_lines("data-synchronization-success"))
+    fake_container(monkeypatch, folder)
+
+    report = get_report(ContainerLogsFolder("fake", "/opt/dhis2/logs"), tmp_path)
+    local_report = get_report(folder)
+
+    assert report.items == local_report.items
+    assert [(log_file.name, log_file.processed_offset) for log_file in report.log_files] == [
+        (log_file.name, log_file.processed_offset) for log_file in local_report.log_files
+    ]
+
+
+def test_incremental_run_streams_only_the_new_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    append_lines(tmp_path / "dhis.log", read_lines("data-synchronization-success"))
+    streams = fake_container(monkeypatch, tmp_path)
+    report = get_report(ContainerLogsFolder("fake", "/opt/dhis2/logs"))
+    size = os.path.getsize(tmp_path / "dhis.log")
+
+    append_lines(tmp_path / "dhis.log", read_lines("tracker-programs-data-sync-success"))
+    streams.clear()
+    report2 = get_report(ContainerLogsFolder("fake", "/opt/dhis2/logs"), previous=report)
+
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+    # The head is read to identify the file, then lines are streamed from the checkpoint
+    assert streams == [("dhis.log", 0), ("dhis.log", size)]
+
+
+def test_reader_skips_short_seeks_and_restarts_on_long_ones(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    contents = bytes(range(256)) * 16 * 1024
+    (tmp_path / "dhis.log").write_bytes(contents)
+    streams = fake_container(monkeypatch, tmp_path)
+
+    with io.BufferedReader(ContainerFileReader(DockerContainer("fake"), "/logs/dhis.log")) as file:
+        assert file.read(10) == contents[:10]
+        file.seek(100_000)
+        assert file.read(10) == contents[100_000:100_010]
+        file.seek(3_000_000)
+        assert file.read(10) == contents[3_000_000:3_000_010]
+        file.seek(5)
+        assert file.read(10) == contents[5:15]
+
+    assert streams == [("dhis.log", 0), ("dhis.log", 3_000_000), ("dhis.log", 5)]
+
+
+## Helpers
+
+
+def fake_container(monkeypatch: pytest.MonkeyPatch, folder: Path) -> Streams:
+    """Containers have the log files of the local folder, return the streams opened."""
+    streams: Streams = []
+
+    def list_files(_self: DockerContainer, _folder: str) -> List[RemoteLogFile]:
+        return [
+            RemoteLogFile(
+                name=path.name,
+                size=stat.st_size,
+                mtime=int(stat.st_mtime),
+                device=stat.st_dev,
+                inode=stat.st_ino,
+            )
+            for path in sorted(folder.glob("dhis.log*"))
+            for stat in [path.stat()]
+        ]
+
+    def open_range(_self: DockerContainer, path: str, offset: int) -> io.RawIOBase:
+        streams.append((os.path.basename(path), offset))
+        file = open(folder / os.path.basename(path), "rb", buffering=0)
+        file.seek(offset)
+        return file
+
+    monkeypatch.setattr(DockerContainer, "list_files", list_files)
+    monkeypatch.setattr(DockerContainer, "open_range", open_range)
+    return streams
+
+
+def get_report(
+    logs_folder: Union[Path, ContainerLogsFolder],
+    cache_folder: Optional[Path] = None,
+    previous: Optional[SyncJobReport] = None,
+) -> SyncJobReport:
+    result_cache = ParseResultCache(str(cache_folder / "results")) if cache_folder else None
+    parser = get_parser(logs_folder, result_cache=result_cache)
+
+    if previous:
+        return parser.get(log_files=previous.log_files, jobs_in_progress=previous.jobs_in_progress)
+    else:
+        return parser.get()
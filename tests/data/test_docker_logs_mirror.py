@@ -0,0 +1,135 @@
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, List
+
+import pytest
+
+from d2_sync_report.data.repositories.docker_logs_mirror import (
+    DockerContainer,
+    DockerLogsMirror,
+    DockerLogsMirrorsWatcher,
+    RemoteLogFile,
+    get_mirror_folder,
+)
+from tests.data.helpers import append_lines
+
+
+def test_first_sync_copies_all_files(tmp_path: Path):
+    container = get_container(tmp_path, {"dhis.log.1": ["old line"], "dhis.log": ["line 1"]})
+
+    mirror_folder = sync(tmp_path, container)
+
+    assert read_files(mirror_folder) == read_files(container.folder)
+    assert sorted(container.operations) == ["copy dhis.log", "copy dhis.log.1"]
+
+
+def test_unchanged_files_are_not_copied_and_new_lines_are_appended(tmp_path: Path):
+    container = get_container(tmp_path, {"dhis.log.1": ["old line"], "dhis.log": ["line 1"]})
+    mirror_folder = sync(tmp_path, container)
+    inode = os.stat(mirror_folder / "dhis.log").st_ino
+
+    append_lines(container.folder / "dhis.log", ["line 2"])
+    container.operations.clear()
+    sync(tmp_path, container)
+
+    assert container.operations == ["head dhis.log", "append dhis.log from 7"]
+    assert read_files(mirror_folder) == read_files(container.folder)
+    assert os.stat(mirror_folder / "dhis.log").st_ino == inode
+
+
+def test_rotated_files_are_renamed_instead_of_copied(tmp_path: Path):
+    container = get_container(tmp_path, {"dhis.log.1": ["old line"], "dhis.log": ["line 1"]})
+    mirror_folder = sync(tmp_path, container)
+
+    # The live file gets more lines before it is rotated, the oldest rotation is removed
+    append_lines(container.folder / "dhis.log", ["line 2"])
+    os.remove(container.folder / "dhis.log.1")
+    os.rename(container.folder / "dhis.log", container.folder / "dhis.log.1")
+    append_lines(container.folder / "dhis.log", ["new line"])
+    container.operations.clear()
+    sync(tmp_path, container)
+
+    assert "copy dhis.log.1" not in container.operations
+    assert "append dhis.log.1 from 7" in container.operations
+    assert read_files(mirror_folder) == read_files(container.folder)
+
+
+def test_watcher_syncs_the_mirror_until_a_log_file_changes(tmp_path: Path):
+    container = get_container(tmp_path, {"dhis.log": ["line 1"]})
+    mirror_folder = tmp_path / "mirror"
+    mirror = DockerLogsMirror("fake", "/opt/dhis2/logs", str(mirror_folder), container)
+    watcher = DockerLogsMirrorsWatcher([mirror], [str(mirror_folder)], interval=0.01)
+    assert read_files(mirror_folder) == read_files(container.folder)
+
+    append_lines(container.folder / "dhis.log", ["line 2"])
+    watcher.wait()
+
+    assert read_files(mirror_folder) == read_files(container.folder)
+
+
+def test_mirrors_are_kept_in_the_user_cache_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert get_mirror_folder("dhis2", "/opt/dhis2/logs") == str(
+        tmp_path / "d2-sync-report" / "docker-logs" / "dhis2-_opt_dhis2_logs"
+    )
+    assert get_mirror_folder("dhis2", "/opt/dhis2/logs", "/mirrors") == os.path.join(
+        "/mirrors", "dhis2-_opt_dhis2_logs"
+    )
+
+
+## Helpers
+
+
+class FakeContainer(DockerContainer):
+    """Container whose logs folder is a local folder, recording the transfers."""
+
+    def __init__(self, folder: Path):
+        super().__init__("fake")
+        self.folder = folder
+        self.operations: List[str] = []
+
+    def list_files(self, folder: str) -> List[RemoteLogFile]:
+        return [
+            RemoteLogFile(name=path.name, size=path.stat().st_size, mtime=int(path.stat().st_mtime))
+            for path in sorted(self.folder.iterdir())
+        ]
+
+    def read_head(self, path: str, size: int) -> bytes:
+        self.operations.append(f"head {os.path.basename(path)}")
+        with open(self.folder / os.path.basename(path), "rb") as file:
+            return file.read(size)
+
+    def append_range(self, path: str, offset: int, file: BinaryIO) -> None:
+        self.operations.append(f"append {os.path.basename(path)} from {offset}")
+        with open(self.folder / os.path.basename(path), "rb") as remote_file:
+            remote_file.seek(offset)
+            file.write(remote_file.read())
+
+    def copy(self, path: str, local_path: str) -> None:
+        self.operations.append(f"copy {os.path.basename(path)}")
+        shutil.copyfile(self.folder / os.path.basename(path), local_path)
+
+
+def get_container(tmp_path: Path, files: dict[str, List[str]]) -> FakeContainer:
+    folder = tmp_path / "container"
+    folder.mkdir()
+    for name, lines in files.items():
+        append_lines(folder / name, lines)
+    return FakeContainer(folder)
+
+
+def sync(tmp_path: Path, container: FakeContainer) -> Path:
+    mirror_folder = tmp_path / "mirror"
+    with DockerLogsMirror("fake", "/opt/dhis2/logs", str(mirror_folder), container) as folder:
+        return Path(folder)
+
+
+def read_files(folder: Path) -> dict[str, str]:
+    # Files of the mirror itself (manifest) are hidden
+    return {
+        path.name: path.read_text()
+        for path in folder.iterdir()
+        if path.is_file() and not path.name.startswith(".")
+    }
@@ -0,0 +1,45 @@
+from d2_sync_report.data.repositories.d2_logs_parser import error_signatures
+from d2_sync_report.data.repositories.d2_logs_parser.error_signatures import (
+    ErrorSignatures,
+    get_signature,
+)
+
+
+def test_uids_numbers_dates_and_periods_are_masked():
+    signature = get_signature(
+        "Period: `2025W27` is not open for this data set: `h3zkiErOoFl` (transaction 1234),"
+        + " last updated 2025-07-17T12:38:09,837"
+    )
+
+    assert signature == (
+        "Period: `<period>` is not open for this data set: `<uid>` (transaction <n>),"
+        + " last updated <date>"
+    )
+
+
+def test_errors_are_counted_by_signature_with_some_examples():
+    errors = ErrorSignatures()
+
+    errors.add([f"Non-unique attribute value for attribute UID{index:08d}" for index in range(50)])
+    errors.add(["No row with the given identifier exists: [CategoryOptionCombo#1698861]"])
+
+    assert [(s.signature, s.count) for s in errors.signatures] == [
+        ("Non-unique attribute value for attribute <uid>", 50),
+        ("No row with the given identifier exists: [CategoryOptionCombo#<n>]", 1),
+    ]
+    assert len(errors.examples) == error_signatures.MAX_EXAMPLES + 1
+    assert errors.count == 51
+
+
+def test_errors_over_the_limits_are_only_counted(monkeypatch):
+    monkeypatch.setattr(error_signatures, "MAX_SIGNATURES", 1)
+    monkeypatch.setattr(error_signatures, "MAX_SIZE", 25)
+    errors = ErrorSignatures()
+
+    errors.add(["error 1", "error 2", "error 3", "another error"])
+
+    assert [(s.signature, s.count, s.examples) for s in errors.signatures] == [
+        ("error <n>", 3, ["error 1", "error 2"])
+    ]
+    assert errors.omitted == 1
+    assert errors.count == 4
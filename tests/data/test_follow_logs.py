@@ -0,0 +1,102 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_watcher import (
+    InotifyLogsWatcher,
+    LogsWatcher,
+    PollingLogsWatcher,
+)
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+from tests.data.helpers import append_lines, get_parser, read_lines, write_log_files
+
+# Lines of the fixture before the close delimiter of the job
+OPEN_LINES = 9
+
+
+def test_follow_reports_jobs_as_they_close(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-success")
+    write_log_files(tmp_path, [lines[:OPEN_LINES]])
+    watcher = FakeLogsWatcher(lambda: append_lines(tmp_path / "dhis.log", lines[OPEN_LINES:]))
+
+    reports = get_parser(tmp_path).follow(watcher)
+    first, second = next(reports), next(reports)
+
+    assert first.items == [] and len(first.jobs_in_progress) == 1
+    assert [(item.type, item.success) for item in second.items] == [
+        (SyncJobType.TRACKER_PROGRAMS, True)
+    ]
+    assert second.jobs_in_progress == []
+
+
+def test_follow_survives_log_rotation(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-success")
+    write_log_files(tmp_path, [lines[:OPEN_LINES]])
+
+    def rotate() -> None:
+        os.rename(tmp_path / "dhis.log", tmp_path / "dhis.log.1")
+        append_lines(tmp_path / "dhis.log", lines[OPEN_LINES:])
+
+    reports = get_parser(tmp_path).follow(FakeLogsWatcher(rotate))
+    next(reports)
+    rotated = next(reports)
+
+    assert [item.type for item in rotated.items] == [SyncJobType.TRACKER_PROGRAMS]
+    assert sorted(log_file.name for log_file in rotated.log_files) == ["dhis.log", "dhis.log.1"]
+
+
+def test_polling_watcher_returns_when_a_log_file_changes(tmp_path: Path):
+    write_log_files(tmp_path, [["first line"]])
+    watcher = PollingLogsWatcher([str(tmp_path)], interval=0.01)
+
+    append_lines(tmp_path / "dhis.log", ["second line"])
+    watcher.wait()
+
+    assert watcher.snapshot[0][2] == len("first line\nsecond line\n")
+
+
+def test_inotify_watcher_returns_when_a_log_file_changes(tmp_path: Path):
+    write_log_files(tmp_path, [["first line"]])
+    try:
+        watcher = InotifyLogsWatcher([str(tmp_path)], settle_delay=0)
+    except (AttributeError, OSError):
+        pytest.skip("inotify is not available")
+
+    append_lines(tmp_path / "dhis.log", ["second line"])
+    watcher.wait()
+    watcher.close()
+
+
+def test_inotify_watcher_ignores_other_files_of_the_folder(tmp_path: Path):
+    write_log_files(tmp_path, [["first line"]])
+    try:
+        watcher = InotifyLogsWatcher([str(tmp_path)], settle_delay=0)
+    except (AttributeError, OSError):
+        pytest.skip("inotify is not available")
+    waiting = threading.Thread(target=watcher.wait, daemon=True)
+
+    waiting.start()
+    append_lines(tmp_path / "dhis-audit.log", ["audit line"])
+    waiting.join(timeout=0.5)
+    assert waiting.is_alive()
+
+    append_lines(tmp_path / "dhis.log", ["second line"])
+    waiting.join(timeout=5)
+    assert not waiting.is_alive()
+    watcher.close()
+
+
+## Helpers
+
+
+class FakeLogsWatcher(LogsWatcher):
+    """Run the changes of the test instead of waiting for them."""
+
+    def __init__(self, *changes: Callable[[], None]):
+        self.changes: List[Callable[[], None]] = list(changes)
+
+    def wait(self) -> None:
+        self.changes.pop(0)()
@@ -0,0 +1,79 @@
+from d2_sync_report.data.repositories.d2_logs_parser.import_summaries import (
+    ImportSummary,
+    parse_import_summaries,
+)
+
+
+def test_summary_fields_and_conflicts_are_parsed():
+    line = (
+        "Sync summary: ImportSummaries{importSummaries=[ImportSummary{status=WARNING, "
+        + "description='Import process completed successfully', "
+        + "importCount=[imports=926, updates=0, ignores=74], conflicts={"
+        + "E7643:2025W27=ImportConflict{error:E7643, message:Period: `2025W27` is not open}, "
+        + "E7613:zUs1ja0c8zT=ImportConflict{error:E7613, message:Category option combo}}, "
+        + "dataSetComplete='false', reference='null', href='null'}]}"
+    )
+
+    assert parse_import_summaries(line) == [
+        ImportSummary(
+            status="WARNING",
+            description="Import process completed successfully",
+            import_count="imports=926, updates=0, ignores=74",
+            reference="null",
+            conflicts=[
+                "error:E7643, message:Period: `2025W27` is not open",
+                "error:E7613, message:Category option combo",
+            ],
+        )
+    ]
+
+
+def test_quoted_values_may_contain_quotes_and_braces():
+    line = (
+        "ImportSummary{status=ERROR, description='Can't import {event}', conflicts=["
+        + "ImportConflict{object='Event', value='Date ( Fri Sep 15 ) is after {completed}'}], "
+        + "reference='Bzyve9gtbyw'} ImportSummary{status=SUCCESS, reference='uyRjwOSJa5k'}"
+    )
+
+    summaries = parse_import_summaries(line)
+
+    assert [summary.description for summary in summaries] == ["Can't import {event}", None]
+    assert summaries[0].conflicts == [
+        "object='Event', value='Date ( Fri Sep 15 ) is after {completed}'"
+    ]
+    assert [summary.reference for summary in summaries] == ["Bzyve9gtbyw", "uyRjwOSJa5k"]
+
+
+def test_conflicts_over_the_limit_of_the_line_are_counted():
+    summary = "ImportSummary{status=ERROR, conflicts=[ImportConflict{a}, ImportConflict{b}]}"
+
+    summaries = parse_import_summaries(f"{summary} {summary}", max_conflicts=3)
+
+    assert [summary.conflicts for summary in summaries] == [["a", "b"], ["a"]]
+    assert summaries[1].omitted_conflicts == 1
+    assert summaries[1].format_summary().endswith('message="a (+1 more conflicts)"')
+
+
+def test_truncated_summary_is_ignored():
+    line = "ImportSummary{status=ERROR} ImportSummary{status=ERROR, conflicts={E1=Import"
+
+    assert [summary.status for summary in parse_import_summaries(line)] == ["ERROR"]
+
+
+def test_import_counts_are_parsed_by_key():
+    summary = ImportSummary(import_count="imports=926, updates=3, ignores=74, deleted=1")
+
+    assert summary.get_counts() == {"imports": 926, "updates": 3, "ignores": 74, "deleted": 1}
+    assert ImportSummary().get_counts() == {}
+
+
+def test_first_quoted_field_of_a_conflict_may_contain_braces():
+    line = (
+        "ImportSummary{status=ERROR, conflicts=[ImportConflict{object='a}b', value='x'}], "
+        + "reference='R1'}"
+    )
+
+    summaries = parse_import_summaries(line)
+
+    assert [summary.conflicts for summary in summaries] == [["object='a}b', value='x'"]]
+    assert [summary.reference for summary in summaries] == ["R1"]
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import (
+    JobRegistry,
+    get_default_job_definitions_path,
+)
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+from tests.data.helpers import assert_datetime_equals, get_parser, read_lines, write_log_files
+
+
+def test_only_enabled_job_types_are_reported(tmp_path: Path):
+    lines = read_lines("data-synchronization-success") + read_lines(
+        "tracker-programs-data-sync-success"
+    )
+    write_log_files(tmp_path, [lines])
+    registry = JobRegistry.from_file(
+        get_default_job_definitions_path(), [SyncJobType.TRACKER_PROGRAMS]
+    )
+
+    items = get_parser(tmp_path, registry=registry).get().items
+
+    assert [item.type for item in items] == [SyncJobType.TRACKER_PROGRAMS]
+    assert "[data_sync " not in registry.classifier.patterns
+
+
+def test_jobs_are_parsed_with_custom_definitions(tmp_path: Path):
+    write_log_files(tmp_path, [read_lines("tracker-programs-data-sync-success")])
+    definitions_path = tmp_path / "job_definitions.json"
+    tracker_stage_definition = {
+        "type": "trackerProgramsData",
+        "section": "TRACKER_PROGRAMS_DATA_SYNC",
+        "delimiters": {
+            "open": ["Stage started"],
+            "close_success": ["Stage completed"],
+            "close_error": [],
+        },
+    }
+    definitions_path.write_text(json.dumps({"jobs": [tracker_stage_definition]}))
+    registry = JobRegistry.from_file(str(definitions_path))
+
+    (item,) = get_parser(tmp_path, registry=registry).get().items
+
+    assert item.type == SyncJobType.TRACKER_PROGRAMS
+    assert_datetime_equals(item.start, datetime(2025, 7, 17, 12, 38, 9))
+    assert item.end.microsecond == 837000
+
+
+def test_registry_key_depends_on_the_definitions():
+    path = get_default_job_definitions_path()
+
+    assert JobRegistry.from_file(path).key == JobRegistry.default().key
+    assert JobRegistry.from_file(path, [SyncJobType.METADATA]).key != JobRegistry.default().key
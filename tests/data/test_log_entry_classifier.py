@@ -0,0 +1,51 @@
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.domain.entities.sync_job_report import SyncJobType
+
+classifier = JobRegistry.default().classifier
+
+
+def test_unrelated_line_is_discarded():
+    assert classify("Authentication event: AuthenticationSuccessEvent; username: admin") is None
+
+
+def test_delimiter_matches_only_jobs_of_the_tagged_section():
+    classification = classify(
+        "[META_DATA_SYNC aBcD9Zo0xrG] Process completed after 0.12s: Skipping synchronization"
+    )
+
+    assert classification
+    assert classification.closes_success == frozenset()
+    assert classification.section == "META_DATA_SYNC"
+    assert classification.job_uid == "aBcD9Zo0xrG"
+
+
+def test_tagged_line_only_concerns_runs_of_its_job():
+    classification = classify("[TRACKER_PROGRAMS_DATA_SYNC AqujRwbbik6] Caused by: some error")
+
+    assert classification
+    assert classification.tagged_type == SyncJobType.TRACKER_PROGRAMS
+    assert classification.get_job_uid(SyncJobType.TRACKER_PROGRAMS) == "AqujRwbbik6"
+    assert classification.concerns_open_job(SyncJobType.TRACKER_PROGRAMS)
+    assert not classification.concerns_open_job(SyncJobType.EVENT_PROGRAMS)
+
+
+def test_delimiters_are_case_insensitive():
+    classification = classify("[DATA_SYNC lp1KgFgSNcp] process COMPLETED after 0.115s")
+
+    assert classification
+    assert classification.closes_success == frozenset([SyncJobType.AGGREGATED])
+
+
+def test_delimiter_without_section_and_markers():
+    classification = classify("Metadata Sync cron Job started. Caused by: some error")
+
+    assert classification
+    assert classification.opens == frozenset([SyncJobType.METADATA])
+    assert classification.caused_by
+    assert not classification.import_summaries
+    assert not classification.error_fragments
+
+
+def classify(text: str):
+    return classifier.classify(LogEntry.from_text(None, text))
@@ -0,0 +1,189 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_file_index import LogFileIndexCache
+from tests.data.helpers import (
+    append_lines,
+    copy_log,
+    get_parser,
+    get_report,
+    read_lines,
+    write_compressed,
+)
+
+
+def test_incremental_run_skips_processed_files(tmp_path: Path):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    report1 = get_report(tmp_path)
+    assert len(report1.items) == 1
+
+    report2 = get_report(tmp_path, previous=report1)
+    assert len(report2.items) == 0
+    assert report2.log_files[0].processed_offset == os.path.getsize(log_path)
+
+
+def test_incremental_run_reads_appended_lines(tmp_path: Path):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    report1 = get_report(tmp_path)
+    append_lines(log_path, read_lines("tracker-programs-data-sync-success"))
+
+    report2 = get_report(tmp_path, previous=report1)
+
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+
+
+def test_incomplete_last_line_is_read_in_next_run(tmp_path: Path):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    lines = read_lines("tracker-programs-data-sync-success")
+    last_line = lines[-1]
+    append_lines(log_path, lines[:-1] + [last_line[:20]], newline=False)
+    report1 = get_report(tmp_path)
+    assert [item.type for item in report1.items] == ["aggregatedData"]
+
+    append_lines(log_path, [last_line[20:]])
+    report2 = get_report(tmp_path, previous=report1)
+
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+
+
+def test_rotated_file_is_not_read_again(tmp_path: Path):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    report1 = get_report(tmp_path)
+    os.rename(log_path, tmp_path / "dhis.log.1")
+    append_lines(log_path, read_lines("tracker-programs-data-sync-success"))
+
+    report2 = get_report(tmp_path, previous=report1)
+
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+    assert [log_file.name for log_file in report2.log_files] == ["dhis.log.1", "dhis.log"]
+
+
+def test_job_in_progress_is_resumed_without_duplicating_closed_jobs(tmp_path: Path):
+    data_sync_lines = read_lines("data-synchronization-success")
+    log_path = tmp_path / "dhis.log"
+    # Data sync job opened, then a full tracker job runs before data sync ends
+    append_lines(log_path, data_sync_lines[:6] + read_lines("tracker-programs-data-sync-success"))
+    report1 = get_report(tmp_path)
+    assert [item.type for item in report1.items] == ["trackerProgramsData"]
+
+    append_lines(log_path, data_sync_lines[6:])
+    report2 = get_report(tmp_path, previous=report1)
+
+    assert [item.type for item in report2.items] == ["aggregatedData"]
+
+
+def test_errors_of_job_in_progress_are_kept_across_runs(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-error")
+    log_path = tmp_path / "dhis.log"
+    # Job opened and errors logged, but not closed yet
+    append_lines(log_path, lines[:-2])
+    report1 = get_report(tmp_path)
+    assert report1.items == []
+    assert [job.type for job in report1.jobs_in_progress] == ["trackerProgramsData"]
+
+    append_lines(log_path, lines[-2:])
+    report2 = get_report(tmp_path, previous=report1)
+
+    full_path = tmp_path / "full"
+    full_path.mkdir()
+    copy_log(full_path, "tracker-programs-data-sync-error")
+    expected_report = get_report(full_path)
+    assert report2.items == expected_report.items
+    assert report2.items[0].errors
+    assert report2.jobs_in_progress == []
+
+
+def test_truncated_file_is_read_from_start(tmp_path: Path):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    report1 = get_report(tmp_path)
+    log_path.write_text("")
+    append_lines(log_path, read_lines("tracker-programs-data-sync-success"))
+
+    report2 = get_report(tmp_path, previous=report1)
+
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+
+
+def test_compressed_rotations_are_read_in_order(tmp_path: Path):
+    write_compressed(tmp_path / "dhis.log.3.gz", read_lines("event-programs-data-sync-success"))
+    write_compressed(tmp_path / "dhis.log.2.bz2", read_lines("tracker-programs-data-sync-success"))
+    write_compressed(tmp_path / "dhis.log.1.xz", read_lines("metadata-synchronization-success"))
+    append_lines(tmp_path / "dhis.log", read_lines("data-synchronization-success"))
+
+    report = get_report(tmp_path)
+
+    assert [item.type for item in report.items] == [
+        "aggregatedData",
+        "eventProgramsData",
+        "trackerProgramsData",
+        "metadata",
+    ]
+
+
+def test_job_split_across_rotations_gives_the_same_report_as_a_single_file(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-error")
+    # Highest N is the oldest rotation, compressed and plain files alike
+    write_compressed(tmp_path / "dhis.log.2.gz", lines[:10])
+    append_lines(tmp_path / "dhis.log.1", lines[10:20])
+    append_lines(tmp_path / "dhis.log", lines[20:])
+    single_file_path = tmp_path / "single"
+    single_file_path.mkdir()
+    append_lines(single_file_path / "dhis.log", lines)
+
+    report = get_report(tmp_path)
+
+    assert report.items == get_report(single_file_path).items
+    assert len(report.items[0].errors) == 10
+
+
+def test_compressed_rotation_is_not_read_again(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    log_path = copy_log(tmp_path, "data-synchronization-success")
+    report1 = get_report(tmp_path)
+    write_compressed(tmp_path / "dhis.log.1.gz", read_lines("data-synchronization-success"))
+    log_path.write_text("")
+    append_lines(log_path, read_lines("tracker-programs-data-sync-success"))
+
+    report2 = get_report(tmp_path, previous=report1)
+    assert [item.type for item in report2.items] == ["trackerProgramsData"]
+
+    report3 = get_report(tmp_path, previous=report2)
+    assert report3.items == []
+    assert f"Already processed: {tmp_path}/dhis.log.1.gz" in capsys.readouterr().out
+
+
+def test_rotations_before_since_are_skipped_using_the_index(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+):
+    write_compressed(tmp_path / "dhis.log.2.gz", read_lines("event-programs-data-sync-success"))
+    write_compressed(tmp_path / "dhis.log.1.gz", read_lines("metadata-synchronization-success"))
+    append_lines(tmp_path / "dhis.log", read_lines("data-synchronization-success"))
+    index_cache = LogFileIndexCache(str(tmp_path / "index.json"))
+    get_parser(tmp_path, index_cache=index_cache).get()
+
+    report = get_parser(tmp_path, index_cache=index_cache).get(since=datetime(2025, 7, 20))
+
+    assert [item.type for item in report.items] == ["aggregatedData", "metadata"]
+    assert f"Skipped, all lines before 2025-07-20T00:00:00,000: {tmp_path}/dhis.log.2.gz" in (
+        capsys.readouterr().out
+    )
+
+
+def test_since_gives_the_same_report_with_the_index(tmp_path: Path):
+    append_lines(tmp_path / "dhis.log.1", read_lines("tracker-programs-data-sync-success"))
+    append_lines(tmp_path / "dhis.log", read_lines("metadata-synchronization-success"))
+    append_lines(tmp_path / "dhis.log", read_lines("data-synchronization-success"))
+    index_cache = LogFileIndexCache(str(tmp_path / "index.json"))
+    get_parser(tmp_path, index_cache=index_cache).get()
+    since = datetime(2025, 7, 21, 12, 0, 0)
+
+    report = get_parser(tmp_path, index_cache=index_cache).get(since=since)
+
+    assert [item.type for item in report.items] == ["aggregatedData"]
+    assert report.items == get_parser(tmp_path).get(since=since).items
+    assert len(index_cache.load()) == 2
+
+
+## Helpers
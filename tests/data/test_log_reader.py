@@ -0,0 +1,96 @@
+from pathlib import Path
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import (
+    get_log_record,
+    join_detail_records,
+)
+from tests.data.helpers import get_report, read_lines, write_log_files
+
+# Lines of the tracker fixture before the close delimiter of the job
+TRACKER_OPEN_LINES = 9
+
+
+def test_record_keeps_only_causes_with_their_details():
+    entry = get_log_record(
+        b"* ERROR 2025-07-17T12:38:09,837 Sync summary: ImportSummary{status=ERROR}\n"
+        b"\tat org.hisp.dhis.dxf2.sync.Some.method(Some.java:10)\n"
+        b"Caused by: org.postgresql.util.PSQLException: ERROR: duplicate key value\n"
+        b"  Detail: Key (uid)=(NtwUZWYlhxt) already exists\n"
+        b"\tat org.hisp.dhis.dxf2.sync.Other.method(Other.java:20)\n"
+        b"Caused by: org.hibernate.ObjectNotFoundException: No row\n"
+    )
+
+    assert entry
+    assert entry.raw_timestamp == "2025-07-17T12:38:09,837"
+    assert entry.text == "Sync summary: ImportSummary{status=ERROR}"
+    assert entry.fragments == (
+        "Caused by: org.postgresql.util.PSQLException: ERROR: duplicate key value"
+        + " - Detail: Key (uid)=(NtwUZWYlhxt) already exists",
+        "Caused by: org.hibernate.ObjectNotFoundException: No row",
+    )
+
+
+def test_detail_without_cause_in_the_record_is_discarded():
+    entry = get_log_record(
+        b"* ERROR 2025-07-17T12:38:09,837 Sync failed\n  Detail: Key (uid)=(abc) already exists\n"
+    )
+
+    assert entry
+    assert entry.fragments == ()
+
+
+def test_detail_is_appended_to_cause_in_first_line():
+    entry = get_log_record(
+        b"* ERROR 2025-07-17T12:38:09,837 Caused by: duplicate key\n  Detail: Key (uid)=(abc)\n"
+    )
+
+    assert entry
+    assert entry.text == "Caused by: duplicate key - Detail: Key (uid)=(abc)"
+    assert entry.fragments == ()
+
+
+def test_import_summaries_of_continuation_lines_are_kept():
+    entry = get_log_record(
+        b"* ERROR 2025-07-17T12:38:09,837 Sync against endpoint failed\n"
+        b"Response: ImportSummary{status=ERROR, importCount=[imports=0, ignores=2]}\n"
+        b"\tat org.hisp.dhis.dxf2.sync.Some.method(Some.java:10)\n"
+    )
+
+    assert entry
+    assert entry.summaries == (
+        "Response: ImportSummary{status=ERROR, importCount=[imports=0, ignores=2]}",
+    )
+
+
+def test_detail_record_right_after_a_cause_is_appended_to_it():
+    cause = b"* ERROR 2025-07-17T12:38:09,837 Caused by: duplicate key\n"
+    detail = b"* ERROR 2025-07-17T12:38:09,838 Detail: Key (uid)=(abc) already exists\n"
+
+    joined = list(join_detail_records([(0, cause), (len(cause), detail)]))
+    apart = list(join_detail_records([(0, cause), (len(cause) + 10, detail)]))
+
+    assert [entry.text for entry in joined] == [
+        "Caused by: duplicate key - Detail: Key (uid)=(abc) already exists"
+    ]
+    assert [entry.text for entry in apart] == [
+        "Caused by: duplicate key",
+        "Detail: Key (uid)=(abc) already exists",
+    ]
+
+
+def test_continuation_summaries_and_detail_records_are_reported(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-success")
+    errors = [
+        "* ERROR 2025-07-17T12:38:09,835 Sync against endpoint: EVENTS failed",
+        "Response: ImportSummary{status=ERROR, importCount=[imports=0, ignores=2]}",
+        "* ERROR 2025-07-17T12:38:09,836 Caused by: duplicate key value",
+        "* ERROR 2025-07-17T12:38:09,836 Detail: Key (uid)=(NtwUZWYlhxt) already exists",
+    ]
+    write_log_files(tmp_path, [lines[:TRACKER_OPEN_LINES] + errors + lines[TRACKER_OPEN_LINES:]])
+
+    [item] = get_report(tmp_path).items
+
+    assert item.import_count.ignored == 2
+    assert "Caused by: duplicate key value - Detail: Key (uid)=(NtwUZWYlhxt) already exists" in (
+        item.errors
+    )
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser import log_files
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFile, LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_scanner import LogScanner
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import format_timestamp
+
+lines = [
+    b"* INFO  2025-07-16T09:04:50,100 Unrelated line\n",
+    b"* INFO  2025-07-16T09:04:50,200 [DATA_SYNC lp1KgFgSNcp] Process Completed after 1s\n",
+    b"  at org.hisp.dhis.Some.method(Some.java:10)\n",
+    b"Caused by: some error\n",
+    b"* INFO  2025-07-16T09:04:50,300 Unrelated line\n",
+]
+
+patterns = ["Process completed after", "Caused by:"]
+
+
+def test_scan_yields_only_candidate_records_with_offsets(tmp_path: Path):
+    # Use a tiny block size so records are split between blocks
+    candidates, segment = scan(tmp_path, b"".join(lines), block_size=16)
+
+    # The line with the timestamp and its continuation lines
+    assert candidates == [(len(lines[0]), b"".join(lines[1:4]))]
+    assert segment.end == sum(map(len, lines))
+
+
+def test_follower_patterns_are_only_searched_right_after_a_candidate(tmp_path: Path):
+    detail = b"* ERROR 2025-07-16T09:04:50,250 Detail: Key (uid)=(abc) already exists\n"
+    contents = b"".join([lines[0], detail] + lines[1:4] + [detail] + lines[4:])
+
+    candidates, _segment = scan(tmp_path, contents, follower_patterns=["Detail: "])
+
+    # The first detail follows an unrelated line, the second one the candidate record
+    assert [record for _offset, record in candidates] == [b"".join(lines[1:4]), detail]
+
+
+def test_scan_skips_incomplete_last_line_of_live_file(tmp_path: Path):
+    incomplete_line = b"Caused by: still being writ"
+    candidates, segment = scan(tmp_path, b"".join(lines) + incomplete_line)
+
+    assert candidates == [(len(lines[0]), b"".join(lines[1:4]))]
+    assert segment.end == sum(map(len, lines))
+
+
+def test_find_first_after(tmp_path: Path):
+    log_path = tmp_path / "dhis.log"
+    log_path.write_bytes(b"".join(lines))
+    segment = get_segment(log_path)
+
+    with open(log_path, "rb") as file:
+        offset = LogScanner(patterns).find_first_after(file, segment, "2025-07-16T09:04:50,200")
+        assert offset == sum(map(len, lines[:4]))
+
+        not_found = LogScanner(patterns).find_first_after(file, segment, "2025-07-16T09:04:50,300")
+        assert not_found is None
+
+
+def test_scan_builds_sparse_index_used_to_find_first_after(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(log_files, "INDEX_INTERVAL", 1000)
+    start = datetime(2025, 7, 16, 9, 0, 0)
+    timestamps = [format_timestamp(start + timedelta(seconds=index)) for index in range(500)]
+    contents = b"".join(f"* INFO  {ts} Unrelated line\n".encode() for ts in timestamps)
+
+    _candidates, segment = scan(tmp_path, contents, block_size=100)
+
+    assert (segment.first_timestamp, segment.last_timestamp) == (timestamps[0], timestamps[-1])
+    assert segment.index_points[0] == (0, timestamps[0])
+    assert all(
+        b.offset - a.offset >= 1000 for a, b in zip(segment.index_points, segment.index_points[1:])
+    )
+
+    since = timestamps[300]
+    indexed_segment = get_segment(tmp_path / "dhis.log")
+    indexed_segment.index_points = segment.index_points
+    assert 0 < indexed_segment.get_seek_offset(since) < contents.index(since.encode())
+
+    with open(tmp_path / "dhis.log", "rb") as file:
+        offset = LogScanner(patterns).find_first_after(file, indexed_segment, since)
+        assert offset == contents.index(timestamps[301].encode()) - len(b"* INFO  ")
+
+
+def scan(
+    folder: Path,
+    contents: bytes,
+    block_size: int = 1024,
+    follower_patterns: Optional[List[str]] = None,
+) -> Tuple[List[Tuple[int, bytes]], LogFileSegment]:
+    log_path = folder / "dhis.log"
+    log_path.write_bytes(contents)
+    segment = get_segment(log_path)
+
+    with open(log_path, "rb") as file:
+        scanner = LogScanner(patterns, follower_patterns, block_size=block_size)
+        return list(scanner.scan(file, segment, start=0)), segment
+
+
+def get_segment(log_path: Path) -> LogFileSegment:
+    return LogFileSegment.from_log_file(LogFile.from_path(str(log_path)), 0, checkpoints=[])
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from d2_sync_report.data.repositories.d2_logs_parser.log_timestamps import (
+    format_timestamp,
+    parse_timestamp,
+)
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("2025-07-16T09:04:50,123") == datetime(2025, 7, 16, 9, 4, 50, 123000)
+
+
+def test_format_timestamp_truncates_to_milliseconds():
+    assert format_timestamp(datetime(2025, 7, 16, 9, 4, 50, 123999)) == "2025-07-16T09:04:50,123"
+
+
+def test_formatted_timestamps_compare_as_datetimes():
+    since = datetime(2025, 7, 16, 9, 4, 50, 123456)
+    before = "2025-07-16T09:04:50,123"
+    after = "2025-07-16T09:04:50,124"
+
+    assert (parse_timestamp(before) > since) == (before > format_timestamp(since))
+    assert (parse_timestamp(after) > since) == (after > format_timestamp(since))
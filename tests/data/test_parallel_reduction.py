@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import List
+
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.parallel_reduction import (
+    merge_partial_reductions,
+    reduce_segment,
+)
+from tests.data.helpers import (
+    fixtures,
+    get_concurrent_tracker_lines,
+    get_parser,
+    read_lines,
+    reduce_sequentially,
+    write_log_files,
+)
+
+registry = JobRegistry.default()
+
+
+def test_parallel_and_sequential_reports_are_identical(tmp_path: Path):
+    for fixture in fixtures:
+        lines = read_lines(fixture)
+        first, second = get_record_splits(lines, parts=3)
+        folder = tmp_path / fixture
+        folder.mkdir()
+        write_log_files(folder, [lines[:first], lines[first:second], lines[second:]])
+        single_file_folder = tmp_path / f"{fixture}-single"
+        single_file_folder.mkdir()
+        write_log_files(single_file_folder, [lines])
+
+        sequential_report = get_parser(folder, workers=1).get()
+        parallel_report = get_parser(folder, workers=2).get()
+
+        assert parallel_report.items == sequential_report.items
+        assert parallel_report.log_files == sequential_report.log_files
+        # Rotations are read oldest first, so jobs across files get all their lines
+        assert parallel_report.items == get_parser(single_file_folder).get().items, fixture
+
+
+def test_jobs_across_files_are_stitched_at_any_record_boundary(tmp_path: Path):
+    # Data sync job opened, then full tracker and event jobs run before data sync ends
+    data_sync_lines = read_lines("data-synchronization-success")
+    lines = (
+        data_sync_lines[:6]
+        + read_lines("tracker-programs-data-sync-error")
+        + read_lines("event-programs-data-sync-error")
+        + data_sync_lines[6:]
+        + read_lines("metadata-synchronization-error")
+    )
+    expected_state = reduce_sequentially(write_log_files(tmp_path, [lines]))
+
+    # Files are rotated between records, not between a line and its continuation lines
+    splits = [index for index, line in enumerate(lines) if line.startswith("*")] + [len(lines)]
+
+    for split in splits:
+        segments = write_log_files(tmp_path, [lines[:split], lines[split:]])
+        state = merge_partial_reductions(
+            registry, [reduce_segment(registry, s, None) for s in segments]
+        )
+
+        assert state == expected_state, f"split={split}"
+
+
+def test_concurrent_runs_across_files_are_stitched_at_any_record_boundary(tmp_path: Path):
+    lines = get_concurrent_tracker_lines() + read_lines("data-synchronization-success")
+    expected_state = reduce_sequentially(write_log_files(tmp_path, [lines]))
+
+    splits = [index for index, line in enumerate(lines) if line.startswith("*")] + [len(lines)]
+
+    for split in splits:
+        segments = write_log_files(tmp_path, [lines[:split], lines[split:]])
+        state = merge_partial_reductions(
+            registry, [reduce_segment(registry, s, None) for s in segments]
+        )
+
+        assert state == expected_state, f"split={split}"
+
+
+## Helpers
+
+
+def get_record_splits(lines: List[str], parts: int) -> List[int]:
+    """Indexes that split the lines in parts of similar size, at the start of a record."""
+    # Files are rotated between records, not between a line and its continuation lines
+    starts = [index for index, line in enumerate(lines) if line.startswith("*")] + [len(lines)]
+    return [
+        next(start for start in starts if start >= len(lines) * part // parts)
+        for part in range(1, parts)
+    ]
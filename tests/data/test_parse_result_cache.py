@@ -0,0 +1,74 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser.parse_result_cache import ParseResultCache
+from tests.data.helpers import append_lines, get_parser, read_lines
+
+data_sync_lines = read_lines("data-synchronization-success")
+
+# Data sync job opened in dhis.log.1, still in progress
+log_files_lines = {
+    "dhis.log.2": read_lines("event-programs-data-sync-error"),
+    "dhis.log.1": read_lines("tracker-programs-data-sync-error") + data_sync_lines[:6],
+    "dhis.log": read_lines("metadata-synchronization-error"),
+}
+
+
+def test_rotated_files_are_reduced_once(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    logs_path = write_log_files(tmp_path)
+    result_cache = ParseResultCache(str(tmp_path / "results"))
+    report1 = get_parser(logs_path, result_cache=result_cache).get()
+
+    report2 = get_parser(logs_path, result_cache=result_cache).get()
+
+    output = capsys.readouterr().out
+    assert f"Using cached parse result: {logs_path}/dhis.log.2" in output
+    assert f"Using cached parse result: {logs_path}/dhis.log.1" in output
+    assert report2.items == report1.items == get_parser(logs_path).get().items
+    assert report2.log_files == report1.log_files
+
+
+def test_cached_results_are_used_after_rotation(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    logs_path = write_log_files(tmp_path)
+    result_cache = ParseResultCache(str(tmp_path / "results"))
+    get_parser(logs_path, result_cache=result_cache).get()
+    # The oldest rotation is removed, so the position of the others changes
+    os.remove(logs_path / "dhis.log.2")
+    os.rename(logs_path / "dhis.log.1", logs_path / "dhis.log.2")
+    os.rename(logs_path / "dhis.log", logs_path / "dhis.log.1")
+    append_lines(logs_path / "dhis.log", read_lines("tracker-programs-data-sync-success"))
+
+    report = get_parser(logs_path, result_cache=result_cache).get()
+
+    assert f"Using cached parse result: {logs_path}/dhis.log.2" in capsys.readouterr().out
+    expected_report = get_parser(logs_path).get()
+    assert report.items == expected_report.items
+    assert report.log_files == expected_report.log_files
+
+
+def test_least_recently_used_results_are_evicted(tmp_path: Path):
+    logs_path = write_log_files(tmp_path)
+    result_cache = ParseResultCache(str(tmp_path / "results"), max_entries=1)
+
+    get_parser(logs_path, result_cache=result_cache).get()
+
+    assert len(os.listdir(tmp_path / "results")) == 1
+
+
+def test_results_are_kept_in_the_user_cache_folder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert ParseResultCache().folder == str(tmp_path / "d2-sync-report" / "parse-results")
+
+
+## Helpers
+
+
+def write_log_files(folder: Path) -> Path:
+    logs_path = folder / "logs"
+    logs_path.mkdir()
+    for name, lines in log_files_lines.items():
+        append_lines(logs_path / name, lines)
+    return logs_path
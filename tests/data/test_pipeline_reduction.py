@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser import pipeline_reduction
+from d2_sync_report.data.repositories.d2_logs_parser.job_registry import JobRegistry
+from d2_sync_report.data.repositories.d2_logs_parser.pipeline_reduction import reduce_pipelined
+from tests.data.helpers import (
+    fixtures,
+    get_parser,
+    read_lines,
+    reduce_sequentially,
+    write_log_files,
+)
+
+registry = JobRegistry.default()
+
+
+def test_pipelined_and_sequential_reports_are_identical(tmp_path: Path):
+    for fixture in fixtures:
+        folder = tmp_path / fixture
+        folder.mkdir()
+        write_log_files(folder, [read_lines(fixture)])
+
+        sequential_report = get_parser(folder, pipeline=False).get()
+        pipelined_report = get_parser(folder, pipeline=True).get()
+
+        assert pipelined_report.items == sequential_report.items
+        assert pipelined_report.log_files == sequential_report.log_files
+
+
+def test_interleaved_jobs_are_reduced_with_full_queues(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    # The reader blocks on every entry, until the worker takes the previous one
+    monkeypatch.setattr(pipeline_reduction, "BATCH_SIZE", 1)
+    monkeypatch.setattr(pipeline_reduction, "QUEUE_SIZE", 1)
+    data_sync_lines = read_lines("data-synchronization-success")
+    lines = (
+        data_sync_lines[:6]
+        + read_lines("tracker-programs-data-sync-error")
+        + read_lines("event-programs-data-sync-error")
+        + data_sync_lines[6:]
+        + read_lines("metadata-synchronization-error")
+    )
+    segments = write_log_files(tmp_path, [lines[:20], lines[20:]])
+
+    state = reduce_pipelined(registry, segments, registry.initial_state(), None)
+
+    assert state == reduce_sequentially(segments)
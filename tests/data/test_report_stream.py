@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from d2_sync_report.data.repositories.d2_logs_parser import d2_logs_parser
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.d2_logs_parser.log_files import LogFileSegment
+from d2_sync_report.data.repositories.d2_logs_parser.log_reader import get_log_entries
+from d2_sync_report.data.repositories.sync_job_report_d2_repository import (
+    SyncJobReportD2Repository,
+)
+from tests.data.d2_api_mock import D2ApiMock
+from tests.data.helpers import (
+    append_lines,
+    get_concurrent_tracker_lines,
+    get_parser,
+    read_lines,
+    suggestions_path,
+    write_log_files,
+)
+from tests.data.request_mocks import request_mocks
+
+
+def test_items_are_streamed_in_close_order(tmp_path: Path):
+    lines = get_concurrent_tracker_lines() + read_lines("data-synchronization-success")
+    append_lines(tmp_path / "dhis.log", lines)
+    stream = get_parser(tmp_path).stream()
+
+    first_item = next(iter(stream))
+    # The rest of the report is only known once all items are consumed
+    assert stream.report is None
+    items = [first_item] + list(stream)
+
+    assert [item.type for item in items] == [
+        "trackerProgramsData",
+        "trackerProgramsData",
+        "aggregatedData",
+    ]
+    assert stream.report and stream.report.jobs_in_progress == []
+    assert get_parser(tmp_path).get().items == [items[2], items[0], items[1]]
+
+
+def test_repository_streams_the_jobs_of_the_live_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    logs_folder = tmp_path / "logs"
+    logs_folder.mkdir()
+    rotated_lines = read_lines("event-programs-data-sync-success")
+    live_lines = read_lines("tracker-programs-data-sync-success") + 20 * read_lines(
+        "data-synchronization-success"
+    )
+    write_log_files(logs_folder, [rotated_lines, live_lines])
+    live_entries = count_live_entries(monkeypatch)
+    # Status only: items are not held back by the suggestions thread, so the order is deterministic
+    repository = SyncJobReportD2Repository(
+        D2ApiMock(request_mocks),
+        str(logs_folder),
+        suggestions_path,
+        status_only=True,
+        cache_path=str(tmp_path / "cache"),
+    )
+
+    stream = repository.stream()
+    items = iter(stream)
+    assert next(items).type == "eventProgramsData"
+    assert next(items).type == "trackerProgramsData"
+    entries_read_at_first_item = len(live_entries)
+    assert [item.type for item in items] == 20 * ["aggregatedData"]
+
+    # The live file is reduced sequentially (its jobs are yielded while it is read), after the
+    # rotated file, which is reduced by file so its result is cached
+    assert entries_read_at_first_item < len(live_entries)
+    assert os.listdir(tmp_path / "cache" / "parse-results")
+
+
+## Helpers
+
+
+def count_live_entries(monkeypatch: pytest.MonkeyPatch) -> List[LogEntry]:
+    """Record the entries read from the live file (dhis.log) by the parser."""
+    entries: List[LogEntry] = []
+
+    def get_entries(segment: LogFileSegment, *args: Any) -> Iterator[LogEntry]:
+        for entry in get_log_entries(segment, *args):
+            if segment.log_file.is_live:
+                entries.append(entry)
+            yield entry
+
+    monkeypatch.setattr(d2_logs_parser, "get_log_entries", get_entries)
+    return entries
@@ -0,0 +1,144 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from d2_sync_report.data.repositories.d2_logs_parser.d2_logs_parser import D2LogsParser
+from d2_sync_report.data.repositories.d2_logs_parser.job_reducer_types import LogEntry
+from d2_sync_report.data.repositories.sync_job_report_d2_repository import (
+    SyncJobReportD2Repository,
+)
+from d2_sync_report.domain.entities.sync_job_report import (
+    SyncJobInProgress,
+    SyncJobReport,
+    SyncJobReportItem,
+    SyncJobStatus,
+    SyncJobType,
+)
+from d2_sync_report.domain.entities.sync_job_report_execution import SyncJobReportExecution
+from d2_sync_report.domain.repositories.sync_job_report_execution_repository import (
+    SyncJobReportExecutionRepository,
+)
+from d2_sync_report.domain.usecases.show_sync_job_status_usecase import ShowSyncJobStatusUseCase
+from tests.data.d2_api_mock import D2ApiMock
+from tests.data.helpers import fixtures, get_parser, read_lines, write_log_files
+
+
+def test_status_only_reports_jobs_without_errors(tmp_path: Path):
+    lines = read_lines("tracker-programs-data-sync-error") + read_lines("resource-table-error")
+    write_log_files(tmp_path, [lines])
+
+    items = get_status_parser(tmp_path).get().items
+
+    assert [(item.type, item.success) for item in items] == [
+        (SyncJobType.TRACKER_PROGRAMS, False),
+        (SyncJobType.RESOURCE_TABLE, False),
+    ]
+    assert all(not item.errors and not item.suggestions for item in items)
+    assert all(not item.phases and item.import_count.records == 0 for item in items)
+
+
+def test_status_only_success_is_the_same_as_in_the_full_report(tmp_path: Path):
+    lines = [line for fixture in fixtures for line in read_lines(fixture)]
+    write_log_files(tmp_path, [lines])
+
+    items = get_status_parser(tmp_path).get().items
+
+    assert [(item.type, item.success) for item in items] == [
+        (item.type, item.success) for item in get_parser(tmp_path).get().items
+    ]
+
+
+def test_status_only_classifier_only_counts_errors(tmp_path: Path):
+    parser = get_status_parser(tmp_path)
+    classifier = parser.registry.classifier
+    entry = LogEntry.from_text(
+        "2025-07-17T12:38:09,837",
+        "Sync failed: ImportSummary{status=ERROR, reference='R1'} - Caused by: Connection reset",
+    )
+
+    classification = classifier.classify(entry)
+
+    assert parser.registry.status_only
+    assert parser.d2_logs_suggestions is None
+    assert not classifier.follower_patterns
+    assert classification is not None
+    assert (classification.import_summaries, classification.caused_by) == (False, False)
+    assert classification.error_markers == 2
+
+
+def test_since_does_not_use_nor_save_the_last_execution(tmp_path: Path):
+    logs_folder = tmp_path / "logs"
+    logs_folder.mkdir()
+    write_log_files(logs_folder, [read_lines("tracker-programs-data-sync-error")])
+    last = SyncJobReportExecution(
+        last_processed=datetime(2025, 8, 1), last_sync=datetime(2025, 8, 1)
+    )
+    executions = ExecutionMemoryRepository(last)
+    repository = SyncJobReportD2Repository(
+        D2ApiMock([]),
+        str(logs_folder),
+        str(tmp_path / "missing-suggestions.json"),
+        status_only=True,
+        cache_path=str(tmp_path / "cache"),
+    )
+
+    timeline = ShowSyncJobStatusUseCase(executions, repository).execute(
+        skip_cache=False, since=datetime(2025, 7, 17)
+    )
+
+    assert [status.type for status in timeline] == [SyncJobType.TRACKER_PROGRAMS]
+    assert executions.last is last
+    # The timestamps index that finds where since starts is kept in the cache folder
+    assert (tmp_path / "cache" / "log-files-index.json").exists()
+
+
+def test_status_timeline_is_sorted_by_start_with_running_jobs():
+    tracker_job = SyncJobReportItem(
+        type=SyncJobType.TRACKER_PROGRAMS,
+        success=True,
+        start=datetime(2025, 7, 18, 3, 0),
+        end=datetime(2025, 7, 18, 3, 1),
+        errors=[],
+        suggestions=[],
+    )
+    report = SyncJobReport(
+        items=[tracker_job],
+        last_processed=datetime(2025, 7, 18, 4, 0),
+        jobs_in_progress=[
+            SyncJobInProgress(
+                type=SyncJobType.ANALYTICS_TABLE, start=datetime(2025, 7, 18, 2, 0), errors=[]
+            )
+        ],
+    )
+
+    assert report.get_status_timeline() == [
+        SyncJobStatus(type=SyncJobType.ANALYTICS_TABLE, start=datetime(2025, 7, 18, 2, 0)),
+        SyncJobStatus(
+            type=SyncJobType.TRACKER_PROGRAMS,
+            start=datetime(2025, 7, 18, 3, 0),
+            end=datetime(2025, 7, 18, 3, 1),
+            success=True,
+        ),
+    ]
+
+
+## Helpers
+class ExecutionMemoryRepository(SyncJobReportExecutionRepository):
+    def __init__(self, last: Optional[SyncJobReportExecution]):
+        self.last = last
+
+    def get_last(self) -> Optional[SyncJobReportExecution]:
+        return self.last
+
+    def save_last(self, execution: SyncJobReportExecution) -> None:
+        self.last = execution
+
+
+def get_status_parser(folder: Path) -> D2LogsParser:
+    # No suggestions file nor API requests are needed
+    return get_parser(
+        folder,
+        api=D2ApiMock([]),
+        suggestions_path=str(folder / "missing-suggestions.json"),
+        status_only=True,
+    )